@@ -7,6 +7,8 @@ from werkzeug.security import generate_password_hash
 from datetime import timedelta, datetime
 import re
 from backend.models.user import db, User, Tenant, Company
+from backend.services.dashboard_service import forget_dashboard
+from backend.utils.tracked_companies import forget_tenant
 
 # Create the authentication blueprint
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -354,6 +356,7 @@ def add_company_to_watchlist():
                 existing_company.is_monitored = True
                 existing_company.updated_at = datetime.utcnow()
                 db.session.commit()
+                forget_dashboard(user.tenant_id)
                 return jsonify({
                     'message': 'Company added to watchlist',
                     'company': existing_company.to_dict()
@@ -388,6 +391,8 @@ def add_company_to_watchlist():
         
         db.session.add(company)
         db.session.commit()
+        forget_tenant(user.tenant_id)
+        forget_dashboard(user.tenant_id)
         
         return jsonify({
             'message': 'Company added to watchlist successfully',
@@ -423,6 +428,7 @@ def remove_company_from_watchlist(company_id):
         company.is_monitored = False
         company.updated_at = datetime.utcnow()
         db.session.commit()
+        forget_dashboard(user.tenant_id)
         
         return jsonify({'message': 'Company removed from watchlist'}), 200
         
@@ -8,7 +8,9 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 import logging
 
-from backend.data_sources.companies_house import CompaniesHouseAPI
+from backend.data_sources.companies_house import CompaniesHouseAPI, fetch_concurrently
+from backend.utils.rate_limiter import INTERACTIVE
+from backend.utils.task_dedup import enqueue_once
 from backend.tasks.companies_house_ingestion import (
     fetch_company_profile,
     bulk_import_companies,
@@ -17,6 +19,9 @@ from backend.tasks.companies_house_ingestion import (
 
 logger = logging.getLogger(__name__)
 
+# Largest accepted bulk import; the task paces fetches to the API budget
+MAX_BULK_IMPORT = 10000
+
 # Create Blueprint
 bp = Blueprint('companies', __name__, url_prefix='/api/companies')
 
@@ -46,7 +51,7 @@ def search_companies():
     limit = min(int(request.args.get('limit', 20)), 50)
     
     try:
-        api = CompaniesHouseAPI()
+        api = CompaniesHouseAPI(priority=INTERACTIVE)
         results = api.search_companies(query, items_per_page=limit)
         
         # Format results for frontend
@@ -86,17 +91,23 @@ def lookup_company(company_number):
         Detailed company profile
     """
     try:
-        api = CompaniesHouseAPI()
+        api = CompaniesHouseAPI(priority=INTERACTIVE)
         profile = api.get_company_profile(company_number)
         
         if not profile:
             return jsonify({'error': 'Company not found'}), 404
         
-        # Get additional data
-        officers = api.get_officers(company_number)
-        filings = api.get_filing_history(company_number, items_per_page=10)
-        charges = api.get_charges(company_number)
-        pscs = api.get_persons_with_significant_control(company_number)
+        # Get additional data concurrently once we know the company exists
+        extra = fetch_concurrently({
+            'officers': (api.get_officers, (company_number,), {}),
+            'filings': (api.get_filing_history, (company_number,), {'items_per_page': 10}),
+            'charges': (api.get_charges, (company_number,), {}),
+            'pscs': (api.get_persons_with_significant_control, (company_number,), {}),
+        }, default=[])
+        officers = extra['officers']
+        filings = extra['filings']
+        charges = extra['charges']
+        pscs = extra['pscs']
         
         # Format response
         response = {
@@ -168,7 +179,7 @@ def add_company():
     
     try:
         # Trigger async import
-        task = fetch_company_profile.delay(company_number, tenant_id)
+        task = enqueue_once(fetch_company_profile, (company_number, tenant_id))
         
         return jsonify({
             'status': 'importing',
@@ -191,16 +202,16 @@ def bulk_import():
         company_numbers: List of UK company registration numbers
     
     Returns:
-        Import task status
+        Import task status; poll /task/<task_id> for current/total progress
     """
-    data = request.get_json()
+    data = request.get_json() or {}
     company_numbers = data.get('company_numbers', [])
     
-    if not company_numbers:
+    if not company_numbers or not isinstance(company_numbers, list):
         return jsonify({'error': 'No company numbers provided'}), 400
     
-    if len(company_numbers) > 100:
-        return jsonify({'error': 'Maximum 100 companies per import'}), 400
+    if len(company_numbers) > MAX_BULK_IMPORT:
+        return jsonify({'error': f'Maximum {MAX_BULK_IMPORT} companies per import'}), 400
     
     tenant_id = get_tenant_id()
     
@@ -405,7 +416,7 @@ def refresh_company(company_id):
             company_number = row[0]
         
         # Trigger refresh
-        task = fetch_company_profile.delay(company_number, tenant_id)
+        task = enqueue_once(fetch_company_profile, (company_number, tenant_id))
         
         return jsonify({
             'status': 'refreshing',
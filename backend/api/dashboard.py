@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from backend.models.user import db, User, Company, Alert
+from backend.services.dashboard_service import get_dashboard_summary
 from datetime import datetime, timedelta
 import logging
 
@@ -8,6 +9,32 @@ logger = logging.getLogger(__name__)
 
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api')
 
+def _build_summary(tenant_id):
+    """Dashboard summary from the database; only runs when the cached one is missing."""
+    by_status = db.session.query(Company.company_status, db.func.count()).filter(
+        Company.tenant_id == tenant_id, Company.is_monitored.is_(True)
+    ).group_by(Company.company_status).all()
+    unread = db.session.query(Alert.severity, db.func.count()).filter(
+        Alert.tenant_id == tenant_id, Alert.is_read.is_(False)
+    ).group_by(Alert.severity).all()
+    recent_companies = Company.query.filter_by(
+        tenant_id=tenant_id,
+        is_monitored=True
+    ).order_by(Company.created_at.desc()).limit(10).all()
+    recent_alerts = Alert.query.filter_by(
+        tenant_id=tenant_id
+    ).order_by(Alert.created_at.desc()).limit(10).all()
+    
+    return {
+        'companies_by_status': {status: count for status, count in by_status},
+        'unread_by_severity': {severity: count for severity, count in unread},
+        'recent_companies': [c.to_dict() for c in recent_companies],
+        'recent_alerts': [
+            dict(a.to_dict(), company_name=a.company.company_name if a.company else None)
+            for a in recent_alerts
+        ]
+    }
+
 @dashboard_bp.route('/dashboard', methods=['GET'])
 @jwt_required()
 def get_dashboard():
@@ -19,46 +46,34 @@ def get_dashboard():
         if not user:
             return jsonify({'error': 'User not found'}), 404
             
-        # Get stats for user's tenant
-        watched_companies = Company.query.filter_by(
-            tenant_id=user.tenant_id,
-            is_monitored=True
-        ).all()
-        
-        recent_alerts = Alert.query.filter_by(
-            tenant_id=user.tenant_id
-        ).order_by(Alert.created_at.desc()).limit(10).all()
-        
-        unread_alerts = Alert.query.filter_by(
-            tenant_id=user.tenant_id,
-            is_read=False
-        ).count()
+        # Counts and recent lists for the tenant, from the cached summary
+        summary = get_dashboard_summary(user.tenant_id, lambda: _build_summary(user.tenant_id))
         
         response = {
             'user': user.to_dict(),
             'stats': {
-                'total_watched_companies': len(watched_companies),
-                'unread_alerts': unread_alerts,
+                'total_watched_companies': summary['total_companies'],
+                'unread_alerts': summary['unread_alerts'],
                 'tenant_name': user.tenant.name if user.tenant else 'Unknown'
             },
             'watched_companies': [
                 {
-                    'id': c.id,
-                    'company_number': c.company_number,
-                    'company_name': c.company_name,
-                    'status': c.company_status or 'active',
-                    'last_check': c.last_fetched_at.isoformat() if c.last_fetched_at else None
-                } for c in watched_companies[:10]
+                    'id': c['id'],
+                    'company_number': c['company_number'],
+                    'company_name': c['company_name'],
+                    'status': c.get('company_status') or 'active',
+                    'last_check': c.get('last_fetched_at')
+                } for c in summary['recent_companies'][:10]
             ],
             'recent_alerts': [
                 {
-                    'id': a.id,
-                    'title': a.title,
-                    'message': a.description,
-                    'company_name': a.company.company_name if a.company else 'Unknown',
-                    'created_at': a.created_at.isoformat(),
-                    'is_read': a.is_read
-                } for a in recent_alerts
+                    'id': a['id'],
+                    'title': a['title'],
+                    'message': a['description'],
+                    'company_name': a.get('company_name') or 'Unknown',
+                    'created_at': a['created_at'],
+                    'is_read': a['is_read']
+                } for a in summary['recent_alerts']
             ]
         }
         
@@ -6,21 +6,35 @@ import secrets
 import json
 from datetime import datetime, timedelta
 from functools import wraps
+from urllib.parse import urlencode
 
 import requests
 from flask import Flask, jsonify, request, g
 from flask_cors import CORS
 from flask_jwt_extended import (
-    JWTManager, create_access_token, jwt_required, get_jwt_identity
+    JWTManager, create_access_token, jwt_required, get_jwt_identity, get_jwt
 )
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import text, event
+from sqlalchemy import text, event, inspect
 from werkzeug.security import generate_password_hash, check_password_hash
 from redis import Redis
 
+from backend.services.company_service import search_local_companies
+from backend.services.dashboard_service import (
+    forget_dashboard, get_dashboard_summary, record_alert_read, record_alerts, record_company_added
+)
+from backend.utils import metrics
+from backend.utils import content_hash  # noqa: F401  (registers the content_hash.skip_rate gauges)
+from backend.utils.cache import get_companies_house_cache
+from backend.utils.http_session import get_http_session
+from backend.utils.prefix_index import get_prefix_index
+from backend.utils.rate_limiter import INTERACTIVE, RateLimitExceeded, get_companies_house_limiter
+from backend.utils.tracked_companies import forget_tenant, tracked_company_numbers
+from backend.utils.user_status import publish_user_change, user_status
+
 # -----------------------------------------------------------------------------
 # Tiny .env loader (no extra packages)
 # -----------------------------------------------------------------------------
@@ -170,11 +184,14 @@ def create_app():
         last_name = db.Column(db.String(100))
         tenant_id = db.Column(UUID(as_uuid=True), db.ForeignKey("tenants.id"), nullable=False)
         is_active = db.Column(db.Boolean, default=True)
+        # Bumped on password change; access tokens from older versions are rejected
+        token_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
         created_at = db.Column(db.DateTime, default=datetime.utcnow)
         updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
         def set_password(self, password: str):
             self.password_hash = generate_password_hash(password)
+            self.token_version = (self.token_version or 0) + 1
 
         def check_password(self, password: str) -> bool:
             return check_password_hash(self.password_hash, password)
@@ -373,6 +390,51 @@ def create_app():
                 "created_at": _iso_or_none(self.created_at),
                 "updated_at": _iso_or_none(self.updated_at),
             }
+    # Deactivations and password changes are announced once committed, so
+    # every process drops the user's cached status (see require_tenant)
+    @event.listens_for(db.session, "after_flush")
+    def _collect_user_changes(session, flush_context):
+        for obj in session.dirty:
+            if isinstance(obj, User) and any(
+                inspect(obj).attrs[name].history.has_changes() for name in ("is_active", "token_version")
+            ):
+                session.info.setdefault("changed_users", set()).add(obj.id)
+
+    @event.listens_for(db.session, "after_commit")
+    def _publish_user_changes(session):
+        for user_id in session.info.pop("changed_users", ()):
+            publish_user_change(user_id)
+
+    @event.listens_for(db.session, "after_rollback")
+    def _discard_user_changes(session):
+        session.info.pop("changed_users", None)
+
+    def _access_token(user) -> str:
+        """Access token carrying the tenant and token version, so requests need no user lookup."""
+        return create_access_token(identity=str(user.id), additional_claims={
+            "tenant_id": str(user.tenant_id),
+            "ver": user.token_version or 0,
+        })
+
+    def _load_user_status(user_id: str):
+        # 🔧 Be robust to string UUIDs in JWT identity
+        lookup_id = user_id
+        try:
+            lookup_id = uuid.UUID(str(user_id))
+        except Exception:
+            pass
+
+        user = User.query.get(lookup_id)
+        if not user:
+            return None
+        return bool(user.is_active), user.token_version or 0, str(user.tenant_id)
+
+    def current_user():
+        """The authenticated user's row, loaded only by routes that need it."""
+        if "current_user" not in g:
+            g.current_user = User.query.get(g.user_id)
+        return g.current_user
+
     def require_tenant():
         def decorator(f):
             @wraps(f)
@@ -381,18 +443,16 @@ def create_app():
                 if not user_id:
                     return jsonify({"error": "Token required"}), 401
 
-                # 🔧 Be robust to string UUIDs in JWT identity
-                lookup_id = user_id
+                # Tenant from the token; active flag and token version cached per process
+                status = user_status(user_id, _load_user_status)
+                claims = get_jwt()
+                if not status or not status[0] or claims.get("ver", 0) < status[1]:
+                    return jsonify({"error": "Invalid user"}), 401
                 try:
-                    lookup_id = uuid.UUID(str(user_id))
-                except Exception:
-                    pass
-
-                user = User.query.get(lookup_id)
-                if not user or not user.is_active:
+                    g.user_id = uuid.UUID(str(user_id))
+                    g.tenant_id = uuid.UUID(claims.get("tenant_id") or status[2])
+                except ValueError:
                     return jsonify({"error": "Invalid user"}), 401
-                g.current_user = user
-                g.tenant_id = user.tenant_id
                 return f(*args, **kwargs)
             return decorated_function
         return decorator
@@ -409,6 +469,49 @@ def create_app():
         auth = base64.b64encode(f"{key}:".encode("ascii")).decode("ascii")
         return {"Authorization": f"Basic {auth}"}
 
+    # Interactive requests wait at most this long for a token before we
+    # answer 503; background work never takes the reserved headroom
+    CH_INTERACTIVE_WAIT_SECONDS = 5
+
+    def _ch_acquire() -> bool:
+        try:
+            get_companies_house_limiter().acquire(lane=INTERACTIVE, timeout=CH_INTERACTIVE_WAIT_SECONDS)
+            return True
+        except RateLimitExceeded as e:
+            app.logger.warning(f"Companies House budget exhausted: {e}")
+            return False
+
+    def _ch_rate_limited(r) -> None:
+        if r.status_code == 429:
+            metrics.incr("companies_house.http_429")
+            try:
+                delay = float(r.headers.get("Retry-After") or 60)
+            except ValueError:
+                delay = 60.0
+            get_companies_house_limiter().penalize(delay)
+
+    class _CHUnavailable(Exception):
+        """Companies House could not answer (budget, 429, 5xx, network)."""
+
+    def _ch_get(path: str, headers: dict, params: dict = None):
+        """
+        One Companies House GET for the response cache: JSON on 200, None on
+        404 (cached as not found); anything else raises so it isn't cached.
+        """
+        if not _ch_acquire():
+            raise _CHUnavailable("rate budget exhausted")
+        url = f"https://api.company-information.service.gov.uk{path}"
+        try:
+            r = get_http_session().get(url, headers=headers, params=params)
+        except requests.RequestException as e:
+            raise _CHUnavailable(str(e))
+        if r.status_code == 200:
+            return r.json()
+        if r.status_code == 404:
+            return None
+        _ch_rate_limited(r)
+        raise _CHUnavailable(f"{r.status_code} - {r.text[:200]}")
+
     def search_companies_house(query, max_results=20):
         """
         https://developer.company-information.service.gov.uk/advanced-search/companies
@@ -418,16 +521,14 @@ def create_app():
         if not headers:
             return {"error": "api_key_missing"}
 
-        url = "https://api.company-information.service.gov.uk/search/companies"
         params = {"q": query, "items_per_page": min(max_results, 20)}
+        key = f"/search/companies?{urlencode(sorted(params.items()))}"
         try:
-            r = requests.get(url, headers=headers, params=params, timeout=10)
-            if r.status_code == 200:
-                return r.json()
-            app.logger.error(f"Companies House search error: {r.status_code} - {r.text[:200]}")
-            return None
-        except requests.RequestException as e:
-            app.logger.error(f"Companies House search request failed: {e}")
+            return get_companies_house_cache().get_or_fetch(
+                key, "search", lambda: _ch_get("/search/companies", headers, params)
+            )
+        except _CHUnavailable as e:
+            app.logger.error(f"Companies House search failed: {e}")
             return None
 
     def get_company_details(company_number: str):
@@ -438,15 +539,14 @@ def create_app():
         if not headers:
             return {"error": "api_key_missing"}
 
-        url = f"https://api.company-information.service.gov.uk/company/{company_number}"
+        # Same key as CompaniesHouseClient, so the app and tasks share entries
+        path = f"/company/{company_number}"
         try:
-            r = requests.get(url, headers=headers, timeout=10)
-            if r.status_code == 200:
-                return r.json()
-            app.logger.error(f"Companies House details error: {r.status_code} - {r.text[:200]}")
-            return None
-        except requests.RequestException as e:
-            app.logger.error(f"Companies House details request failed: {e}")
+            return get_companies_house_cache().get_or_fetch(
+                path, "profile", lambda: _ch_get(path, headers)
+            )
+        except _CHUnavailable as e:
+            app.logger.error(f"Companies House details failed: {e}")
             return None
 
     # -------------------------------------------------------------------------
@@ -471,6 +571,12 @@ def create_app():
             },
         })
 
+    @app.route("/api/metrics")
+    @jwt_required()
+    def get_metrics():
+        """Shared counters and gauges, e.g. the Companies House budget remaining."""
+        return jsonify(metrics.snapshot())
+
     # ----- Auth -----
     @app.route("/api/auth/login", methods=["POST"])
     @limiter.limit("5 per minute")
@@ -483,7 +589,7 @@ def create_app():
         if not user or not user.check_password(data["password"]) or not user.is_active:
             return jsonify({"error": "Invalid credentials"}), 401
 
-        token = create_access_token(identity=str(user.id))
+        token = _access_token(user)
         return jsonify({"access_token": token, "user": user.to_dict()})
 
     @app.route("/api/auth/register", methods=["POST"])
@@ -512,14 +618,14 @@ def create_app():
         db.session.add(user)
         db.session.commit()
 
-        token = create_access_token(identity=str(user.id))
+        token = _access_token(user)
         return jsonify({"access_token": token, "user": user.to_dict()}), 201
 
     @app.route("/api/auth/me", methods=["GET"])
     @jwt_required()
     @require_tenant()
     def get_current_user():
-        u = g.current_user
+        u = current_user()
         return jsonify({
             "user": u.to_dict(),
             "tenant": {
@@ -609,7 +715,7 @@ def create_app():
         user.updated_at = datetime.utcnow()
         db.session.commit()
 
-        # Invalidate other app state if needed (JWTs are stateless; existing tokens remain valid until expiry)
+        # set_password bumped token_version, so tokens issued before the reset are rejected
         return jsonify({"message": "Password updated successfully"}), 200
 
     # ----- Companies -----
@@ -624,13 +730,20 @@ def create_app():
         if len(q) < 2:
             return jsonify({"error": "Search query too short"}), 400
 
-        raw = search_companies_house(q)
+        # Local register first; Companies House on a miss or when asked (?live=true)
+        live = request.args.get("live", "").lower() in ("1", "true", "yes")
+        raw = None if live else search_local_companies(db.session, q)
+        if raw is None:
+            raw = search_companies_house(q)
         if raw is None:
             return jsonify({"error": "Search service unavailable"}), 503
         if isinstance(raw, dict) and raw.get("error") == "api_key_missing":
             return jsonify({"error": "Companies House API key missing"}), 503
 
         items = raw.get("items", []) if isinstance(raw, dict) else []
+        tracked = tracked_company_numbers(
+            db.session, g.tenant_id, [item.get("company_number") for item in items]
+        )
         companies = []
         for item in items:
             ch_number = item.get("company_number")
@@ -638,12 +751,6 @@ def create_app():
             status = item.get("company_status")
             addr = (item.get("address") or {}) if isinstance(item.get("address"), dict) else {}
 
-            existing = None
-            if ch_number:
-                existing = Company.query.filter_by(
-                    tenant_id=g.tenant_id, company_number=ch_number
-                ).first()
-
             companies.append({
                 "companies_house_number": ch_number,
                 "name": title,
@@ -656,11 +763,26 @@ def create_app():
                     "postal_code": addr.get("postal_code"),
                     "country": addr.get("country"),
                 },
-                "is_monitored": bool(existing)
+                "is_monitored": ch_number in tracked
             })
 
         return jsonify({"companies": companies, "total_results": raw.get("total_results", 0)})
 
+    @app.route("/api/companies/autocomplete", methods=["GET"])
+    @jwt_required()
+    @limiter.limit("20 per second")
+    def autocomplete_companies():
+        """Typeahead from the mmap'd prefix index: no tenant lookup, no database."""
+        q = (request.args.get("q") or "").strip()
+        limit = max(1, min(request.args.get("limit", 10, type=int), 25))
+        if not q:
+            return jsonify({"companies": []})
+
+        index = get_prefix_index()
+        if index is None:
+            return jsonify({"error": "Autocomplete unavailable"}), 503
+        return jsonify({"companies": index.lookup(q, limit)})
+
     @app.route("/api/companies/<company_number>", methods=["GET"])
     @jwt_required()
     @require_tenant()
@@ -745,6 +867,9 @@ def create_app():
         )
         db.session.add(alert)
         db.session.commit()
+        forget_tenant(g.tenant_id)
+        record_company_added(g.tenant_id, company.to_dict())
+        record_alerts([_alert_summary(alert)])
 
         return jsonify({"message": "Company added to monitoring", "company": company.to_dict()}), 201
 
@@ -759,6 +884,8 @@ def create_app():
             return jsonify({"error": "Company not being monitored"}), 404
         db.session.delete(company)
         db.session.commit()
+        forget_tenant(g.tenant_id)
+        forget_dashboard(g.tenant_id)
         return jsonify({"message": "Company removed from monitoring"})
 
     @app.route("/api/companies/monitored", methods=["GET"])
@@ -774,33 +901,61 @@ def create_app():
         })
 
     # ----- Dashboard & Alerts -----
+    def _alert_summary(a) -> dict:
+        """An alert as listed in the dashboard summary."""
+        return {
+            "id": str(a.id),
+            "tenant_id": str(a.tenant_id),
+            "company_id": str(a.company_id) if a.company_id else None,
+            "title": a.title,
+            "description": a.description,
+            "severity": a.severity,
+            "created_at": _iso_or_none(a.created_at),
+            "is_read": a.is_read
+        }
+
+    def _build_dashboard_summary(tenant_id) -> dict:
+        """Dashboard summary from the database; only runs when the cached one is missing."""
+        monitored = Company.query.filter_by(tenant_id=tenant_id, is_monitored=True)
+        by_status = db.session.query(Company.company_status, db.func.count()).filter(
+            Company.tenant_id == tenant_id, Company.is_monitored.is_(True)
+        ).group_by(Company.company_status).all()
+        unread = db.session.query(Alert.severity, db.func.count()).filter(
+            Alert.tenant_id == tenant_id, Alert.is_read.is_(False)
+        ).group_by(Alert.severity).all()
+        recent_alerts = Alert.query.filter_by(tenant_id=tenant_id).order_by(Alert.created_at.desc()).limit(10).all()
+        recent_companies = monitored.order_by(Company.created_at.desc()).limit(10).all()
+        return {
+            "companies_by_status": {status: count for status, count in by_status},
+            "unread_by_severity": {severity: count for severity, count in unread},
+            "recent_alerts": [_alert_summary(a) for a in recent_alerts],
+            "recent_companies": [c.to_dict() for c in recent_companies],
+        }
+
     @app.route("/api/dashboard", methods=["GET"])
     @jwt_required()
     @require_tenant()
     def get_dashboard_data():
-        total_companies = Company.query.filter_by(tenant_id=g.tenant_id, is_monitored=True).count()
-        unread_alerts = Alert.query.filter_by(tenant_id=g.tenant_id, is_read=False).count()
-        recent_alerts = Alert.query.filter_by(tenant_id=g.tenant_id).order_by(Alert.created_at.desc()).limit(5).all()
-        recent_companies = Company.query.filter_by(
-            tenant_id=g.tenant_id, is_monitored=True
-        ).order_by(Company.created_at.desc()).limit(5).all()
+        summary = get_dashboard_summary(g.tenant_id, lambda: _build_dashboard_summary(g.tenant_id))
 
         return jsonify({
             "stats": {
-                "total_companies": total_companies,
-                "unread_alerts": unread_alerts,
-                "active_monitoring": total_companies,
-                "total_insights": 0
+                "total_companies": summary["total_companies"],
+                "unread_alerts": summary["unread_alerts"],
+                "active_monitoring": summary["total_companies"],
+                "total_insights": 0,
+                "companies_by_status": summary["companies_by_status"],
+                "unread_by_severity": summary["unread_by_severity"]
             },
             "recent_alerts": [{
-                "id": str(a.id),
-                "title": a.title,
-                "description": a.description,
-                "severity": a.severity,
-                "created_at": _iso_or_none(a.created_at),
-                "is_read": a.is_read
-            } for a in recent_alerts],
-            "recent_companies": [c.to_dict() for c in recent_companies]
+                "id": a["id"],
+                "title": a["title"],
+                "description": a["description"],
+                "severity": a["severity"],
+                "created_at": a["created_at"],
+                "is_read": a["is_read"]
+            } for a in summary["recent_alerts"][:5]],
+            "recent_companies": summary["recent_companies"][:5]
         })
 
     @app.route("/api/alerts", methods=["GET"])
@@ -837,8 +992,11 @@ def create_app():
         alert = Alert.query.filter_by(id=alert_id, tenant_id=g.tenant_id).first()
         if not alert:
             return jsonify({"error": "Alert not found"}), 404
+        was_unread = not alert.is_read
         alert.is_read = True
         db.session.commit()
+        if was_unread:
+            record_alert_read(g.tenant_id, alert.id, alert.severity)
         return jsonify({"message": "Alert marked as read"})
 
     # ----- Errors & JWT hooks -----
@@ -1015,7 +1173,7 @@ if __name__ == "__main__":
         p = Prospect(
             tenant_id=g.tenant_id,
             company_id=uuid.UUID(data["company_id"]) if data.get("company_id") else None,
-            owner_user_id=g.current_user.id,
+            owner_user_id=g.user_id,
             first_name=data.get("first_name"),
             last_name=data.get("last_name"),
             title=data.get("title"),
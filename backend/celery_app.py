@@ -1,6 +1,7 @@
 # backend/celery_app.py
 import os
 from celery import Celery
+from celery.schedules import crontab
 
 def _redis_url_default() -> str:
     return os.getenv("REDIS_URL", "redis://redis:6379/0")
@@ -20,5 +21,24 @@ celery.conf.update(
     result_expires=3600,
 )
 
+# Monitoring refresh scheduler: enqueues the companies that are due
+celery.conf.beat_schedule = {
+    "companies-house-monitoring-tick": {
+        "task": "backend.tasks.companies_house_ingestion.monitoring_scheduler_tick",
+        "schedule": 60.0,
+    },
+    "alerts-drain": {
+        "task": "backend.tasks.alert_generation.drain_alert_events",
+        "schedule": 10.0,
+    },
+    # Diffs the two newest Basic Company Data snapshots in data/raw; a pair
+    # already applied is skipped, so a daily run picks up each monthly
+    # snapshot the morning after it is loaded
+    "companies-house-snapshot-delta": {
+        "task": "backend.tasks.companies_house_ingestion.process_snapshot_delta",
+        "schedule": crontab(hour=5, minute=30),
+    },
+}
+
 # autodiscover tasks under backend.tasks.*
 celery.autodiscover_tasks(["backend.tasks"])
@@ -7,4 +7,65 @@ class Settings:
     CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL)
     CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", REDIS_URL)
 
+    # Companies House API budget, shared by every process using the same key
+    COMPANIES_HOUSE_RATE_LIMIT = int(os.getenv("COMPANIES_HOUSE_RATE_LIMIT", "600"))
+    COMPANIES_HOUSE_RATE_WINDOW = int(os.getenv("COMPANIES_HOUSE_RATE_WINDOW", "300"))
+    COMPANIES_HOUSE_RATE_BURST = int(os.getenv("COMPANIES_HOUSE_RATE_BURST", "60"))
+    # Burst tokens background work must leave untouched for interactive calls
+    COMPANIES_HOUSE_INTERACTIVE_RESERVE = int(os.getenv("COMPANIES_HOUSE_INTERACTIVE_RESERVE", "15"))
+    # Threads per process for concurrent secondary requests (officers, filings, ...)
+    COMPANIES_HOUSE_FANOUT_WORKERS = int(os.getenv("COMPANIES_HOUSE_FANOUT_WORKERS", "8"))
+
+    # Outbound HTTP: keep-alive connections per host in each process. The
+    # default covers every gunicorn thread plus the fan-out pool.
+    HTTP_POOL_MAXSIZE = int(os.getenv(
+        "HTTP_POOL_MAXSIZE",
+        str(max(int(os.getenv("GUNICORN_THREADS", "1")), COMPANIES_HOUSE_FANOUT_WORKERS) + 2)
+    ))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+    # Retries for connection errors and 502/503/504; 429 is left to the rate limiter
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+
+    # Companies House response cache (seconds). Entries past their TTL are
+    # served for STALE_TTL more while one background refresh runs.
+    COMPANIES_HOUSE_CACHE_TTL_SEARCH = int(os.getenv("COMPANIES_HOUSE_CACHE_TTL_SEARCH", "300"))
+    COMPANIES_HOUSE_CACHE_TTL_PROFILE = int(os.getenv("COMPANIES_HOUSE_CACHE_TTL_PROFILE", "3600"))
+    COMPANIES_HOUSE_CACHE_TTL_STABLE = int(os.getenv("COMPANIES_HOUSE_CACHE_TTL_STABLE", "86400"))
+    COMPANIES_HOUSE_CACHE_STALE_TTL = int(os.getenv("COMPANIES_HOUSE_CACHE_STALE_TTL", "3600"))
+    COMPANIES_HOUSE_CACHE_NEGATIVE_TTL = int(os.getenv("COMPANIES_HOUSE_CACHE_NEGATIVE_TTL", "600"))
+    COMPANIES_HOUSE_CACHE_LRU_SIZE = int(os.getenv("COMPANIES_HOUSE_CACHE_LRU_SIZE", "2048"))
+
+    # Streaming API (separate key from the REST API); point the URL at
+    # scripts/stream_replay_server.py to test locally
+    COMPANIES_HOUSE_STREAM_URL = os.getenv("COMPANIES_HOUSE_STREAM_URL", "https://stream.companieshouse.gov.uk")
+    COMPANIES_HOUSE_STREAM_API_KEY = os.getenv("COMPANIES_HOUSE_STREAM_API_KEY")
+
+    # Companies the monitoring scheduler may enqueue per one-minute tick; the
+    # default leaves about half the API budget for everything else
+    MONITORING_MAX_PER_TICK = int(os.getenv(
+        "MONITORING_MAX_PER_TICK",
+        str(max(1, COMPANIES_HOUSE_RATE_LIMIT * 60 // COMPANIES_HOUSE_RATE_WINDOW // 6))
+    ))
+
+    # Continuous monitoring sweep (worker.monitor_companies): companies per
+    # committed batch and the rate the sweep is paced to
+    MONITOR_SWEEP_BATCH_SIZE = int(os.getenv("MONITOR_SWEEP_BATCH_SIZE", "50"))
+    MONITOR_SWEEP_COMPANIES_PER_HOUR = int(os.getenv("MONITOR_SWEEP_COMPANIES_PER_HOUR", "2000"))
+
+    # Lifetime (seconds) of the lock that drops duplicate task enqueues;
+    # covers queueing behind the rate limiter, released when the task starts
+    TASK_DEDUP_TTL = int(os.getenv("TASK_DEDUP_TTL", "900"))
+
+    # Items (filings, officers, ...) already alerted for a company within
+    # this many seconds are left out of new alerts of the same type
+    ALERT_DEDUP_WINDOW_SECONDS = int(os.getenv("ALERT_DEDUP_WINDOW_SECONDS", "3600"))
+
+    # Autocomplete prefix index built by scripts/build_prefix_index.py
+    COMPANY_PREFIX_INDEX_PATH = os.getenv(
+        "COMPANY_PREFIX_INDEX_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                     "data", "processed", "company_prefix_index.bin")
+    )
+
 settings = Settings()
@@ -1,14 +1,230 @@
 import os
 import requests
 import logging
-from typing import Dict, List, Optional, Union
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from datetime import date, datetime
+from urllib.parse import urlencode
 import time
 from base64 import b64encode
 
+from backend.config import settings
+from backend.utils import metrics
+from backend.utils.cache import TwoTierCache, get_companies_house_cache
+from backend.utils.http_session import get_http_session
+from backend.utils.rate_limiter import (
+    BACKGROUND, RateLimiter, RateLimitExceeded, get_companies_house_limiter
+)
+
 logger = logging.getLogger(__name__)
 
-class CompaniesHouseClient:
+# Attempts per request when Companies House answers 429 or a gateway error
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Transient upstream errors, retried here (not by the HTTP session) so
+# every attempt takes a token from the shared budget
+RETRY_STATUSES = (502, 503, 504)
+
+# Companies House caps items_per_page at 100 on list endpoints
+MAX_PAGE_SIZE = 100
+
+# Last path segment of each company sub-resource -> cache TTL class
+_CACHE_KINDS = {
+    "officers": "officers",
+    "filing-history": "filings",
+    "charges": "charges",
+    "persons-with-significant-control": "pscs",
+    "insolvency": "insolvency",
+}
+
+
+class _NotModified:
+    """Sentinel returned when a conditional request comes back 304."""
+    
+    def __repr__(self):
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = _NotModified()
+
+
+class ItemList(list):
+    """List of API items that remembers the ETag of the page it came from."""
+    
+    def __init__(self, items=(), etag: Optional[str] = None):
+        super().__init__(items)
+        self.etag = etag
+
+
+def with_etag(data: Optional[Dict], header_etag: Optional[str]) -> Optional[Dict]:
+    """Make sure a response body carries its ETag under the "etag" key."""
+    if isinstance(data, dict) and header_etag and not data.get("etag"):
+        data["etag"] = header_etag
+    return data
+
+_fanout_executor: Optional[ThreadPoolExecutor] = None
+_fanout_pid: Optional[int] = None
+_fanout_lock = threading.Lock()
+
+
+def _get_fanout_executor() -> ThreadPoolExecutor:
+    """Bounded per-process pool for concurrent secondary requests (recreated after fork)."""
+    global _fanout_executor, _fanout_pid
+    pid = os.getpid()
+    if _fanout_executor is None or _fanout_pid != pid:
+        with _fanout_lock:
+            if _fanout_executor is None or _fanout_pid != pid:
+                _fanout_executor = ThreadPoolExecutor(
+                    max_workers=settings.COMPANIES_HOUSE_FANOUT_WORKERS,
+                    thread_name_prefix="ch-fanout",
+                )
+                _fanout_pid = pid
+    return _fanout_executor
+
+
+def fetch_concurrently(calls: Dict[str, Tuple[Callable, tuple, dict]], default: Any = None) -> Dict[str, Any]:
+    """
+    Run independent Companies House calls on the shared bounded pool.
+    
+    Each call still takes its own token from the shared rate budget, so
+    concurrency shortens wall-clock time without spending more requests.
+    
+    Args:
+        calls: Mapping of result key to (function, args, kwargs)
+        default: Value stored for a call that raised
+        
+    Returns:
+        Dict of result key to call result
+    """
+    executor = _get_fanout_executor()
+    futures = {
+        key: executor.submit(func, *args, **kwargs)
+        for key, (func, args, kwargs) in calls.items()
+    }
+    
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            logger.warning(f"Could not fetch {key}: {e}")
+            results[key] = default
+    return results
+
+
+def retry_after_seconds(headers) -> float:
+    """Seconds to back off after a 429, from Retry-After or X-Ratelimit-Reset."""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(float(retry_after), 1.0)
+        except ValueError:
+            pass
+    
+    reset = headers.get("X-Ratelimit-Reset")
+    if reset:
+        try:
+            return max(float(reset) - time.time(), 1.0)
+        except ValueError:
+            pass
+    
+    return 60.0
+
+
+class CompaniesHouseNormalizer:
+    """
+    Normalisation shared by the blocking and asyncio Companies House clients,
+    so both produce identical output for the same raw data.
+    """
+    
+    def normalize_company_data(self, raw_data: Dict) -> Dict:
+        """
+        Normalize raw Companies House data into our standard format.
+        
+        Args:
+            raw_data: Raw data from get_full_company_data()
+            
+        Returns:
+            Dict containing normalized company data
+        """
+        if not raw_data or not raw_data.get("profile"):
+            return None
+        
+        profile = raw_data["profile"]
+        
+        # Extract key information
+        normalized = {
+            "company_number": profile.get("company_number"),
+            "company_name": profile.get("company_name"),
+            "company_status": profile.get("company_status"),
+            "company_type": profile.get("type"),
+            "incorporation_date": profile.get("date_of_creation"),
+            "dissolution_date": profile.get("date_of_dissolution"),
+            "jurisdiction": profile.get("jurisdiction"),
+            "sic_codes": profile.get("sic_codes", []),
+            "registered_office_address": profile.get("registered_office_address", {}),
+            "accounts": profile.get("accounts", {}),
+            "confirmation_statement": profile.get("confirmation_statement", {}),
+            "links": profile.get("links", {}),
+            
+            # Additional processed data
+            "is_active": profile.get("company_status", "").lower() == "active",
+            "has_charges": bool((raw_data.get("charges") or {}).get("total_count", 0)),
+            "has_insolvency": bool(raw_data.get("insolvency")),
+            "officer_count": (raw_data.get("officers") or {}).get("total_count", 0),
+            "recent_filing_count": (raw_data.get("recent_filings") or {}).get("total_count", 0),
+            
+            # Metadata
+            "fetched_at": raw_data.get("fetched_at"),
+            "raw_data": raw_data  # Store complete raw data for future use
+        }
+        
+        # Add risk indicators
+        normalized["risk_indicators"] = self._calculate_risk_indicators(normalized)
+        
+        return normalized
+    
+    def _calculate_risk_indicators(self, company_data: Dict) -> Dict:
+        """Calculate basic risk indicators from company data."""
+        indicators = {
+            "overdue_accounts": False,
+            "overdue_confirmation_statement": False,
+            "has_charges": company_data.get("has_charges", False),
+            "has_insolvency_history": company_data.get("has_insolvency", False),
+            "is_dormant": False,
+            "risk_score": 0
+        }
+        
+        # Check if accounts are overdue
+        accounts = company_data.get("accounts", {})
+        if accounts.get("overdue"):
+            indicators["overdue_accounts"] = True
+            indicators["risk_score"] += 3
+        
+        # Check if confirmation statement is overdue
+        cs = company_data.get("confirmation_statement", {})
+        if cs.get("overdue"):
+            indicators["overdue_confirmation_statement"] = True
+            indicators["risk_score"] += 2
+        
+        # Check for charges
+        if indicators["has_charges"]:
+            indicators["risk_score"] += 1
+        
+        # Check for insolvency history
+        if indicators["has_insolvency_history"]:
+            indicators["risk_score"] += 5
+        
+        # Check if company is inactive
+        if not company_data.get("is_active"):
+            indicators["risk_score"] += 4
+        
+        return indicators
+
+
+class CompaniesHouseClient(CompaniesHouseNormalizer):
     """
     Companies House API client for fetching UK company data.
     
@@ -16,72 +232,118 @@ class CompaniesHouseClient:
     including filings, officers, and financial data.
     """
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, priority: str = BACKGROUND,
+                 rate_limiter: Optional[RateLimiter] = None, cache: Optional[TwoTierCache] = None,
+                 use_cache: bool = False):
         self.api_key = api_key or os.getenv("COMPANIES_HOUSE_API_KEY")
         if not self.api_key:
             raise ValueError("Companies House API key is required")
             
         self.base_url = "https://api.company-information.service.gov.uk"
-        self.session = requests.Session()
+        # Pooled keep-alive session shared by every client in this process
+        self.session = get_http_session()
         
-        # Companies House uses HTTP Basic Auth with API key as username
+        # Companies House uses HTTP Basic Auth with API key as username.
+        # Sent per request because the session is shared across keys.
         auth_string = f"{self.api_key}:"
         encoded_auth = b64encode(auth_string.encode()).decode()
-        self.session.headers.update({
+        self.headers = {
             "Authorization": f"Basic {encoded_auth}",
-            "Content-Type": "application/json",
-            "User-Agent": "UK-Customer-Intelligence-Platform/1.0"
-        })
+            "Content-Type": "application/json"
+        }
         
-        # Rate limiting: 600 requests per 5 minutes
-        self.rate_limit_calls = []
-        self.max_calls_per_window = 600
-        self.window_seconds = 300
+        # Rate limiting: 600 requests per 5 minutes, shared by every process
+        # using this key. Interactive callers draw from a reserved lane.
+        self.priority = priority
+        self.rate_limiter = rate_limiter or get_companies_house_limiter()
+        
+        # Opt-in only: ingestion and monitoring compare what they read with
+        # what is stored, so they must see Companies House, not a cached copy
+        self.cache = (cache or get_companies_house_cache()) if use_cache else None
     
     def _check_rate_limit(self):
-        """Ensure we don't exceed the API rate limit."""
-        now = time.time()
+        """Wait for a token from the shared Companies House budget."""
+        self.rate_limiter.acquire(lane=self.priority)
+    
+    def _retry_after(self, response: requests.Response) -> float:
+        """Seconds to back off after a 429, from the response headers."""
+        return retry_after_seconds(response.headers)
+    
+    def _make_request(self, endpoint: str, params: Dict = None, etag: Optional[str] = None) -> Dict:
+        """
+        Make a request to the Companies House API, through the response cache.
         
-        # Remove calls outside the current window
-        self.rate_limit_calls = [
-            call_time for call_time in self.rate_limit_calls 
-            if now - call_time < self.window_seconds
-        ]
+        When ``etag`` is given the request is conditional, and NOT_MODIFIED
+        is returned if the resource has not changed since. Conditional
+        requests always go to the API (callers use them to detect change)
+        but refresh the cache with whatever they receive.
+        """
+        if self.cache is None:
+            return self._request(endpoint, params, etag)
+        
+        key = endpoint
+        if params:
+            key = f"{endpoint}?{urlencode(sorted(params.items()))}"
+        kind = _cache_kind(endpoint)
         
-        if len(self.rate_limit_calls) >= self.max_calls_per_window:
-            sleep_time = self.window_seconds - (now - self.rate_limit_calls[0])
-            logger.warning(f"Rate limit reached. Sleeping for {sleep_time:.1f} seconds")
-            time.sleep(sleep_time + 1)
-            self.rate_limit_calls = []
+        if etag:
+            data = self._request(endpoint, params, etag)
+            if data is not NOT_MODIFIED:
+                self.cache.set(key, kind, data)
+            return data
         
-        self.rate_limit_calls.append(now)
+        return self.cache.get_or_fetch(key, kind, lambda: self._request(endpoint, params))
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
-        """Make a request to the Companies House API with error handling."""
-        self._check_rate_limit()
+    def _request(self, endpoint: str, params: Dict = None, etag: Optional[str] = None) -> Dict:
+        """
+        Make a request to the Companies House API with error handling.
         
+        Returns None for 404, NOT_MODIFIED for 304 on a conditional request.
+        """
         url = f"{self.base_url}{endpoint}"
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
         
-        try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
+        for attempt in range(1, MAX_RATE_LIMIT_RETRIES + 1):
+            self._check_rate_limit()
             
-        except requests.exceptions.HTTPError as e:
-            if response.status_code == 404:
-                logger.warning(f"Resource not found: {url}")
-                return None
-            elif response.status_code == 429:
-                logger.warning("Rate limit exceeded")
-                time.sleep(60)
-                return self._make_request(endpoint, params)
-            else:
-                logger.error(f"HTTP error {response.status_code}: {e}")
-                raise
+            try:
+                response = self.session.get(url, params=params, headers=headers)
+                if etag:
+                    metrics.incr("companies_house.conditional_requests")
+                if response.status_code == 304:
+                    metrics.incr("companies_house.not_modified")
+                    return NOT_MODIFIED
+                response.raise_for_status()
+                return with_etag(response.json(), response.headers.get("ETag"))
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {e}")
-            raise
+            except requests.exceptions.HTTPError as e:
+                if response.status_code == 404:
+                    logger.warning(f"Resource not found: {url}")
+                    return None
+                elif response.status_code == 429:
+                    # Push the shared budget back so every process pauses,
+                    # not just this one
+                    delay = self._retry_after(response)
+                    logger.warning(f"Rate limit exceeded (attempt {attempt}), backing off {delay:.0f}s")
+                    metrics.incr("companies_house.http_429")
+                    self.rate_limiter.penalize(delay)
+                    continue
+                elif response.status_code in RETRY_STATUSES and attempt < MAX_RATE_LIMIT_RETRIES:
+                    logger.warning(f"HTTP {response.status_code} (attempt {attempt}), retrying")
+                    metrics.incr("companies_house.http_5xx_retries")
+                    time.sleep(0.3 * 2 ** (attempt - 1))
+                    continue
+                else:
+                    logger.error(f"HTTP error {response.status_code}: {e}")
+                    raise
+                    
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Request failed: {e}")
+                raise
+        
+        raise RateLimitExceeded(self.rate_limiter.name, self.priority, self._retry_after(response))
     
     def search_companies(self, query: str, items_per_page: int = 20, start_index: int = 0) -> Dict:
         """
@@ -109,20 +371,22 @@ class CompaniesHouseClient:
         
         return result
     
-    def get_company_profile(self, company_number: str) -> Dict:
+    def get_company_profile(self, company_number: str, etag: Optional[str] = None) -> Dict:
         """
         Get detailed company profile information.
         
         Args:
             company_number: The company registration number
+            etag: ETag from a previous fetch; makes the request conditional
             
         Returns:
-            Dict containing company profile data
+            Dict containing company profile data, or NOT_MODIFIED
         """
         logger.info(f"Fetching company profile: {company_number}")
-        return self._make_request(f"/company/{company_number}")
+        return self._make_request(f"/company/{company_number}", etag=etag)
     
-    def get_company_officers(self, company_number: str, items_per_page: int = 35, start_index: int = 0) -> Dict:
+    def get_company_officers(self, company_number: str, items_per_page: int = 35, start_index: int = 0,
+                             etag: Optional[str] = None) -> Dict:
         """
         Get company officers (directors, secretaries, etc.).
         
@@ -130,9 +394,10 @@ class CompaniesHouseClient:
             company_number: The company registration number
             items_per_page: Number of results per page (max 100)
             start_index: Starting index for pagination
+            etag: ETag from a previous fetch; makes the request conditional
             
         Returns:
-            Dict containing officers data
+            Dict containing officers data, or NOT_MODIFIED
         """
         params = {
             "items_per_page": min(items_per_page, 100),
@@ -140,9 +405,10 @@ class CompaniesHouseClient:
         }
         
         logger.info(f"Fetching officers for company: {company_number}")
-        return self._make_request(f"/company/{company_number}/officers", params)
+        return self._make_request(f"/company/{company_number}/officers", params, etag=etag)
     
-    def get_company_filings(self, company_number: str, items_per_page: int = 25, start_index: int = 0) -> Dict:
+    def get_company_filings(self, company_number: str, items_per_page: int = 25, start_index: int = 0,
+                            etag: Optional[str] = None) -> Dict:
         """
         Get company filing history.
         
@@ -150,9 +416,10 @@ class CompaniesHouseClient:
             company_number: The company registration number
             items_per_page: Number of results per page (max 100)
             start_index: Starting index for pagination
+            etag: ETag from a previous fetch; makes the request conditional
             
         Returns:
-            Dict containing filing history
+            Dict containing filing history, or NOT_MODIFIED
         """
         params = {
             "items_per_page": min(items_per_page, 100),
@@ -160,7 +427,7 @@ class CompaniesHouseClient:
         }
         
         logger.info(f"Fetching filings for company: {company_number}")
-        return self._make_request(f"/company/{company_number}/filing-history", params)
+        return self._make_request(f"/company/{company_number}/filing-history", params, etag=etag)
     
     def get_company_charges(self, company_number: str, items_per_page: int = 25, start_index: int = 0) -> Dict:
         """
@@ -182,6 +449,59 @@ class CompaniesHouseClient:
         logger.info(f"Fetching charges for company: {company_number}")
         return self._make_request(f"/company/{company_number}/charges", params)
     
+    def _iter_items(self, endpoint: str, page_size: int = MAX_PAGE_SIZE, start_index: int = 0,
+                    stop_when: Optional[Callable[[Dict], bool]] = None) -> Iterator[Dict]:
+        """
+        Lazily walk a paginated list endpoint one item at a time.
+        
+        Pages are only requested as the caller consumes items, so breaking
+        out of the loop (or a matching ``stop_when``) saves the remaining
+        requests.
+        
+        Args:
+            endpoint: API path of the list resource
+            page_size: Items per request (max 100)
+            start_index: Index of the first item to return
+            stop_when: Predicate; iteration ends at the first item for
+                which it returns True (that item is not yielded)
+        """
+        while True:
+            page = self._make_request(endpoint, {
+                "items_per_page": min(page_size, MAX_PAGE_SIZE),
+                "start_index": start_index
+            }) or {}
+            items = page.get("items") or []
+            
+            for item in items:
+                if stop_when and stop_when(item):
+                    return
+                yield item
+            
+            start_index += len(items)
+            total = page.get("total_results", page.get("total_count", 0))
+            if not items or start_index >= total:
+                return
+    
+    def iter_company_officers(self, company_number: str, page_size: int = MAX_PAGE_SIZE, start_index: int = 0,
+                              stop_when: Optional[Callable[[Dict], bool]] = None) -> Iterator[Dict]:
+        """Iterate over every officer of a company, fetching pages on demand."""
+        return self._iter_items(f"/company/{company_number}/officers", page_size, start_index, stop_when)
+    
+    def iter_company_filings(self, company_number: str, page_size: int = MAX_PAGE_SIZE, start_index: int = 0,
+                             stop_when: Optional[Callable[[Dict], bool]] = None) -> Iterator[Dict]:
+        """
+        Iterate over the filing history, newest first, fetching pages on demand.
+        
+        Pass ``stop_when=older_than(last_check)`` to read only filings made
+        since the last check, usually a single page.
+        """
+        return self._iter_items(f"/company/{company_number}/filing-history", page_size, start_index, stop_when)
+    
+    def iter_company_charges(self, company_number: str, page_size: int = MAX_PAGE_SIZE, start_index: int = 0,
+                             stop_when: Optional[Callable[[Dict], bool]] = None) -> Iterator[Dict]:
+        """Iterate over every charge registered against a company, fetching pages on demand."""
+        return self._iter_items(f"/company/{company_number}/charges", page_size, start_index, stop_when)
+    
     def get_company_insolvency(self, company_number: str) -> Dict:
         """
         Get company insolvency information.
@@ -195,12 +515,34 @@ class CompaniesHouseClient:
         logger.info(f"Fetching insolvency data for company: {company_number}")
         return self._make_request(f"/company/{company_number}/insolvency")
     
-    def get_full_company_data(self, company_number: str) -> Dict:
+    def get_company_pscs(self, company_number: str, items_per_page: int = 25, start_index: int = 0) -> Dict:
+        """
+        Get persons with significant control.
+        
+        Args:
+            company_number: The company registration number
+            items_per_page: Number of results per page (max 100)
+            start_index: Starting index for pagination
+            
+        Returns:
+            Dict containing PSC data
+        """
+        params = {
+            "items_per_page": min(items_per_page, 100),
+            "start_index": start_index
+        }
+        
+        logger.info(f"Fetching PSCs for company: {company_number}")
+        return self._make_request(f"/company/{company_number}/persons-with-significant-control", params)
+    
+    def get_full_company_data(self, company_number: str, concurrent: bool = False) -> Dict:
         """
         Get comprehensive company data including profile, officers, and recent filings.
         
         Args:
             company_number: The company registration number
+            concurrent: Fetch officers, filings, charges and insolvency in
+                parallel once the profile has returned
             
         Returns:
             Dict containing all available company data
@@ -226,112 +568,292 @@ class CompaniesHouseClient:
         data["profile"] = profile
         
         # Get additional data (optional)
-        try:
-            data["officers"] = self.get_company_officers(company_number, items_per_page=10)
-        except Exception as e:
-            logger.warning(f"Could not fetch officers for {company_number}: {e}")
-        
-        try:
-            data["recent_filings"] = self.get_company_filings(company_number, items_per_page=10)
-        except Exception as e:
-            logger.warning(f"Could not fetch filings for {company_number}: {e}")
+        calls = {
+            "officers": (self.get_company_officers, (company_number,), {"items_per_page": 10}),
+            "recent_filings": (self.get_company_filings, (company_number,), {"items_per_page": 10}),
+            "charges": (self.get_company_charges, (company_number,), {"items_per_page": 10}),
+            "insolvency": (self.get_company_insolvency, (company_number,), {}),
+        }
         
-        try:
-            data["charges"] = self.get_company_charges(company_number, items_per_page=10)
-        except Exception as e:
-            logger.warning(f"Could not fetch charges for {company_number}: {e}")
+        if concurrent:
+            data.update(fetch_concurrently(calls))
+            return data
         
-        try:
-            data["insolvency"] = self.get_company_insolvency(company_number)
-        except Exception as e:
-            logger.warning(f"Could not fetch insolvency for {company_number}: {e}")
+        for key, (func, args, kwargs) in calls.items():
+            try:
+                data[key] = func(*args, **kwargs)
+            except Exception as e:
+                logger.warning(f"Could not fetch {key} for {company_number}: {e}")
         
         return data
+
+
+@dataclass
+class CompanyProfile:
+    """Typed view of a Companies House company profile."""
+    company_number: str
+    company_name: Optional[str] = None
+    company_status: Optional[str] = None
+    company_status_detail: Optional[str] = None
+    date_of_creation: Optional[str] = None
+    type: Optional[str] = None
+    jurisdiction: Optional[str] = None
+    sic_codes: List[str] = field(default_factory=list)
+    registered_office_address: Dict = field(default_factory=dict)
+    accounts: Dict = field(default_factory=dict)
+    confirmation_statement: Dict = field(default_factory=dict)
+    has_charges: bool = False
+    has_insolvency_history: bool = False
+    previous_company_names: List[Dict] = field(default_factory=list)
+    etag: Optional[str] = None
     
-    def normalize_company_data(self, raw_data: Dict) -> Dict:
+    @classmethod
+    def from_api(cls, data: Dict) -> "CompanyProfile":
+        """Build a profile from the raw /company/{number} response."""
+        return cls(
+            company_number=data.get("company_number"),
+            company_name=data.get("company_name"),
+            company_status=data.get("company_status"),
+            company_status_detail=data.get("company_status_detail"),
+            date_of_creation=data.get("date_of_creation"),
+            type=data.get("type"),
+            jurisdiction=data.get("jurisdiction"),
+            sic_codes=data.get("sic_codes") or [],
+            registered_office_address=data.get("registered_office_address") or {},
+            accounts=data.get("accounts") or {},
+            confirmation_statement=data.get("confirmation_statement") or {},
+            has_charges=bool(data.get("has_charges")),
+            has_insolvency_history=bool(data.get("has_insolvency_history")),
+            previous_company_names=data.get("previous_company_names") or [],
+            etag=data.get("etag"),
+        )
+
+
+class CompaniesHouseAPI:
+    """
+    Higher-level Companies House API used by the REST blueprint and the
+    ingestion tasks.
+    
+    Wraps CompaniesHouseClient (and therefore the shared rate budget) and
+    returns item lists and typed profiles instead of raw response pages.
+    Reads bypass the response cache, since change detection needs the
+    current upstream state.
+    """
+    
+    def __init__(self, api_key: str = None, priority: str = BACKGROUND):
+        self.client = CompaniesHouseClient(api_key, priority=priority, use_cache=False)
+    
+    def search_companies(self, query: str, items_per_page: int = 20) -> List[Dict]:
+        """Search companies and annotate each hit with activity and age."""
+        result = self.client.search_companies(query, items_per_page=items_per_page) or {}
+        
+        companies = []
+        for item in result.get("items", []):
+            item = dict(item)
+            item["is_active"] = (item.get("company_status") or "").lower() == "active"
+            item["years_in_business"] = _years_since(item.get("date_of_creation"))
+            companies.append(item)
+        return companies
+    
+    def get_company_profile(self, company_number: str, etag: Optional[str] = None) -> Optional[CompanyProfile]:
         """
-        Normalize raw Companies House data into our standard format.
+        Fetch a company profile, or None if the company does not exist.
         
-        Args:
-            raw_data: Raw data from get_full_company_data()
-            
-        Returns:
-            Dict containing normalized company data
+        With ``etag`` the request is conditional and NOT_MODIFIED is
+        returned when the profile is unchanged.
         """
-        if not raw_data or not raw_data.get("profile"):
-            return None
-        
-        profile = raw_data["profile"]
-        
-        # Extract key information
-        normalized = {
-            "company_number": profile.get("company_number"),
-            "company_name": profile.get("company_name"),
-            "company_status": profile.get("company_status"),
-            "company_type": profile.get("type"),
-            "incorporation_date": profile.get("date_of_creation"),
-            "dissolution_date": profile.get("date_of_dissolution"),
-            "jurisdiction": profile.get("jurisdiction"),
-            "sic_codes": profile.get("sic_codes", []),
-            "registered_office_address": profile.get("registered_office_address", {}),
-            "accounts": profile.get("accounts", {}),
-            "confirmation_statement": profile.get("confirmation_statement", {}),
-            "links": profile.get("links", {}),
-            
-            # Additional processed data
-            "is_active": profile.get("company_status", "").lower() == "active",
-            "has_charges": bool(raw_data.get("charges", {}).get("total_count", 0)),
-            "has_insolvency": bool(raw_data.get("insolvency")),
-            "officer_count": raw_data.get("officers", {}).get("total_count", 0),
-            "recent_filing_count": raw_data.get("recent_filings", {}).get("total_count", 0),
-            
-            # Metadata
-            "fetched_at": raw_data.get("fetched_at"),
-            "raw_data": raw_data  # Store complete raw data for future use
-        }
+        data = self.client.get_company_profile(company_number, etag=etag)
+        if data is NOT_MODIFIED:
+            return NOT_MODIFIED
+        return CompanyProfile.from_api(data) if data else None
+    
+    def get_officers(self, company_number: str, active_only: bool = False,
+                     etag: Optional[str] = None) -> List[Dict]:
+        """
+        Fetch every officer, flagging each as active unless it has resigned.
         
-        # Add risk indicators
-        normalized["risk_indicators"] = self._calculate_risk_indicators(normalized)
+        The first page is requested conditionally when ``etag`` is given
+        (NOT_MODIFIED if unchanged); later pages are only fetched for
+        companies with more than 100 officers.
+        """
+        first = self.client.get_company_officers(company_number, items_per_page=MAX_PAGE_SIZE, etag=etag)
+        if first is NOT_MODIFIED:
+            return NOT_MODIFIED
+        
+        officers = ItemList(etag=(first or {}).get("etag"))
+        for officer in self._all_items(first, self.client.iter_company_officers, company_number):
+            officer = dict(officer)
+            officer["is_active"] = not officer.get("resigned_on")
+            if officer["is_active"] or not active_only:
+                officers.append(officer)
+        return officers
+    
+    def get_filing_history(self, company_number: str, items_per_page: int = 25,
+                           etag: Optional[str] = None, since: Optional[Union[date, datetime, str]] = None,
+                           all_pages: bool = False) -> List[Dict]:
+        """
+        Fetch recent filings, newest first.
         
-        return normalized
+        Args:
+            company_number: The company registration number
+            items_per_page: Size of the first (conditional) page
+            etag: ETag of a previous fetch; NOT_MODIFIED if unchanged
+            since: Keep paging until filings older than this date
+            all_pages: Walk the complete filing history
+        """
+        first = self.client.get_company_filings(company_number, items_per_page=items_per_page, etag=etag)
+        if first is NOT_MODIFIED:
+            return NOT_MODIFIED
+        first = first or {}
+        
+        if since is None and not all_pages:
+            return ItemList(first.get("items", []), etag=first.get("etag"))
+        
+        stop_when = older_than(since) if since is not None else None
+        return ItemList(
+            self._all_items(first, self.client.iter_company_filings, company_number, stop_when),
+            etag=first.get("etag"),
+        )
     
-    def _calculate_risk_indicators(self, company_data: Dict) -> Dict:
-        """Calculate basic risk indicators from company data."""
-        indicators = {
-            "overdue_accounts": False,
-            "overdue_confirmation_statement": False,
-            "has_charges": company_data.get("has_charges", False),
-            "has_insolvency_history": company_data.get("has_insolvency", False),
-            "is_dormant": False,
-            "risk_score": 0
-        }
+    def get_charges(self, company_number: str) -> List[Dict]:
+        """Fetch every charge, flagging outstanding and satisfied ones."""
+        charges = []
+        for charge in self.client.iter_company_charges(company_number):
+            charge = dict(charge)
+            status = (charge.get("status") or "").lower()
+            charge["is_outstanding"] = status in ("outstanding", "part-satisfied")
+            charge["is_satisfied"] = status in ("satisfied", "fully-satisfied")
+            charges.append(charge)
+        return charges
+    
+    @staticmethod
+    def _all_items(first_page: Optional[Dict], iterate: Callable, company_number: str,
+                   stop_when: Optional[Callable[[Dict], bool]] = None) -> Iterator[Dict]:
+        """Yield the items of an already-fetched first page, then any later pages."""
+        first_page = first_page or {}
+        items = first_page.get("items") or []
+        for item in items:
+            if stop_when and stop_when(item):
+                return
+            yield item
+        
+        total = first_page.get("total_results", first_page.get("total_count", 0))
+        if items and len(items) < total:
+            yield from iterate(company_number, start_index=len(items), stop_when=stop_when)
+    
+    def get_persons_with_significant_control(self, company_number: str) -> List[Dict]:
+        """Fetch persons with significant control."""
+        result = self.client.get_company_pscs(company_number, items_per_page=100) or {}
+        return result.get("items", [])
+    
+    def monitor_company_changes(self, company_number: str,
+                                last_check: Optional[Union[datetime, str]],
+                                etags: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Detect filings and officer changes since the last check.
         
-        # Check if accounts are overdue
-        accounts = company_data.get("accounts", {})
-        if accounts.get("overdue"):
-            indicators["overdue_accounts"] = True
-            indicators["risk_score"] += 3
+        Profile, filings and officers are requested conditionally when
+        their ETags are known; a 304 means that resource has no changes
+        to diff.
         
-        # Check if confirmation statement is overdue
-        cs = company_data.get("confirmation_statement", {})
-        if cs.get("overdue"):
-            indicators["overdue_confirmation_statement"] = True
-            indicators["risk_score"] += 2
+        Args:
+            company_number: The company registration number
+            last_check: Time of the previous check (datetime or ISO string)
+            etags: ETags from the previous check, keyed "profile",
+                "filings" and "officers"
+            
+        Returns:
+            Dict describing the detected changes, the refreshed ETags and
+            whether every resource came back 304 ("not_modified")
+        """
+        since = _parse_date(last_check)
+        etags = dict(etags or {})
+        
+        results = fetch_concurrently({
+            "profile": (self.get_company_profile, (company_number,), {"etag": etags.get("profile")}),
+            "filings": (self.get_filing_history, (company_number,),
+                        {"items_per_page": 25, "etag": etags.get("filings"), "since": since}),
+            "officers": (self.get_officers, (company_number,), {"etag": etags.get("officers")}),
+        })
         
-        # Check for charges
-        if indicators["has_charges"]:
-            indicators["risk_score"] += 1
+        not_modified = [key for key, value in results.items() if value is NOT_MODIFIED]
+        for key, value in results.items():
+            if value is not NOT_MODIFIED and getattr(value, "etag", None):
+                etags[key] = value.etag
         
-        # Check for insolvency history
-        if indicators["has_insolvency_history"]:
-            indicators["risk_score"] += 5
+        filings = results["filings"] if isinstance(results["filings"], list) else []
+        officers = results["officers"] if isinstance(results["officers"], list) else []
         
-        # Check if company is inactive
-        if not company_data.get("is_active"):
-            indicators["risk_score"] += 4
+        new_filings = [
+            f for f in filings
+            if since is None or (_parse_date(f.get("date")) or since) > since
+        ]
+        officer_changes = [
+            o for o in officers
+            if since is None
+            or (_parse_date(o.get("appointed_on")) or since) > since
+            or (_parse_date(o.get("resigned_on")) or since) > since
+        ]
         
-        return indicators
+        return {
+            "company_number": company_number,
+            "checked_at": datetime.utcnow().isoformat(),
+            "changes_detected": bool(new_filings or officer_changes),
+            "not_modified": len(not_modified) == len(results),
+            "not_modified_resources": not_modified,
+            "etags": etags,
+            "new_filings": new_filings,
+            "officer_changes": officer_changes,
+        }
+
+
+def _cache_kind(endpoint: str) -> str:
+    """Classify an API path for cache TTLs: search, profile or a sub-resource."""
+    if endpoint.startswith("/search"):
+        return "search"
+    parts = endpoint.strip("/").split("/")
+    if len(parts) <= 2:
+        return "profile"
+    return _CACHE_KINDS.get(parts[2], "profile")
+
+
+def _parse_date(value: Optional[Union[date, datetime, str]]) -> Optional[datetime]:
+    """Parse a date, datetime or ISO date/datetime string; None if unparseable."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    try:
+        return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def older_than(since: Union[date, datetime, str], date_field: str = "date") -> Callable[[Dict], bool]:
+    """
+    Predicate for the paginating iterators: True once an item's
+    ``date_field`` falls before ``since``.
+    
+    Example:
+        client.iter_company_filings(number, stop_when=older_than(last_check))
+    """
+    # Filing dates are day-precision, so compare whole days
+    cutoff = _parse_date(since)
+    if cutoff is not None:
+        cutoff = cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    def predicate(item: Dict) -> bool:
+        item_date = _parse_date(item.get(date_field))
+        return cutoff is not None and item_date is not None and item_date < cutoff
+    
+    return predicate
+
 
+def _years_since(date_str: Optional[str]) -> Optional[int]:
+    created = _parse_date(date_str)
+    if not created:
+        return None
+    return (datetime.utcnow() - created).days // 365
 
 # Convenience functions for easy usage
 def search_companies(query: str, api_key: str = None) -> Dict:
@@ -342,7 +864,7 @@ def search_companies(query: str, api_key: str = None) -> Dict:
 def get_company_data(company_number: str, api_key: str = None) -> Dict:
     """Quick fetch of complete company data."""
     client = CompaniesHouseClient(api_key)
-    raw_data = client.get_full_company_data(company_number)
+    raw_data = client.get_full_company_data(company_number, concurrent=True)
     if raw_data:
         return client.normalize_company_data(raw_data)
     return None
@@ -0,0 +1,345 @@
+# backend/data_sources/companies_house_async.py
+"""
+asyncio Companies House client for bulk ingestion and monitoring sweeps.
+
+Mirrors the CompaniesHouseClient method surface, but keeps many requests
+in flight from a single process over pooled keep-alive connections. All
+requests still draw from the shared Redis rate budget, so one process can
+saturate the API allowance without exceeding it.
+
+The monitoring sweep (worker.monitor_companies) fetches each batch of
+profiles through bulk_fetch_company_profiles().
+
+Usage:
+    async with AsyncCompaniesHouseClient(concurrency=20) as client:
+        results = await client.get_many_full_company_data(numbers)
+"""
+
+import os
+import asyncio
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+import aiohttp
+
+from backend.config import settings
+from backend.data_sources.companies_house import (
+    MAX_PAGE_SIZE, MAX_RATE_LIMIT_RETRIES, NOT_MODIFIED, RETRY_STATUSES, CompaniesHouseNormalizer,
+    retry_after_seconds, with_etag
+)
+from backend.utils import metrics
+from backend.utils.rate_limiter import (
+    BACKGROUND, RateLimiter, RateLimitExceeded, get_companies_house_limiter
+)
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://api.company-information.service.gov.uk"
+
+
+class AsyncCompaniesHouseClient(CompaniesHouseNormalizer):
+    """
+    asyncio Companies House API client.
+
+    Use as an async context manager so the connection pool is closed
+    cleanly. ``concurrency`` bounds both the number of requests in flight
+    and the size of the keep-alive pool.
+    """
+
+    def __init__(self, api_key: str = None, priority: str = BACKGROUND, concurrency: int = 10,
+                 rate_limiter: Optional[RateLimiter] = None, timeout: int = 30, base_url: str = None):
+        self.api_key = api_key or os.getenv("COMPANIES_HOUSE_API_KEY")
+        if not self.api_key:
+            raise ValueError("Companies House API key is required")
+
+        self.base_url = (base_url or BASE_URL).rstrip("/")
+        self.priority = priority
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or get_companies_house_limiter()
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncCompaniesHouseClient":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session lazily, inside the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency,
+                keepalive_timeout=30,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                auth=aiohttp.BasicAuth(self.api_key, ""),
+                headers={
+                    "Content-Type": "application/json",
+                    "User-Agent": "UK-Customer-Intelligence-Platform/1.0"
+                },
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def close(self):
+        """Close the connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _make_request(self, endpoint: str, params: Dict = None, etag: Optional[str] = None) -> Optional[Dict]:
+        """
+        Make a request to the Companies House API with error handling.
+
+        When ``etag`` is given the request is conditional, and NOT_MODIFIED
+        is returned if the resource has not changed since.
+        """
+        session = await self._get_session()
+        url = f"{self.base_url}{endpoint}"
+        headers = {"If-None-Match": etag} if etag else None
+        retry_after = 60.0
+
+        for attempt in range(1, MAX_RATE_LIMIT_RETRIES + 1):
+            # Take the slot first so only `concurrency` coroutines poll the budget
+            async with self._semaphore:
+                await self.rate_limiter.acquire_async(lane=self.priority)
+
+                try:
+                    async with session.get(url, params=params, headers=headers) as response:
+                        if etag:
+                            metrics.incr("companies_house.conditional_requests")
+                        if response.status == 304:
+                            metrics.incr("companies_house.not_modified")
+                            return NOT_MODIFIED
+
+                        if response.status == 404:
+                            logger.warning(f"Resource not found: {url}")
+                            return None
+
+                        if response.status == 429:
+                            retry_after = retry_after_seconds(response.headers)
+                            logger.warning(f"Rate limit exceeded (attempt {attempt}), backing off {retry_after:.0f}s")
+                            metrics.incr("companies_house.http_429")
+                            await asyncio.to_thread(self.rate_limiter.penalize, retry_after)
+                            continue
+
+                        if response.status in RETRY_STATUSES and attempt < MAX_RATE_LIMIT_RETRIES:
+                            logger.warning(f"HTTP {response.status} (attempt {attempt}), retrying")
+                            metrics.incr("companies_house.http_5xx_retries")
+                            await asyncio.sleep(0.3 * 2 ** (attempt - 1))
+                            continue
+
+                        response.raise_for_status()
+                        return with_etag(await response.json(), response.headers.get("ETag"))
+
+                except aiohttp.ClientResponseError as e:
+                    logger.error(f"HTTP error {e.status}: {e}")
+                    raise
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.error(f"Request failed: {e}")
+                    raise
+
+        raise RateLimitExceeded(self.rate_limiter.name, self.priority, retry_after)
+
+    async def search_companies(self, query: str, items_per_page: int = 20, start_index: int = 0) -> Dict:
+        """Search for companies by name or company number."""
+        params = {
+            "q": query,
+            "items_per_page": min(items_per_page, MAX_PAGE_SIZE),
+            "start_index": start_index
+        }
+        logger.info(f"Searching companies: {query}")
+        return await self._make_request("/search/companies", params)
+
+    async def get_company_profile(self, company_number: str, etag: Optional[str] = None) -> Dict:
+        """Get detailed company profile information (NOT_MODIFIED if ``etag`` still matches)."""
+        logger.info(f"Fetching company profile: {company_number}")
+        return await self._make_request(f"/company/{company_number}", etag=etag)
+
+    async def get_company_officers(self, company_number: str, items_per_page: int = 35, start_index: int = 0,
+                                   etag: Optional[str] = None) -> Dict:
+        """Get one page of company officers."""
+        return await self._get_page(f"/company/{company_number}/officers", items_per_page, start_index, etag)
+
+    async def get_company_filings(self, company_number: str, items_per_page: int = 25, start_index: int = 0,
+                                  etag: Optional[str] = None) -> Dict:
+        """Get one page of company filing history."""
+        return await self._get_page(f"/company/{company_number}/filing-history", items_per_page, start_index, etag)
+
+    async def get_company_charges(self, company_number: str, items_per_page: int = 25, start_index: int = 0) -> Dict:
+        """Get one page of company charges."""
+        return await self._get_page(f"/company/{company_number}/charges", items_per_page, start_index)
+
+    async def get_company_pscs(self, company_number: str, items_per_page: int = 25, start_index: int = 0) -> Dict:
+        """Get one page of persons with significant control."""
+        return await self._get_page(
+            f"/company/{company_number}/persons-with-significant-control", items_per_page, start_index
+        )
+
+    async def get_company_insolvency(self, company_number: str) -> Dict:
+        """Get company insolvency information."""
+        return await self._make_request(f"/company/{company_number}/insolvency")
+
+    async def _get_page(self, endpoint: str, items_per_page: int, start_index: int,
+                        etag: Optional[str] = None) -> Dict:
+        params = {
+            "items_per_page": min(items_per_page, MAX_PAGE_SIZE),
+            "start_index": start_index
+        }
+        return await self._make_request(endpoint, params, etag=etag)
+
+    async def _iter_items(self, endpoint: str, page_size: int = MAX_PAGE_SIZE, start_index: int = 0,
+                          stop_when: Optional[Callable[[Dict], bool]] = None) -> AsyncIterator[Dict]:
+        """
+        Walk a paginated list endpoint lazily, yielding one item at a time.
+
+        Iteration ends at the first item matching ``stop_when``, without
+        fetching any further pages.
+        """
+        while True:
+            page = await self._get_page(endpoint, page_size, start_index)
+            items = (page or {}).get("items") or []
+            for item in items:
+                if stop_when and stop_when(item):
+                    return
+                yield item
+
+            start_index += len(items)
+            total = (page or {}).get("total_results", (page or {}).get("total_count", 0))
+            if not items or start_index >= total:
+                return
+
+    def iter_company_officers(self, company_number: str, page_size: int = MAX_PAGE_SIZE, start_index: int = 0,
+                              stop_when: Optional[Callable[[Dict], bool]] = None) -> AsyncIterator[Dict]:
+        """Async iterator over every officer of a company."""
+        return self._iter_items(f"/company/{company_number}/officers", page_size, start_index, stop_when)
+
+    def iter_company_filings(self, company_number: str, page_size: int = MAX_PAGE_SIZE, start_index: int = 0,
+                             stop_when: Optional[Callable[[Dict], bool]] = None) -> AsyncIterator[Dict]:
+        """Async iterator over the filing history, newest first."""
+        return self._iter_items(f"/company/{company_number}/filing-history", page_size, start_index, stop_when)
+
+    def iter_company_charges(self, company_number: str, page_size: int = MAX_PAGE_SIZE, start_index: int = 0,
+                             stop_when: Optional[Callable[[Dict], bool]] = None) -> AsyncIterator[Dict]:
+        """Async iterator over every charge registered against a company."""
+        return self._iter_items(f"/company/{company_number}/charges", page_size, start_index, stop_when)
+
+    async def get_full_company_data(self, company_number: str) -> Optional[Dict]:
+        """
+        Get comprehensive company data including profile, officers, and recent filings.
+
+        The secondary requests are issued concurrently once the profile
+        has returned. Output matches CompaniesHouseClient.get_full_company_data.
+        """
+        data = {
+            "company_number": company_number,
+            "fetched_at": datetime.utcnow().isoformat(),
+            "profile": None,
+            "officers": None,
+            "recent_filings": None,
+            "charges": None,
+            "insolvency": None
+        }
+
+        profile = await self.get_company_profile(company_number)
+        if not profile:
+            logger.error(f"Could not fetch profile for company {company_number}")
+            return None
+        data["profile"] = profile
+
+        keys = ["officers", "recent_filings", "charges", "insolvency"]
+        results = await asyncio.gather(
+            self.get_company_officers(company_number, items_per_page=10),
+            self.get_company_filings(company_number, items_per_page=10),
+            self.get_company_charges(company_number, items_per_page=10),
+            self.get_company_insolvency(company_number),
+            return_exceptions=True,
+        )
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not fetch {key} for {company_number}: {result}")
+            else:
+                data[key] = result
+
+        return data
+
+    async def get_many_full_company_data(self, company_numbers: Iterable[str],
+                                         normalize: bool = True) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch many companies concurrently.
+
+        Args:
+            company_numbers: Company registration numbers (duplicates are fetched once)
+            normalize: Return normalize_company_data() output instead of raw data
+
+        Returns:
+            Dict of company number to (normalised) data, None where the
+            company was not found or the fetch failed
+        """
+        numbers = list(dict.fromkeys(company_numbers))
+
+        async def fetch_one(number: str) -> Optional[Dict]:
+            try:
+                raw = await self.get_full_company_data(number)
+                return self.normalize_company_data(raw) if normalize else raw
+            except Exception as e:
+                logger.error(f"Error fetching company {number}: {e}")
+                return None
+
+        results = await asyncio.gather(*(fetch_one(n) for n in numbers))
+        return dict(zip(numbers, results))
+
+    async def get_many_company_profiles(self, etags: Dict[str, Optional[str]]) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch many company profiles concurrently, conditionally where an ETag is known.
+
+        Args:
+            etags: Company number -> stored profile ETag (None for an unconditional fetch)
+
+        Returns:
+            Dict of company number to profile, NOT_MODIFIED, or None where
+            the company was not found or the fetch failed
+        """
+        async def fetch_one(number: str, etag: Optional[str]):
+            try:
+                return await self.get_company_profile(number, etag=etag)
+            except Exception as e:
+                logger.error(f"Error fetching profile {number}: {e}")
+                return None
+
+        numbers = list(etags)
+        results = await asyncio.gather(*(fetch_one(n, etags[n]) for n in numbers))
+        return dict(zip(numbers, results))
+
+
+def bulk_fetch_company_data(company_numbers: List[str], api_key: str = None,
+                            concurrency: int = 10) -> Dict[str, Optional[Dict]]:
+    """
+    Blocking entry point for Celery tasks and scripts: fetch and normalise
+    many companies from one process.
+    """
+    async def run():
+        async with AsyncCompaniesHouseClient(api_key, concurrency=concurrency) as client:
+            return await client.get_many_full_company_data(company_numbers)
+
+    return asyncio.run(run())
+
+
+def bulk_fetch_company_profiles(etags: Dict[str, Optional[str]], api_key: str = None,
+                                concurrency: int = None) -> Dict[str, Optional[Dict]]:
+    """Blocking entry point for get_many_company_profiles() (see the monitoring sweep)."""
+    async def run():
+        async with AsyncCompaniesHouseClient(
+            api_key, concurrency=concurrency or settings.COMPANIES_HOUSE_FANOUT_WORKERS
+        ) as client:
+            return await client.get_many_company_profiles(etags)
+
+    return asyncio.run(run())
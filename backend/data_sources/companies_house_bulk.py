@@ -0,0 +1,281 @@
+# backend/data_sources/companies_house_bulk.py
+"""
+Companies House "Basic Company Data" snapshot reader and loader.
+
+The monthly snapshot (BasicCompanyData-YYYY-MM-DD-partN_M.zip, ~5M rows
+in total) is streamed row by row straight out of the ZIP, so memory use is
+bounded by the batch size rather than the file. Batches are normalised to
+the same field names the API client uses, COPYed into an unlogged staging
+table and merged into ``companies_house_companies`` in one statement.
+
+Used by scripts/initial_data_load.py.
+"""
+
+import csv
+import glob
+import io
+import os
+import logging
+import zipfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MASTER_TABLE = "companies_house_companies"
+STAGING_TABLE = "companies_house_companies_staging"
+
+# Columns loaded from the snapshot, in COPY order
+COLUMNS = [
+    "company_number",
+    "company_name",
+    "company_status",
+    "company_status_detail",
+    "company_type",
+    "country_of_origin",
+    "date_of_creation",
+    "date_of_cessation",
+    "address_line_1",
+    "address_line_2",
+    "locality",
+    "region",
+    "country",
+    "postal_code",
+    "sic_codes",
+    "accounts_next_due",
+    "accounts_last_made_up_to",
+    "accounts_category",
+    "confirmation_statement_next_due",
+    "confirmation_statement_last_made_up_to",
+    "mortgage_charges",
+    "mortgages_outstanding",
+    "previous_names",
+    "snapshot_date",
+]
+
+# CompanyCategory values in the snapshot -> API "type" codes
+_COMPANY_TYPES = {
+    "private limited company": "ltd",
+    "public limited company": "plc",
+    "private unlimited company": "private-unlimited",
+    "limited liability partnership": "llp",
+    "limited partnership": "limited-partnership",
+    "community interest company": "ltd",
+    "charitable incorporated organisation": "charitable-incorporated-organisation",
+    "scottish charitable incorporated organisation": "scottish-charitable-incorporated-organisation",
+    "private limited company by guarantee without share capital": "private-limited-guarant-nsc",
+    "pri/ltd by guar/nsc (private, limited by guarantee, no share capital)": "private-limited-guarant-nsc",
+    "pri/lbg/nsc (private, limited by guarantee, no share capital, use of 'limited' exemption)":
+        "private-limited-guarant-nsc-limited-exemption",
+    "registered society": "registered-society-non-jurisdictional",
+    "overseas entity": "registered-overseas-entity",
+    "other company type": "other",
+}
+
+
+@dataclass
+class SnapshotFile:
+    """One snapshot part: a CSV, or a ZIP holding a single CSV."""
+    path: str
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def snapshot_date(self) -> Optional[date]:
+        """Date embedded in the file name (BasicCompanyData-2024-03-01-...)."""
+        parts = self.name.split("-")
+        try:
+            return date(int(parts[1]), int(parts[2]), int(parts[3][:2]))
+        except (IndexError, ValueError):
+            return None
+
+    def open(self) -> Tuple[io.TextIOBase, io.RawIOBase, int]:
+        """
+        Open the CSV for streaming.
+
+        Returns:
+            Tuple of (text stream, underlying binary stream for progress,
+            uncompressed size in bytes)
+        """
+        if self.path.lower().endswith(".zip"):
+            archive = zipfile.ZipFile(self.path)
+            member = next(i for i in archive.infolist() if i.filename.lower().endswith(".csv"))
+            raw = archive.open(member)
+            size = member.file_size
+        else:
+            raw = open(self.path, "rb")
+            size = os.path.getsize(self.path)
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", errors="replace", newline="")
+        return text, raw, size
+
+
+def find_snapshot_files(source: str) -> List[SnapshotFile]:
+    """
+    Resolve ``source`` (a file, directory or glob) to snapshot parts in order.
+    """
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "BasicCompanyData*.zip"))
+        paths += glob.glob(os.path.join(source, "BasicCompanyData*.csv"))
+    else:
+        paths = glob.glob(source)
+    return [SnapshotFile(p) for p in sorted(paths)]
+
+
+def iter_snapshot_rows(text: io.TextIOBase) -> Iterator[Dict[str, str]]:
+    """
+    Yield raw CSV rows as dicts. Header names are stripped, since the
+    published files carry stray leading spaces (" CompanyNumber").
+    """
+    reader = csv.reader(text)
+    header = [h.strip() for h in next(reader)]
+    for values in reader:
+        yield dict(zip(header, values))
+
+
+def _snapshot_date(value: str) -> Optional[str]:
+    """DD/MM/YYYY -> ISO date, None if blank or malformed."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%d/%m/%Y").date().isoformat()
+    except ValueError:
+        return None
+
+
+def _status(value: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Map snapshot CompanyStatus text to the API's status and status detail,
+    e.g. "Active - Proposal to Strike off" -> ("active", "active-proposal-to-strike-off").
+    """
+    value = (value or "").strip().lower()
+    if not value:
+        return None, None
+    slug = "-".join(value.replace(" - ", " ").split())
+    if value.startswith("active") and slug != "active":
+        return "active", slug
+    return slug, None
+
+
+def _int(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_snapshot_row(row: Dict[str, str], snapshot_date: Optional[str] = None) -> Optional[Tuple]:
+    """
+    Convert one snapshot row to a tuple in COLUMNS order.
+
+    Returns None for rows without a company number.
+    """
+    number = (row.get("CompanyNumber") or "").strip().upper()
+    if not number:
+        return None
+
+    status, status_detail = _status(row.get("CompanyStatus"))
+    category = (row.get("CompanyCategory") or "").strip()
+    previous_names = []
+    for i in range(1, 11):
+        name = (row.get(f"PreviousName_{i}.CompanyName") or "").strip()
+        if name:
+            previous_names.append(name)
+    sic_codes = []
+    for i in range(1, 5):
+        sic = (row.get(f"SICCode.SicText_{i}") or "").strip()
+        code = sic.split(" - ", 1)[0].strip()
+        if code and code.lower() != "none supplied":
+            sic_codes.append(code)
+
+    return (
+        number,
+        (row.get("CompanyName") or "").strip(),
+        status,
+        status_detail,
+        _COMPANY_TYPES.get(category.lower(), category.lower() or None),
+        (row.get("CountryOfOrigin") or "").strip() or None,
+        _snapshot_date(row.get("IncorporationDate")),
+        _snapshot_date(row.get("DissolutionDate")),
+        (row.get("RegAddress.AddressLine1") or "").strip() or None,
+        (row.get("RegAddress.AddressLine2") or "").strip() or None,
+        (row.get("RegAddress.PostTown") or "").strip() or None,
+        (row.get("RegAddress.County") or "").strip() or None,
+        (row.get("RegAddress.Country") or "").strip() or None,
+        (row.get("RegAddress.PostCode") or "").strip() or None,
+        sic_codes,
+        _snapshot_date(row.get("Accounts.NextDueDate")),
+        _snapshot_date(row.get("Accounts.LastMadeUpDate")),
+        (row.get("Accounts.AccountCategory") or "").strip().lower() or None,
+        _snapshot_date(row.get("ConfStmtNextDueDate")),
+        _snapshot_date(row.get("ConfStmtLastMadeUpDate")),
+        _int(row.get("Mortgages.NumMortCharges")),
+        _int(row.get("Mortgages.NumMortOutstanding")),
+        "; ".join(previous_names) or None,
+        snapshot_date,
+    )
+
+
+def normalize_batch(rows: List[Dict[str, str]], snapshot_date: Optional[str] = None) -> List[Tuple]:
+    """Normalise a batch of raw rows, dropping unusable ones."""
+    normalized = (normalize_snapshot_row(r, snapshot_date) for r in rows)
+    return [r for r in normalized if r is not None]
+
+
+def psycopg_dsn(database_url: str) -> str:
+    """Strip an SQLAlchemy driver suffix (postgresql+psycopg://) for psycopg."""
+    scheme, sep, rest = database_url.partition("://")
+    return f"{scheme.split('+', 1)[0]}{sep}{rest}"
+
+
+def ensure_staging_table(conn) -> None:
+    """
+    (Re)create the unlogged staging table (no WAL, no indexes), so it always
+    has the master table's current columns.
+    """
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        cur.execute(
+            f"CREATE UNLOGGED TABLE {STAGING_TABLE} "
+            f"(LIKE {MASTER_TABLE} INCLUDING DEFAULTS)"
+        )
+    conn.commit()
+
+
+# One statement per batch: dedupe within the batch, insert new companies and
+# update only rows whose content changed, so re-runs are cheap no-ops.
+_MERGE_SQL = f"""
+INSERT INTO {MASTER_TABLE} ({", ".join(COLUMNS)}, row_hash, updated_at)
+SELECT DISTINCT ON (company_number) {", ".join(COLUMNS)},
+       md5(ROW({", ".join(c for c in COLUMNS if c != "snapshot_date")})::text),
+       NOW()
+FROM {STAGING_TABLE}
+ORDER BY company_number
+ON CONFLICT (company_number) DO UPDATE SET
+    {", ".join(f"{c} = EXCLUDED.{c}" for c in COLUMNS if c != "company_number")},
+    row_hash = EXCLUDED.row_hash,
+    updated_at = NOW()
+WHERE {MASTER_TABLE}.row_hash IS DISTINCT FROM EXCLUDED.row_hash
+"""
+
+
+def load_batch(conn, rows: List[Tuple]) -> int:
+    """
+    COPY a normalised batch into staging and merge it into the master table.
+
+    Commits on success. Returns the number of rows inserted or changed.
+    """
+    if not rows:
+        return 0
+    with conn.cursor() as cur:
+        with cur.copy(f"COPY {STAGING_TABLE} ({', '.join(COLUMNS)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        cur.execute(_MERGE_SQL)
+        merged = cur.rowcount
+        cur.execute(f"TRUNCATE {STAGING_TABLE}")
+    conn.commit()
+    return merged
@@ -0,0 +1,205 @@
+# backend/data_sources/companies_house_delta.py
+"""
+Change detection between two monthly "Basic Company Data" snapshots.
+
+Each snapshot (~5M rows) is streamed once and hash-partitioned on
+company_number into ``buckets`` small files on disk. Matching buckets are
+then compared one pair at a time, so only ~1/buckets of a snapshot is
+ever held in memory.
+
+The result is a compact stream of change events:
+
+    {"company_number": "01234567", "change_type": "status_change",
+     "old": "active", "new": "liquidation"}
+
+with change types incorporated, restored, dissolved, status_change,
+name_change, address_change and sic_change.
+"""
+
+import json
+import os
+import shutil
+import logging
+import tempfile
+import zlib
+from contextlib import ExitStack
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from backend.data_sources.companies_house_bulk import (
+    COLUMNS, SnapshotFile, find_snapshot_files, iter_snapshot_rows, normalize_snapshot_row
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = 64
+
+_IDX = {name: i for i, name in enumerate(COLUMNS)}
+_ADDRESS_FIELDS = ["address_line_1", "address_line_2", "locality", "region", "country", "postal_code"]
+
+# Statuses that mean the company has left the register
+DISSOLVED_STATUSES = {"dissolved", "removed", "converted-closed", "closed"}
+
+
+def group_snapshots(source: str) -> Dict[date, List[SnapshotFile]]:
+    """Group the snapshot parts found in ``source`` by snapshot date."""
+    groups: Dict[date, List[SnapshotFile]] = {}
+    for snapshot in find_snapshot_files(source):
+        if snapshot.snapshot_date:
+            groups.setdefault(snapshot.snapshot_date, []).append(snapshot)
+    return dict(sorted(groups.items()))
+
+
+def _compact(row: tuple) -> list:
+    """The fields the delta compares, as a JSON-friendly list."""
+    return [
+        row[_IDX["company_number"]],
+        row[_IDX["company_name"]],
+        row[_IDX["company_status"]],
+        row[_IDX["company_status_detail"]],
+        [row[_IDX[f]] for f in _ADDRESS_FIELDS],
+        row[_IDX["sic_codes"]],
+        row[_IDX["date_of_creation"]],
+    ]
+
+
+def partition_snapshot(files: Iterable[SnapshotFile], out_dir: str, buckets: int = DEFAULT_BUCKETS) -> int:
+    """
+    Stream a snapshot into ``buckets`` JSON-lines files by company number hash.
+
+    Returns:
+        Number of companies written
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    count = 0
+    with ExitStack() as stack:
+        outputs = [
+            stack.enter_context(open(os.path.join(out_dir, f"{i:04d}.jsonl"), "w", encoding="utf-8"))
+            for i in range(buckets)
+        ]
+        for snapshot in files:
+            text, _, _ = snapshot.open()
+            with text:
+                for raw in iter_snapshot_rows(text):
+                    row = normalize_snapshot_row(raw)
+                    if row is None:
+                        continue
+                    bucket = zlib.crc32(row[0].encode("ascii", "replace")) % buckets
+                    outputs[bucket].write(json.dumps(_compact(row), separators=(",", ":")))
+                    outputs[bucket].write("\n")
+                    count += 1
+            logger.info(f"Partitioned {snapshot.name} ({count:,} companies so far)")
+    return count
+
+
+def _read_bucket(path: str) -> Dict[str, list]:
+    companies = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            companies[record[0]] = record
+    return companies
+
+
+def _event(number: str, change_type: str, old=None, new=None) -> Dict:
+    return {"company_number": number, "change_type": change_type, "old": old, "new": new}
+
+
+def diff_records(old: Optional[list], new: Optional[list], since: Optional[date] = None) -> List[Dict]:
+    """
+    Compare one company across two snapshots.
+
+    Args:
+        old: Compact record from the previous snapshot (None if absent)
+        new: Compact record from the new snapshot (None if absent)
+        since: Date of the previous snapshot; newcomers incorporated
+            before it are reported as "restored" rather than "incorporated"
+    """
+    if old is None and new is None:
+        return []
+    number = (new or old)[0]
+
+    if old is None:
+        created = new[6]
+        change_type = "restored" if since and created and created < since.isoformat() else "incorporated"
+        return [_event(number, change_type, new={"company_name": new[1], "date_of_creation": created})]
+
+    if new is None:
+        # The snapshot only lists live companies, so leaving it means dissolved
+        return [_event(number, "dissolved", old=old[2])]
+
+    events = []
+    if old[2] != new[2] or old[3] != new[3]:
+        change_type = "dissolved" if new[2] in DISSOLVED_STATUSES else "status_change"
+        events.append(_event(number, change_type,
+                             old=old[3] or old[2], new=new[3] or new[2]))
+    if old[1] != new[1]:
+        events.append(_event(number, "name_change", old=old[1], new=new[1]))
+    if old[4] != new[4]:
+        events.append(_event(number, "address_change",
+                             old=dict(zip(_ADDRESS_FIELDS, old[4])), new=dict(zip(_ADDRESS_FIELDS, new[4]))))
+    if sorted(old[5] or []) != sorted(new[5] or []):
+        events.append(_event(number, "sic_change", old=old[5], new=new[5]))
+    return events
+
+
+def diff_bucket(old_path: str, new_path: str, since: Optional[date] = None) -> Iterator[Dict]:
+    """Yield change events for one pair of bucket files."""
+    old = _read_bucket(old_path)
+    with open(new_path, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            yield from diff_records(old.pop(record[0], None), record, since)
+    for record in old.values():
+        yield from diff_records(record, None, since)
+
+
+def compute_delta(old_files: List[SnapshotFile], new_files: List[SnapshotFile],
+                  buckets: int = DEFAULT_BUCKETS, work_dir: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield change events between two snapshots in bounded memory.
+
+    Args:
+        old_files: Parts of the previous snapshot
+        new_files: Parts of the new snapshot
+        buckets: Number of hash partitions (memory use ~ snapshot / buckets)
+        work_dir: Scratch directory for bucket files (a temp dir by default)
+    """
+    scratch = tempfile.mkdtemp(prefix="ch-delta-", dir=work_dir)
+    try:
+        old_dir = os.path.join(scratch, "old")
+        new_dir = os.path.join(scratch, "new")
+        partition_snapshot(old_files, old_dir, buckets)
+        partition_snapshot(new_files, new_dir, buckets)
+
+        since = old_files[0].snapshot_date if old_files else None
+        for i in range(buckets):
+            name = f"{i:04d}.jsonl"
+            yield from diff_bucket(os.path.join(old_dir, name), os.path.join(new_dir, name), since)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def write_change_set(events: Iterable[Dict], path: str) -> Dict[str, int]:
+    """
+    Write events to a JSON-lines change set.
+
+    Returns:
+        Count of events per change type
+    """
+    counts: Dict[str, int] = {}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event, separators=(",", ":")))
+            f.write("\n")
+            counts[event["change_type"]] = counts.get(event["change_type"], 0) + 1
+    os.replace(tmp, path)
+    return counts
+
+
+def read_change_set(path: str) -> Iterator[Dict]:
+    """Stream events back from a change set file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
@@ -0,0 +1,307 @@
+# backend/data_sources/companies_house_stream.py
+"""
+Companies House Streaming API consumer.
+
+Companies House pushes every change on the register as newline-delimited
+JSON over long-lived HTTP connections, one per stream (companies, filings,
+officers, charges, insolvency cases, PSCs). A consumer per stream keeps its
+connection open, resumes from its last ``timepoint`` (kept in Redis) after
+a restart, and drops every event that is not about a monitored company.
+Matching events are routed to the existing ingestion tasks, so monitored
+companies are refreshed when they change instead of being polled.
+
+While every consumer is heartbeating, stream_is_healthy() lets the polling
+tasks stand down.
+
+Run with scripts/run_stream_consumer.py. For local testing, point
+COMPANIES_HOUSE_STREAM_URL at scripts/stream_replay_server.py.
+"""
+
+import os
+import re
+import json
+import time
+import random
+import logging
+import threading
+from base64 import b64encode
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from sqlalchemy import create_engine, text
+
+from backend.config import settings
+from backend.utils import metrics
+from backend.utils.http_session import get_http_session
+from backend.utils.redis_client import get_redis
+from backend.utils.task_dedup import enqueue_once
+
+logger = logging.getLogger(__name__)
+
+# Stream name -> path on the streaming host
+STREAMS = {
+    "companies": "companies",
+    "filings": "filings",
+    "officers": "officers",
+    "charges": "charges",
+    "insolvency": "insolvency-cases",
+    "pscs": "persons-with-significant-control",
+}
+
+# Streams whose health lets polling stand down
+CORE_STREAMS = ("companies", "filings", "officers")
+
+# A consumer is healthy while its heartbeat key exists
+HEARTBEAT_TTL_SECONDS = 120
+
+# Companies House sends a blank heartbeat line at least every ~30s
+STREAM_READ_TIMEOUT = 90
+
+# Resources each stream refreshes; the profile is always re-read
+STREAM_ENDPOINTS = {
+    "filings": ["filings"],
+    "officers": ["officers"],
+    "charges": ["charges"],
+    "pscs": ["pscs"],
+}
+
+_COMPANY_URI = re.compile(r"^/company/([A-Za-z0-9]+)")
+
+
+def _timepoint_key(stream: str) -> str:
+    return f"ch_stream:{stream}:timepoint"
+
+
+def _heartbeat_key(stream: str) -> str:
+    return f"ch_stream:{stream}:heartbeat"
+
+
+def stream_is_healthy(streams: Iterable[str] = CORE_STREAMS) -> bool:
+    """True while a consumer for each of ``streams`` has heartbeated recently."""
+    try:
+        redis = get_redis()
+        return all(redis.exists(_heartbeat_key(s)) for s in streams)
+    except Exception as e:
+        logger.debug(f"Stream health unknown: {e}")
+        return False
+
+
+def company_number_from_event(event: Dict) -> Optional[str]:
+    """Extract the company number an event is about."""
+    match = _COMPANY_URI.match(event.get("resource_uri") or "")
+    if match:
+        return match.group(1).upper()
+    data = event.get("data") or {}
+    if data.get("company_number"):
+        return str(data["company_number"]).upper()
+    if event.get("resource_kind") == "company-profile" and event.get("resource_id"):
+        return str(event["resource_id"]).upper()
+    return None
+
+
+class MonitoredCompanies:
+    """
+    In-memory index of monitored company numbers -> [(company_id, tenant_id)].
+
+    Reloaded from the database every ``refresh_seconds`` and shared by all
+    consumer threads in the process.
+    """
+
+    def __init__(self, database_url: str = None, refresh_seconds: int = 60):
+        self.engine = create_engine(database_url or os.getenv("DATABASE_URL"))
+        self.refresh_seconds = refresh_seconds
+        self._index: Dict[str, List[Tuple[str, int]]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, List[Tuple[str, int]]]:
+        index: Dict[str, List[Tuple[str, int]]] = {}
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT id, tenant_id, company_number FROM companies WHERE is_monitored = TRUE"
+            ))
+            for company_id, tenant_id, company_number in rows:
+                if company_number:
+                    index.setdefault(company_number.upper(), []).append((str(company_id), tenant_id))
+        return index
+
+    def _stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    def lookup(self, company_number: str) -> List[Tuple[str, int]]:
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    try:
+                        self._index = self._load()
+                        logger.info(f"Monitoring {len(self._index)} companies from the stream")
+                    except Exception as e:
+                        # Keep filtering with the previous set
+                        logger.error(f"Could not reload monitored companies: {e}")
+                    self._loaded_at = time.monotonic()
+        return self._index.get(company_number, [])
+
+    def __contains__(self, company_number: str) -> bool:
+        return bool(self.lookup(company_number))
+
+
+def route_to_ingestion(stream: str, company_number: str, targets: List[Tuple[str, int]], event: Dict) -> None:
+    """
+    Enqueue one sync of the changed company for every row that monitors it.
+
+    sync_company_for_tenants fetches each resource once and fans it out to
+    the tenant rows. Resource streams refresh that resource alongside the
+    profile; company and insolvency events refresh the profile, which
+    carries the has_insolvency_history flag.
+    """
+    # Imported here: the ingestion tasks import this module
+    from backend.tasks.companies_house_ingestion import sync_company_for_tenants
+
+    endpoints = STREAM_ENDPOINTS.get(stream, [])
+    sync_targets = [
+        {"company_id": company_id, "tenant_id": tenant_id, "endpoints": endpoints}
+        for company_id, tenant_id in targets
+    ]
+    # A burst of events for one company collapses into one queued sync
+    enqueue_once(sync_company_for_tenants, (company_number, sync_targets), key_parts=(company_number, stream))
+
+
+class StreamConsumer:
+    """
+    Long-running consumer for one Companies House stream.
+
+    Args:
+        stream: Key of STREAMS
+        monitored: Shared MonitoredCompanies index
+        api_key: Streaming API key (not the REST key)
+        base_url: Streaming host, e.g. a local replay server
+        on_match: Called with (stream, company_number, targets, event)
+    """
+
+    def __init__(self, stream: str, monitored: MonitoredCompanies, api_key: str = None,
+                 base_url: str = None, on_match: Callable = route_to_ingestion):
+        if stream not in STREAMS:
+            raise ValueError(f"Unknown stream: {stream}")
+        self.stream = stream
+        self.monitored = monitored
+        self.api_key = api_key or settings.COMPANIES_HOUSE_STREAM_API_KEY
+        if not self.api_key:
+            raise ValueError("Companies House streaming API key is required")
+        self.url = f"{(base_url or settings.COMPANIES_HOUSE_STREAM_URL).rstrip('/')}/{STREAMS[stream]}"
+        self.on_match = on_match
+
+        self.headers = {"Authorization": f"Basic {b64encode(f'{self.api_key}:'.encode()).decode()}"}
+        self.timepoint: Optional[int] = None
+        self._saved_timepoint: Optional[int] = None
+        self._last_save = float("-inf")
+        self._last_heartbeat = float("-inf")
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    def _load_timepoint(self) -> Optional[int]:
+        try:
+            value = get_redis().get(_timepoint_key(self.stream))
+            return int(value) if value is not None else None
+        except Exception as e:
+            logger.warning(f"[{self.stream}] could not load timepoint, starting from now: {e}")
+            return None
+
+    def _save_timepoint(self, force: bool = False) -> None:
+        if self.timepoint is None or self.timepoint == self._saved_timepoint:
+            return
+        if not force and time.monotonic() - self._last_save < 5:
+            return
+        try:
+            get_redis().set(_timepoint_key(self.stream), self.timepoint)
+            self._saved_timepoint = self.timepoint
+            self._last_save = time.monotonic()
+        except Exception as e:
+            logger.warning(f"[{self.stream}] could not save timepoint: {e}")
+
+    def _heartbeat(self) -> None:
+        if time.monotonic() - self._last_heartbeat < 10:
+            return
+        try:
+            get_redis().set(_heartbeat_key(self.stream), int(time.time()), ex=HEARTBEAT_TTL_SECONDS)
+            self._last_heartbeat = time.monotonic()
+        except Exception as e:
+            logger.debug(f"[{self.stream}] heartbeat not recorded: {e}")
+
+    # ------------------------------------------------------------------
+    # Event handling
+    # ------------------------------------------------------------------
+    def handle_line(self, line: bytes) -> None:
+        """Process one line of the stream (blank lines are heartbeats)."""
+        self._heartbeat()
+        if not line or not line.strip():
+            return
+
+        try:
+            event = json.loads(line)
+        except ValueError:
+            logger.warning(f"[{self.stream}] skipping malformed line: {line[:200]!r}")
+            return
+
+        timepoint = (event.get("event") or {}).get("timepoint")
+        company_number = company_number_from_event(event)
+        if company_number:
+            targets = self.monitored.lookup(company_number)
+            if targets:
+                metrics.incr(f"companies_house.stream.{self.stream}.matched")
+                logger.info(f"[{self.stream}] change for monitored company {company_number}")
+                self.on_match(self.stream, company_number, targets, event)
+
+        if timepoint is not None:
+            self.timepoint = int(timepoint)
+            self._save_timepoint()
+
+    # ------------------------------------------------------------------
+    # Connection loop
+    # ------------------------------------------------------------------
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """Consume until ``stop`` is set, reconnecting with backoff."""
+        stop = stop or threading.Event()
+        self.timepoint = self._saved_timepoint = self._load_timepoint()
+        backoff = 1.0
+
+        while not stop.is_set():
+            params = {"timepoint": self.timepoint + 1} if self.timepoint is not None else None
+            try:
+                with get_http_session().get(self.url, headers=self.headers, params=params, stream=True,
+                                            timeout=(settings.HTTP_CONNECT_TIMEOUT, STREAM_READ_TIMEOUT)) as response:
+                    if response.status_code == 416:
+                        logger.warning(f"[{self.stream}] timepoint {self.timepoint} out of range, resuming from now")
+                        self.timepoint = None
+                        continue
+                    if response.status_code == 429:
+                        raise requests.HTTPError("429 Too Many Requests", response=response)
+                    response.raise_for_status()
+
+                    logger.info(f"[{self.stream}] connected (timepoint {self.timepoint})")
+                    backoff = 1.0
+                    for line in response.iter_lines(chunk_size=None):
+                        self.handle_line(line)
+                        if stop.is_set():
+                            break
+            except requests.RequestException as e:
+                metrics.incr(f"companies_house.stream.{self.stream}.reconnects")
+                logger.warning(f"[{self.stream}] stream interrupted: {e}; reconnecting in {backoff:.0f}s")
+                stop.wait(backoff + random.uniform(0, 1))
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                self._save_timepoint(force=True)
+
+        logger.info(f"[{self.stream}] stopped at timepoint {self.timepoint}")
+
+
+def run_consumers(streams: Iterable[str], stop: threading.Event, base_url: str = None) -> List[threading.Thread]:
+    """Start one consumer thread per stream, sharing the monitored index."""
+    monitored = MonitoredCompanies()
+    threads = []
+    for stream in streams:
+        consumer = StreamConsumer(stream, monitored, base_url=base_url)
+        thread = threading.Thread(target=consumer.run, args=(stop,), name=f"ch-stream-{stream}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
@@ -0,0 +1,307 @@
+# backend/services/alert_service.py
+"""
+Buffered alert pipeline.
+
+Change detection publishes compact events to a Redis Stream instead of
+enqueueing a Celery message per change. drain_alert_events (run every few
+seconds by celery beat) reads them in batches through a consumer group,
+merges events for the same (tenant, company, alert type), drops items
+(filings, officers, ...) already alerted within ALERT_DEDUP_WINDOW_SECONDS
+and inserts alerts for whatever is new, as a follow-up to any earlier
+alert, with one multi-row INSERT per batch. Events are acknowledged only after
+the insert commits; ones left pending by a crashed drainer are reclaimed.
+New alerts are then added to the tenants' dashboard summaries.
+"""
+
+import os
+import json
+import socket
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from backend.config import settings
+from backend.services.dashboard_service import record_alerts
+from backend.utils import metrics
+from backend.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "alerts:events"
+CONSUMER_GROUP = "alert-writers"
+# Approximate cap on buffered events if nothing drains the stream
+STREAM_MAXLEN = 100000
+# Pending events idle this long belong to a dead drainer and are reclaimed
+RECLAIM_IDLE_MS = 60000
+# Items kept per event (e.g. filings); the alert describes the first few
+MAX_ITEMS_PER_EVENT = 20
+# How long a publish_alert dedup_key is remembered
+PUBLISH_DEDUP_TTL_SECONDS = 7 * 24 * 3600
+
+# alert_type -> (title, severity)
+ALERT_TYPES = {
+    "new_filing": ("New filing", "medium"),
+    "new_director": ("New director appointed", "medium"),
+    "director_resignation": ("Director resigned", "medium"),
+    "charge_change": ("Charge registered or updated", "high"),
+    "psc_change": ("Change in persons with significant control", "medium"),
+    "incorporated": ("Company incorporated", "low"),
+    "restored": ("Company restored to the register", "high"),
+    "dissolved": ("Company dissolved", "high"),
+    "status_change": ("Company status changed", "high"),
+    "name_change": ("Company name changed", "low"),
+    "address_change": ("Registered office changed", "low"),
+    "sic_change": ("Nature of business changed", "low"),
+}
+
+
+def _compact(data: Optional[Dict]) -> Dict:
+    """Trim list payloads so an event stays small on the stream."""
+    return {
+        key: value[:MAX_ITEMS_PER_EVENT] if isinstance(value, list) else value
+        for key, value in (data or {}).items()
+    }
+
+
+def publish_alert(company_id, tenant_id, alert_type: str, data: Optional[Dict] = None,
+                  dedup_key: Optional[str] = None) -> None:
+    """
+    Buffer one change event for the alert pipeline.
+
+    Args:
+        company_id: Company the change is about
+        tenant_id: Tenant to alert
+        alert_type: One of ALERT_TYPES (unknown types get a generic title)
+        data: Details, e.g. {"filings": [...]}
+        dedup_key: Identifies the event for replays; an event whose key was
+            published within PUBLISH_DEDUP_TTL_SECONDS is dropped
+    """
+    marker = f"alerts:published:{dedup_key}" if dedup_key else None
+    try:
+        redis = get_redis()
+        if marker and not redis.set(marker, 1, nx=True, ex=PUBLISH_DEDUP_TTL_SECONDS):
+            metrics.incr("alerts.duplicate")
+            return
+        try:
+            redis.xadd(STREAM_KEY, {
+                "company_id": str(company_id),
+                "tenant_id": str(tenant_id),
+                "alert_type": alert_type,
+                "data": json.dumps(_compact(data), separators=(",", ":"), default=str),
+            }, maxlen=STREAM_MAXLEN, approximate=True)
+        except Exception:
+            # Not published: let a retry through
+            if marker:
+                redis.delete(marker)
+            raise
+        metrics.incr("alerts.published")
+    except Exception as e:
+        logger.error(f"Could not publish {alert_type} alert for company {company_id}: {e}")
+
+
+def _value(value) -> str:
+    if isinstance(value, dict):
+        return ", ".join(str(v) for v in value.values() if v) or "-"
+    return str(value) if value else "-"
+
+
+def _describe(alert_type: str, data: Dict) -> str:
+    """One-paragraph description of the merged event data."""
+    if "old" in data or "new" in data:
+        return f"{_value(data.get('old'))} -> {_value(data.get('new'))}"
+
+    lines = []
+    for key, items in data.items():
+        if not isinstance(items, list):
+            continue
+        for item in items[:5]:
+            if isinstance(item, dict):
+                label = item.get("description") or item.get("name") or item.get("charge_code") \
+                    or item.get("type") or item.get("transaction_id")
+                when = item.get("date") or item.get("appointed_on") or item.get("resigned_on")
+                lines.append(f"{label} ({when})" if when else str(label))
+        if len(items) > 5:
+            lines.append(f"... and {len(items) - 5} more {key}")
+    return "; ".join(lines) or alert_type.replace("_", " ").capitalize()
+
+
+def _merge(events: Iterable[Tuple[str, Dict]]) -> Dict[Tuple[str, str, str], Dict]:
+    """Merge events per (tenant, company, alert type), concatenating list data."""
+    merged: Dict[Tuple[str, str, str], Dict] = {}
+    for _, fields in events:
+        key = (fields["tenant_id"], fields["company_id"], fields["alert_type"])
+        data = json.loads(fields.get("data") or "{}")
+        if key not in merged:
+            merged[key] = data
+            continue
+        for name, value in data.items():
+            if isinstance(value, list) and isinstance(merged[key].get(name), list):
+                merged[key][name].extend(value)
+            else:
+                merged[key][name] = value
+    return merged
+
+
+def _item_key(item) -> str:
+    """Fingerprint of one alerted item, or of event data without item lists."""
+    encoded = json.dumps(item, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def _unseen(data: Dict, seen: Set[str]) -> Tuple[Dict, List[str]]:
+    """
+    Drop the items in ``data`` whose fingerprint is in ``seen``.
+
+    Returns:
+        Tuple of (data with only new items, their fingerprints); no
+        fingerprints means there is nothing new to alert on
+    """
+    if not any(isinstance(value, list) for value in data.values()):
+        key = _item_key(data)
+        return data, [] if key in seen else [key]
+
+    remaining, keys = dict(data), []
+    for name, items in data.items():
+        if not isinstance(items, list):
+            continue
+        remaining[name] = []
+        for item in items:
+            key = _item_key(item)
+            if key in seen:
+                continue
+            seen.add(key)
+            keys.append(key)
+            remaining[name].append(item)
+    return remaining, keys
+
+
+def write_alerts(session, events: List[Tuple[str, Dict]]) -> List[Dict]:
+    """
+    Turn a batch of stream events into alert rows.
+
+    Returns:
+        The inserted alerts with their ids (the caller commits)
+    """
+    merged = _merge(events)
+    if not merged:
+        return []
+
+    company_ids = sorted({company_id for _, company_id, _ in merged})
+    names = dict(session.execute(text(
+        "SELECT id::text, company_name FROM companies WHERE id = ANY(CAST(:ids AS uuid[]))"
+    ), {"ids": company_ids}).fetchall())
+    # Items already alerted on recently, per (tenant, company, alert type)
+    seen: Dict[Tuple[str, str, str], Set[str]] = defaultdict(set)
+    for row in session.execute(text("""
+        SELECT tenant_id::text AS tenant_id, company_id::text AS company_id, alert_type, item_keys
+        FROM alerts
+        WHERE company_id = ANY(CAST(:ids AS uuid[]))
+        AND item_keys IS NOT NULL
+        AND created_at > NOW() - make_interval(secs => :window)
+    """), {"ids": company_ids, "window": settings.ALERT_DEDUP_WINDOW_SECONDS}):
+        seen[(row.tenant_id, row.company_id, row.alert_type)].update(row.item_keys)
+
+    rows = []
+    for (tenant_id, company_id, alert_type), data in merged.items():
+        data, item_keys = _unseen(data, seen[(tenant_id, company_id, alert_type)])
+        if not item_keys:
+            metrics.incr("alerts.deduplicated")
+            continue
+        title, severity = ALERT_TYPES.get(alert_type, (alert_type.replace("_", " ").capitalize(), "medium"))
+        company_name = names.get(company_id)
+        rows.append({
+            "tenant_id": tenant_id,
+            "company_id": company_id,
+            "alert_type": alert_type,
+            "title": f"{title}: {company_name}" if company_name else title,
+            "description": _describe(alert_type, data),
+            "severity": severity,
+            "item_keys": item_keys,
+        })
+    if not rows:
+        return []
+
+    # One statement for the whole batch
+    values, params = [], {}
+    for i, row in enumerate(rows):
+        values.append(f"(:tenant_id_{i}, :company_id_{i}, :alert_type_{i}, :title_{i}, "
+                      f":description_{i}, :severity_{i}, CAST(:item_keys_{i} AS text[]), NOW())")
+        params.update({f"{name}_{i}": value for name, value in row.items()})
+    inserted = {
+        (tenant_id, company_id, alert_type): (alert_id, created_at)
+        for alert_id, created_at, tenant_id, company_id, alert_type in session.execute(text(
+            "INSERT INTO alerts (tenant_id, company_id, alert_type, title, description, severity, item_keys, created_at) "
+            f"VALUES {', '.join(values)} "
+            "RETURNING id, created_at, tenant_id::text, company_id::text, alert_type"
+        ), params)
+    }
+    alerts = []
+    for row in rows:
+        alert_id, created_at = inserted[(row["tenant_id"], row["company_id"], row["alert_type"])]
+        alert = {name: value for name, value in row.items() if name != "item_keys"}
+        alerts.append(dict(alert, id=str(alert_id), company_name=names.get(row["company_id"]),
+                           created_at=created_at.isoformat(), is_read=False))
+    return alerts
+
+
+def _ensure_group(redis) -> None:
+    try:
+        redis.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+    except Exception as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def drain(session_factory, batch_size: int = 500, max_batches: int = 20) -> int:
+    """
+    Drain buffered events into alerts, one committed batch at a time.
+
+    Args:
+        session_factory: Callable returning a SQLAlchemy session
+        batch_size: Events read per batch
+        max_batches: Batches per call, so one drain never runs unbounded
+
+    Returns:
+        Number of alerts inserted
+    """
+    redis = get_redis()
+    _ensure_group(redis)
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+    inserted = 0
+
+    # Events a crashed drainer read but never acknowledged
+    _, reclaimed, *_ = redis.xautoclaim(STREAM_KEY, CONSUMER_GROUP, consumer,
+                                        min_idle_time=RECLAIM_IDLE_MS, count=batch_size)
+
+    for _ in range(max_batches):
+        if reclaimed:
+            events, reclaimed = reclaimed, None
+        else:
+            response = redis.xreadgroup(CONSUMER_GROUP, consumer, {STREAM_KEY: ">"}, count=batch_size)
+            events = response[0][1] if response else []
+        events = [(event_id, fields) for event_id, fields in events if fields]
+        if not events:
+            break
+
+        session = session_factory()
+        try:
+            alerts = write_alerts(session, events)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        record_alerts(alerts)
+        inserted += len(alerts)
+
+        redis.xack(STREAM_KEY, CONSUMER_GROUP, *[event_id for event_id, _ in events])
+        redis.xdel(STREAM_KEY, *[event_id for event_id, _ in events])
+        metrics.incr("alerts.events_drained", len(events))
+
+    if inserted:
+        metrics.incr("alerts.created", inserted)
+    return inserted
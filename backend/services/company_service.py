@@ -0,0 +1,120 @@
+# backend/services/company_service.py
+"""
+Company name search against the local copy of the register.
+
+companies_house_companies holds every UK company from the monthly bulk
+snapshot, with trigram (pg_trgm) GiST indexes on the current and former
+names (migration 010). A search takes the nearest names by word distance
+from each index, so "tesc" finds "TESCO PLC", typos still match and a
+company can be found by a name it no longer uses. Results are returned in
+the shape of the Companies House /search/companies response, so callers
+can use them in place of a live search.
+"""
+
+import re
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from backend.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Word distance (1 - word_similarity) above which a name is not a match
+MAX_DISTANCE = 0.5
+# Matches on a former name rank below equally close current names
+FORMER_NAME_PENALTY = 0.1
+
+_COMPANY_NUMBER = re.compile(r"^(?:[A-Z]{2}\d{6}|\d{8})$")
+
+_SEARCH_SQL = text("""
+    WITH hits AS (
+        (SELECT company_number, :q <<-> company_name AS distance
+         FROM companies_house_companies
+         ORDER BY :q <<-> company_name
+         LIMIT :limit)
+        UNION ALL
+        (SELECT company_number, (:q <<-> previous_names) + :former_penalty
+         FROM companies_house_companies
+         WHERE previous_names IS NOT NULL
+         ORDER BY :q <<-> previous_names
+         LIMIT :limit)
+        UNION ALL
+        SELECT company_number, 0 FROM companies_house_companies WHERE company_number = :number
+    ),
+    best AS (
+        SELECT company_number, MIN(distance) AS distance FROM hits GROUP BY company_number
+    )
+    SELECT m.company_number, m.company_name, m.company_status, m.company_type,
+           m.date_of_creation, m.date_of_cessation, m.address_line_1, m.address_line_2,
+           m.locality, m.region, m.country, m.postal_code
+    FROM best b
+    JOIN companies_house_companies m ON m.company_number = b.company_number
+    WHERE b.distance <= :max_distance
+    ORDER BY b.distance, (m.company_status = 'active') DESC, length(m.company_name), m.company_name
+    LIMIT :limit
+""")
+
+
+def _search_item(row) -> Dict:
+    """A result row as a Companies House search item."""
+    address = {
+        "address_line_1": row.address_line_1,
+        "address_line_2": row.address_line_2,
+        "locality": row.locality,
+        "region": row.region,
+        "country": row.country,
+        "postal_code": row.postal_code,
+    }
+    return {
+        "company_number": row.company_number,
+        "title": row.company_name,
+        "company_status": row.company_status,
+        "company_type": row.company_type,
+        "date_of_creation": row.date_of_creation.isoformat() if row.date_of_creation else None,
+        "date_of_cessation": row.date_of_cessation.isoformat() if row.date_of_cessation else None,
+        "address": address,
+        "address_snippet": ", ".join(v for v in address.values() if v),
+    }
+
+
+def search_local_companies(session, query: str, max_results: int = 20) -> Optional[Dict]:
+    """
+    Search the local register by company name, former name or number.
+
+    Args:
+        session: SQLAlchemy session
+        query: What the user typed
+        max_results: Page size
+
+    Returns:
+        {"items": [...], "total_results": n} like the Companies House
+        search, or None on a miss (nothing close enough, register not
+        loaded, or the query failed) so the caller can search live
+    """
+    query = " ".join(query.split())
+    if not query:
+        return None
+
+    try:
+        rows = session.execute(_SEARCH_SQL, {
+            "q": query,
+            "number": query.upper() if _COMPANY_NUMBER.match(query.upper()) else None,
+            "limit": max_results,
+            "former_penalty": FORMER_NAME_PENALTY,
+            "max_distance": MAX_DISTANCE,
+        }).fetchall()
+    except Exception as e:
+        logger.warning(f"Local company search failed for {query!r}: {e}")
+        session.rollback()
+        metrics.incr("company_search.local_error")
+        return None
+
+    if not rows:
+        metrics.incr("company_search.local_miss")
+        return None
+
+    metrics.incr("company_search.local_hit")
+    items = [_search_item(row) for row in rows]
+    return {"items": items, "total_results": len(items)}
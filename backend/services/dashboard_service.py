@@ -0,0 +1,224 @@
+# backend/services/dashboard_service.py
+"""
+Per-tenant dashboard summary, kept in Redis.
+
+``dashboard:<tenant_id>`` is a hash of monitored company counts by status
+and unread alert counts by severity; the most recent companies and alerts
+are Redis lists of JSON strings next to it (``:recent_companies``,
+``:recent_alerts``), stored and returned exactly as Python encoded them.
+The dashboard reads all three in one round trip. They are built from the
+database on first read and then kept current by the write paths:
+
+    record_company_added    monitoring started
+    record_alerts           alerts inserted (API, alert pipeline, sweep)
+    record_alert_read       an unread alert marked read
+    forget_dashboard        anything harder to apply in place (removals)
+
+Updates run as Lua scripts that do nothing when the hash is absent, so a
+missed or expired summary is rebuilt rather than half-updated. The keys
+expire after DASHBOARD_SUMMARY_TTL, which bounds drift from writers that
+do not report here.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from backend.utils import metrics
+from backend.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "dashboard"
+DASHBOARD_SUMMARY_TTL = 3600
+RECENT_LIMIT = 10
+
+# Push the JSON items in ARGV[3..n+2] (oldest first, n = ARGV[2]) onto list
+# KEYS[2], keep ARGV[1] of them, then apply the (field, delta) pairs after them
+_RECORD_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then return 0 end
+local count = tonumber(ARGV[2])
+for i = 3, count + 2 do
+    redis.call('lpush', KEYS[2], ARGV[i])
+end
+redis.call('ltrim', KEYS[2], 0, tonumber(ARGV[1]) - 1)
+local ttl = redis.call('pttl', KEYS[1])
+if ttl > 0 then redis.call('pexpire', KEYS[2], ttl) end
+for i = count + 3, #ARGV, 2 do
+    redis.call('hincrby', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+# Replace the recent alert ARGV[2] with ARGV[3] (the same alert marked read)
+# and decrement the unread counters for severity ARGV[1]
+_READ_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then return 0 end
+if ARGV[2] then
+    for i, v in ipairs(redis.call('lrange', KEYS[2], 0, -1)) do
+        if v == ARGV[2] then
+            redis.call('lset', KEYS[2], i - 1, ARGV[3])
+            break
+        end
+    end
+end
+redis.call('hincrby', KEYS[1], 'alerts:unread', -1)
+redis.call('hincrby', KEYS[1], 'alerts:unread:' .. ARGV[1], -1)
+return 1
+"""
+
+LIST_FIELDS = ("recent_companies", "recent_alerts")
+
+
+def _key(tenant_id) -> str:
+    return f"{KEY_PREFIX}:{tenant_id}"
+
+
+def _label(value: Optional[str]) -> str:
+    return value or "unknown"
+
+
+def _encode(item: Dict) -> str:
+    return json.dumps(item, separators=(",", ":"), default=str)
+
+
+def _counts(fields: Dict[str, str], prefix: str) -> Dict[str, int]:
+    return {
+        name[len(prefix):]: int(value)
+        for name, value in fields.items()
+        if name.startswith(prefix) and int(value) > 0
+    }
+
+
+def _parse(fields: Dict[str, str], lists: Dict[str, List[str]]) -> Dict:
+    return {
+        "total_companies": int(fields.get("companies:total", 0)),
+        "companies_by_status": _counts(fields, "companies:status:"),
+        "unread_alerts": int(fields.get("alerts:unread", 0)),
+        "unread_by_severity": _counts(fields, "alerts:unread:"),
+        "recent_companies": [json.loads(item) for item in lists["recent_companies"]],
+        "recent_alerts": [json.loads(item) for item in lists["recent_alerts"]],
+    }
+
+
+def get_dashboard_summary(tenant_id, build: Callable[[], Dict]) -> Dict:
+    """
+    The tenant's summary, building and storing it on a miss.
+
+    Args:
+        tenant_id: Tenant
+        build: Reads the summary from the database, returning
+            {"companies_by_status": {status: n}, "unread_by_severity":
+            {severity: n}, "recent_companies": [...], "recent_alerts": [...]}
+            with both lists newest first
+
+    Returns:
+        Summary with the same keys plus total_companies and unread_alerts
+    """
+    key = _key(tenant_id)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hgetall(key)
+        for name in LIST_FIELDS:
+            pipe.lrange(f"{key}:{name}", 0, -1)
+        fields, *lists = pipe.execute()
+        if fields:
+            metrics.incr("dashboard.summary_hit")
+            return _parse(fields, dict(zip(LIST_FIELDS, lists)))
+    except Exception as e:
+        logger.warning(f"Dashboard summary unavailable for tenant {tenant_id}: {e}")
+        fields = None
+
+    metrics.incr("dashboard.summary_miss")
+    summary = build()
+    mapping = {
+        "companies:total": sum(summary["companies_by_status"].values()),
+        "alerts:unread": sum(summary["unread_by_severity"].values()),
+    }
+    for status, count in summary["companies_by_status"].items():
+        mapping[f"companies:status:{_label(status)}"] = count
+    for severity, count in summary["unread_by_severity"].items():
+        mapping[f"alerts:unread:{_label(severity)}"] = count
+    lists = {name: [_encode(item) for item in summary[name][:RECENT_LIMIT]] for name in LIST_FIELDS}
+
+    if fields is not None:
+        try:
+            pipe = get_redis().pipeline()
+            pipe.delete(key, *(f"{key}:{name}" for name in LIST_FIELDS))
+            pipe.hset(key, mapping=mapping)
+            for name, items in lists.items():
+                if items:
+                    pipe.rpush(f"{key}:{name}", *items)
+                pipe.expire(f"{key}:{name}", DASHBOARD_SUMMARY_TTL)
+            pipe.expire(key, DASHBOARD_SUMMARY_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Dashboard summary for tenant {tenant_id} not stored: {e}")
+    return _parse({k: str(v) for k, v in mapping.items()}, lists)
+
+
+def _record(tenant_id, list_field: str, items: List[Dict], deltas: Dict[str, int]) -> None:
+    """Add ``items`` (newest first) to a recent list and apply counter deltas."""
+    key = _key(tenant_id)
+    args = [RECENT_LIMIT, len(items), *(_encode(item) for item in reversed(items))]
+    for field, delta in deltas.items():
+        args += [field, delta]
+    try:
+        get_redis().eval(_RECORD_SCRIPT, 2, key, f"{key}:{list_field}", *args)
+    except Exception as e:
+        logger.warning(f"Dashboard summary for tenant {tenant_id} not updated, dropping it: {e}")
+        forget_dashboard(tenant_id)
+
+
+def record_company_added(tenant_id, company: Dict) -> None:
+    """A company was added to monitoring (``company`` as listed on the dashboard)."""
+    _record(tenant_id, "recent_companies", [company], {
+        "companies:total": 1,
+        f"companies:status:{_label(company.get('company_status'))}": 1,
+    })
+
+
+def record_alerts(alerts: Iterable[Dict]) -> None:
+    """
+    New unread alerts, in any order; each needs tenant_id, id, severity and
+    created_at plus the fields listed on the dashboard.
+    """
+    by_tenant: Dict[str, List[Dict]] = defaultdict(list)
+    for alert in alerts:
+        by_tenant[str(alert["tenant_id"])].append(alert)
+
+    for tenant_id, items in by_tenant.items():
+        items.sort(key=lambda a: str(a.get("created_at") or ""), reverse=True)
+        deltas: Dict[str, int] = defaultdict(int)
+        for alert in items:
+            deltas["alerts:unread"] += 1
+            deltas[f"alerts:unread:{_label(alert.get('severity'))}"] += 1
+        listed = [{k: v for k, v in alert.items() if k != "tenant_id"} for alert in items[:RECENT_LIMIT]]
+        _record(tenant_id, "recent_alerts", listed, deltas)
+
+
+def record_alert_read(tenant_id, alert_id, severity: Optional[str]) -> None:
+    """An unread alert was marked read."""
+    key = _key(tenant_id)
+    try:
+        redis = get_redis()
+        args = [_label(severity)]
+        for raw in redis.lrange(f"{key}:recent_alerts", 0, -1):
+            item = json.loads(raw)
+            if item.get("id") == str(alert_id):
+                args += [raw, _encode(dict(item, is_read=True))]
+                break
+        redis.eval(_READ_SCRIPT, 2, key, f"{key}:recent_alerts", *args)
+    except Exception as e:
+        logger.warning(f"Dashboard summary for tenant {tenant_id} not updated, dropping it: {e}")
+        forget_dashboard(tenant_id)
+
+
+def forget_dashboard(tenant_id) -> None:
+    """Drop the summary so the next read rebuilds it."""
+    try:
+        key = _key(tenant_id)
+        get_redis().delete(key, *(f"{key}:{name}" for name in LIST_FIELDS))
+    except Exception as e:
+        logger.error(f"Dashboard summary for tenant {tenant_id} could not be dropped: {e}")
@@ -1,18 +1,31 @@
 from backend import celery
+from backend.services.alert_service import drain, publish_alert
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Database connection for tasks
+engine = create_engine(os.getenv("DATABASE_URL"))
+Session = sessionmaker(bind=engine)
+
 @celery.task
 def generate_company_alert(company_id, tenant_id, alert_type, data):
-    """Generate alert for company changes"""
-    logger.info(f"Generating alert: {alert_type} for company {company_id}")
-    
-    # Simple implementation for now
-    # In production, this would save to database
+    """Buffer an alert (kept for messages queued before the alert stream)"""
+    publish_alert(company_id, tenant_id, alert_type, data)
     return {
-        "status": "alert_created",
+        "status": "alert_buffered",
         "type": alert_type,
         "company_id": company_id,
         "tenant_id": tenant_id
     }
+
+@celery.task(ignore_result=True)
+def drain_alert_events(batch_size: int = 500):
+    """Write buffered change events to the alerts table in batches"""
+    created = drain(Session, batch_size=batch_size)
+    if created:
+        logger.info(f"Created {created} alerts")
+    return created
@@ -6,15 +6,31 @@ Celery tasks for Companies House data ingestion and monitoring
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-from celery import group, chain
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 import os
+import re
 import json
+import time
+import random
+import uuid
 
 from backend import celery
-from backend.data_sources.companies_house import CompaniesHouseAPI, CompanyProfile
-from backend.tasks.alert_generation import generate_company_alert
+from backend.config import settings
+from backend.data_sources.companies_house import (
+    NOT_MODIFIED, CompaniesHouseAPI, CompanyProfile, fetch_concurrently
+)
+from backend.data_sources.companies_house_delta import (
+    compute_delta, group_snapshots, read_change_set, write_change_set
+)
+from backend.data_sources.companies_house_stream import stream_is_healthy
+from backend.services.alert_service import publish_alert
+from backend.utils import metrics
+from backend.utils.bulk_upsert import upsert_rows
+from backend.utils.content_hash import content_hash, is_unchanged, record_content_hash
+from backend.utils.polling_policy import polling_interval_hours
+from backend.utils.redis_client import get_redis
+from backend.utils.task_dedup import enqueue_once
 
 logger = logging.getLogger(__name__)
 
@@ -22,112 +38,276 @@ logger = logging.getLogger(__name__)
 engine = create_engine(os.getenv("DATABASE_URL"))
 Session = sessionmaker(bind=engine)
 
+# Filing categories that raise a new_filing alert
+ALERT_FILING_CATEGORIES = ('accounts', 'confirmation-statement', 'incorporation')
+
+# (column, SQL type) specs for the set-based child-table upserts
+FILING_COLUMNS = [
+    ('transaction_id', 'varchar'), ('category', 'varchar'), ('type', 'varchar'),
+    ('date', 'date'), ('description', 'text'), ('paper_filed', 'boolean'), ('raw_data', 'jsonb'),
+]
+CHARGE_COLUMNS = [
+    ('charge_number', 'varchar'), ('charge_code', 'varchar'), ('status', 'varchar'),
+    ('classification', 'jsonb'), ('created_on', 'date'), ('delivered_on', 'date'),
+    ('satisfied_on', 'date'), ('persons_entitled', 'jsonb'), ('particulars', 'text'), ('raw_data', 'jsonb'),
+]
+PSC_COLUMNS = [
+    ('psc_id', 'varchar'), ('name', 'varchar'), ('kind', 'varchar'), ('address', 'jsonb'),
+    ('nationality', 'varchar'), ('country_of_residence', 'varchar'), ('notified_on', 'date'),
+    ('ceased_on', 'date'), ('is_active', 'boolean'), ('nature_of_control', 'jsonb'), ('raw_data', 'jsonb'),
+]
+
+# Conditional-request ETag column per endpoint
+ETAG_COLUMNS = {
+    'profile': 'companies_house_etag',
+    'filings': 'companies_house_filings_etag',
+    'officers': 'companies_house_officers_etag',
+}
+
+# Bulk import scheduling: API requests one import costs on average (profile,
+# every page of filings, officers incl. extra pages) and companies released
+# per chunk
+BULK_IMPORT_REQUESTS_PER_COMPANY = 5
+BULK_IMPORT_CHUNK_SIZE = 50
+# Companies checked more recently than this are not re-imported
+BULK_IMPORT_FRESH_HOURS = 24
+# Progress counters outlive the import long enough for /task/<id> polling
+BULK_IMPORT_KEY_TTL = 86400
+
+COMPANY_NUMBER_RE = re.compile(r'^[A-Z0-9]{8}$')
+
+# Child resources a monitoring sync can fetch; rows without a
+# company_monitoring_config get the ones the sweep has always covered
+MONITORED_ENDPOINTS = ('filings', 'officers', 'charges', 'pscs')
+DEFAULT_MONITORED_ENDPOINTS = ('filings', 'officers')
+
+# Monitored rows across all tenants, one entry per company number, each
+# with the targets a single fetch is fanned out to: (company_id,
+# tenant_id, endpoints the row's config asks for). config_interval_hours
+# is the shortest check interval any row's config asks for (NULL without
+# a config); priority caps it at the is_company_data_stale() thresholds
+# (high 1h, medium 1d, low 7d). Deadlines fall back to the snapshot table
+# for companies whose profile predates them.
+MONITORED_TARGETS_SQL = """
+    SELECT c.company_number,
+           json_agg(json_build_object(
+               'company_id', c.id,
+               'tenant_id', c.tenant_id,
+               'endpoints', array_remove(ARRAY[
+                   CASE WHEN COALESCE(cfg.monitor_filings, TRUE) THEN 'filings' END,
+                   CASE WHEN COALESCE(cfg.monitor_officers, TRUE) THEN 'officers' END,
+                   CASE WHEN COALESCE(cfg.monitor_charges, FALSE) THEN 'charges' END,
+                   CASE WHEN COALESCE(cfg.monitor_pscs, FALSE) THEN 'pscs' END
+               ], NULL)
+           )) AS targets,
+           MIN(CASE WHEN cfg.id IS NOT NULL THEN LEAST(
+               COALESCE(cfg.check_frequency_hours, 24),
+               CASE cfg.priority WHEN 'high' THEN 1 WHEN 'low' THEN 168 ELSE 24 END
+           ) END) AS config_interval_hours,
+           MAX(COALESCE(c.accounts_next_due, m.accounts_next_due)) AS accounts_next_due,
+           MAX(COALESCE(c.confirmation_statement_next_due, m.confirmation_statement_next_due))
+               AS confirmation_next_due
+    FROM companies c
+    JOIN tenants t ON t.id = c.tenant_id
+    LEFT JOIN company_monitoring_config cfg ON cfg.company_id = c.id
+    LEFT JOIN companies_house_companies m ON m.company_number = c.company_number
+    WHERE c.is_monitored = TRUE AND t.is_active = TRUE AND c.company_number IS NOT NULL
+      AND COALESCE(cfg.is_active, TRUE) = TRUE
+      {filter}
+    GROUP BY c.company_number
+"""
+
+# Refresh scheduler: sorted set of company number -> next due time (epoch
+# seconds), driven by monitoring_scheduler_tick every SCHEDULER_TICK_SECONDS
+SCHEDULE_KEY = 'monitoring:schedule'
+SCHEDULE_INTERVALS_KEY = 'monitoring:intervals'
+SCHEDULER_TICK_SECONDS = 60
+# How often the schedule is reconciled with the monitored companies
+SCHEDULER_RESYNC_SECONDS = 600
+
+# Snapshot files land in data/raw; change sets are written to data/processed
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+
 @celery.task(bind=True, max_retries=3)
-def fetch_company_profile(self, company_number: str, tenant_id: int) -> Dict:
+def fetch_company_profile(self, company_number: str, tenant_id: int, import_id: Optional[str] = None) -> Dict:
     """
     Fetch and store company profile from Companies House
     
+    Known companies are refreshed with a conditional request; when the
+    profile is unchanged (304, or a 200 whose content hash matches the
+    stored one) the row update is skipped entirely, and so are the
+    filings and officers refreshes: those are left to the stream and the
+    monitoring schedule.
+    
     Args:
         company_number: UK company registration number
         tenant_id: Tenant ID for multi-tenant data isolation
+        import_id: Bulk import this fetch belongs to, for progress reporting
         
     Returns:
         Company profile data
     """
     try:
-        api = CompaniesHouseAPI()
-        profile = api.get_company_profile(company_number)
-        
-        if not profile:
-            logger.warning(f"Company not found: {company_number}")
-            return {'error': 'Company not found'}
-        
-        # Store in database
         session = Session()
         try:
             # Check if company exists
-            existing = session.execute(
-                "SELECT id FROM companies WHERE company_number = %s AND tenant_id = %s",
-                (company_number, tenant_id)
-            ).fetchone()
-            
-            if existing:
-                # Update existing company
-                session.execute("""
-                    UPDATE companies 
-                    SET 
-                        company_name = %s,
-                        status = %s,
-                        incorporation_date = %s,
-                        company_type = %s,
-                        sic_codes = %s,
-                        registered_address = %s,
-                        raw_data = %s,
-                        last_updated = NOW(),
-                        last_companies_house_check = NOW()
-                    WHERE company_number = %s AND tenant_id = %s
-                """, (
-                    profile.company_name,
-                    profile.company_status,
-                    profile.date_of_creation,
-                    profile.type,
-                    json.dumps(profile.sic_codes),
-                    json.dumps(profile.registered_office_address),
-                    json.dumps(profile.__dict__),
-                    company_number,
-                    tenant_id
-                ))
-                company_id = existing[0]
-                action = 'updated'
-            else:
-                # Insert new company
-                result = session.execute("""
-                    INSERT INTO companies (
-                        tenant_id, company_number, company_name, status,
-                        incorporation_date, company_type, sic_codes,
-                        registered_address, raw_data, source,
-                        last_companies_house_check, created_at, last_updated
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, 'companies_house',
-                        NOW(), NOW(), NOW()
-                    ) RETURNING id
-                """, (
-                    tenant_id,
-                    company_number,
-                    profile.company_name,
-                    profile.company_status,
-                    profile.date_of_creation,
-                    profile.type,
-                    json.dumps(profile.sic_codes),
-                    json.dumps(profile.registered_office_address),
-                    json.dumps(profile.__dict__)
-                ))
-                company_id = result.fetchone()[0]
-                action = 'created'
+            existing = session.execute(text(
+                """SELECT id, companies_house_etag, content_hashes FROM companies
+                   WHERE company_number = :company_number AND tenant_id = :tenant_id"""
+            ), {'company_number': company_number, 'tenant_id': tenant_id}).fetchone()
             
-            session.commit()
+            api = CompaniesHouseAPI()
+            profile = api.get_company_profile(
+                company_number, etag=existing.companies_house_etag if existing else None
+            )
             
-            logger.info(f"Company {action}: {profile.company_name} ({company_number})")
+            if profile is NOT_MODIFIED:
+                session.execute(text(
+                    "UPDATE companies SET last_companies_house_check = NOW() WHERE id = :company_id"
+                ), {'company_id': existing.id})
+                session.commit()
+                
+                logger.info(f"Company profile unchanged (304): {company_number}")
+                company_id = existing.id
+                result = {
+                    'company_id': company_id,
+                    'company_number': company_number,
+                    'action': 'not_modified'
+                }
             
-            # Trigger related data fetches
-            fetch_company_filings.delay(company_number, company_id, tenant_id)
-            fetch_company_officers.delay(company_number, company_id, tenant_id)
+            elif not profile:
+                logger.warning(f"Company not found: {company_number}")
+                _bulk_import_progress(import_id, company_number, 'not_found')
+                return {'error': 'Company not found'}
             
-            return {
-                'company_id': company_id,
-                'company_number': company_number,
-                'company_name': profile.company_name,
-                'status': profile.company_status,
-                'action': action
-            }
+            elif existing and is_unchanged(existing.content_hashes, 'profile', content_hash(profile)):
+                # New ETag, same content: treated like a 304, the profile
+                # columns and raw_data are left alone. The ETag is kept so
+                # the next request is conditional again.
+                _store_etag(session, existing.id, 'profile', profile.etag)
+                session.execute(text(
+                    "UPDATE companies SET last_companies_house_check = NOW() WHERE id = :company_id"
+                ), {'company_id': existing.id})
+                session.commit()
+                
+                logger.info(f"Company profile content unchanged: {company_number}")
+                company_id = existing.id
+                result = {
+                    'company_id': company_id,
+                    'company_number': company_number,
+                    'action': 'not_modified'
+                }
+            
+            else:
+                company_id = _store_profile(
+                    session, tenant_id, company_number, profile, existing.id if existing else None
+                )
+                record_content_hash(session, company_id, 'profile', content_hash(profile))
+                action = 'updated' if existing else 'created'
+                
+                session.commit()
+                
+                logger.info(f"Company {action}: {profile.company_name} ({company_number})")
+                result = {
+                    'company_id': company_id,
+                    'company_number': company_number,
+                    'company_name': profile.company_name,
+                    'status': profile.company_status,
+                    'action': action
+                }
+            
+            # Trigger related data fetches for new or changed profiles (each
+            # is conditional on its own ETag, and dropped if the same fetch
+            # is already queued)
+            if result['action'] != 'not_modified':
+                enqueue_once(fetch_company_filings, (company_number, company_id, tenant_id))
+                enqueue_once(fetch_company_officers, (company_number, company_id, tenant_id))
+            
+            _bulk_import_progress(import_id, company_number, result['action'])
+            return result
             
         finally:
             session.close()
             
     except Exception as e:
         logger.error(f"Error fetching company {company_number}: {e}")
+        if self.request.retries >= self.max_retries:
+            _bulk_import_progress(import_id, company_number, 'failed')
         raise self.retry(exc=e, countdown=60)
 
+def _store_etag(session, company_id, endpoint: str, etag: Optional[str]) -> None:
+    """
+    Record a new ETag for content that matched the stored hash, so the next
+    request for ``endpoint`` (profile, filings or officers) is conditional.
+    """
+    if etag:
+        session.execute(text(
+            f"UPDATE companies SET {ETAG_COLUMNS[endpoint]} = :etag WHERE id = :company_id"
+        ), {'etag': etag, 'company_id': company_id})
+
+def _store_profile(session, tenant_id: int, company_number: str, profile: CompanyProfile,
+                   company_id=None):
+    """
+    Write a fetched profile to one tenant's company row, inserting it when
+    ``company_id`` is None.
+    
+    Returns:
+        The company row ID
+    """
+    params = {
+        'tenant_id': tenant_id,
+        'company_number': company_number,
+        'company_name': profile.company_name,
+        'status': profile.company_status,
+        'incorporation_date': profile.date_of_creation,
+        'company_type': profile.type,
+        'sic_codes': json.dumps(profile.sic_codes),
+        'registered_address': json.dumps(profile.registered_office_address),
+        'raw_data': json.dumps(profile.__dict__),
+        'etag': profile.etag,
+        'accounts_next_due': (profile.accounts.get('next_accounts') or {}).get('due_on')
+            or profile.accounts.get('next_due'),
+        'confirmation_next_due': profile.confirmation_statement.get('next_due'),
+    }
+    
+    if company_id:
+        # Update existing company
+        session.execute(text("""
+            UPDATE companies 
+            SET 
+                company_name = :company_name,
+                status = :status,
+                incorporation_date = :incorporation_date,
+                company_type = :company_type,
+                sic_codes = :sic_codes,
+                registered_address = :registered_address,
+                raw_data = :raw_data,
+                companies_house_etag = :etag,
+                accounts_next_due = :accounts_next_due,
+                confirmation_statement_next_due = :confirmation_next_due,
+                last_updated = NOW(),
+                last_companies_house_check = NOW()
+            WHERE company_number = :company_number AND tenant_id = :tenant_id
+        """), params)
+        return company_id
+    
+    # Insert new company
+    return session.execute(text("""
+        INSERT INTO companies (
+            tenant_id, company_number, company_name, status,
+            incorporation_date, company_type, sic_codes,
+            registered_address, raw_data, source,
+            companies_house_etag, accounts_next_due, confirmation_statement_next_due,
+            last_companies_house_check, created_at, last_updated
+        ) VALUES (
+            :tenant_id, :company_number, :company_name, :status,
+            :incorporation_date, :company_type, :sic_codes,
+            :registered_address, :raw_data, 'companies_house',
+            :etag, :accounts_next_due, :confirmation_next_due,
+            NOW(), NOW(), NOW()
+        ) RETURNING id
+    """), params).scalar()
+
 @celery.task(bind=True, max_retries=3)
 def fetch_company_filings(self, company_number: str, company_id: int, tenant_id: int) -> List[Dict]:
     """
@@ -142,64 +322,221 @@ def fetch_company_filings(self, company_number: str, company_id: int, tenant_id:
         List of new/updated filings
     """
     try:
-        api = CompaniesHouseAPI()
-        filings = api.get_filing_history(company_number, items_per_page=50)
-        
         session = Session()
         new_filings = []
         
         try:
-            for filing in filings:
-                # Check if filing exists
-                existing = session.execute(
-                    """SELECT id FROM company_filings 
-                       WHERE company_id = %s AND transaction_id = %s""",
-                    (company_id, filing.get('transaction_id'))
-                ).fetchone()
-                
-                if not existing:
-                    # Insert new filing
-                    session.execute("""
-                        INSERT INTO company_filings (
-                            company_id, tenant_id, transaction_id, 
-                            category, type, date, description,
-                            paper_filed, raw_data, created_at
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                    """, (
-                        company_id,
-                        tenant_id,
-                        filing.get('transaction_id'),
-                        filing.get('category'),
-                        filing.get('type'),
-                        filing.get('date'),
-                        filing.get('description'),
-                        filing.get('paper_filed', False),
-                        json.dumps(filing)
-                    ))
-                    
-                    new_filings.append(filing)
-                    
-                    # Generate alert for important filings
-                    if filing.get('category') in ['accounts', 'confirmation-statement', 'incorporation']:
-                        generate_company_alert.delay(
-                            company_id=company_id,
-                            tenant_id=tenant_id,
-                            alert_type='new_filing',
-                            data=filing
-                        )
+            etag, latest_filing, hashes = session.execute(text("""
+                SELECT c.companies_house_filings_etag,
+                       (SELECT MAX(f.date) FROM company_filings f WHERE f.company_id = c.id),
+                       c.content_hashes
+                FROM companies c WHERE c.id = :company_id
+            """), {'company_id': company_id}).fetchone()
             
+            # Page back only to the newest filing already stored; the first
+            # import walks the whole history
+            api = CompaniesHouseAPI()
+            filings = api.get_filing_history(
+                company_number, items_per_page=50, etag=etag,
+                since=latest_filing, all_pages=latest_filing is None
+            )
+            if filings is NOT_MODIFIED:
+                logger.info(f"Filing history unchanged (304) for {company_number}")
+                return new_filings
+            digest = content_hash(filings)
+            if is_unchanged(hashes, 'filings', digest):
+                _store_etag(session, company_id, 'filings', getattr(filings, 'etag', None))
+                session.commit()
+                logger.info(f"Filing history content unchanged for {company_number}")
+                return new_filings
+            
+            new_filings = _store_filings(session, company_id, tenant_id, filings)
+            record_content_hash(session, company_id, 'filings', digest)
             session.commit()
             logger.info(f"Processed {len(filings)} filings, {len(new_filings)} new")
             
         finally:
             session.close()
         
+        _filing_alerts(company_id, tenant_id, new_filings)
         return new_filings
         
     except Exception as e:
         logger.error(f"Error fetching filings for {company_number}: {e}")
         raise self.retry(exc=e, countdown=60)
 
+def _store_filings(session, company_id, tenant_id: int, filings: List[Dict]) -> List[Dict]:
+    """
+    Insert filings not yet stored for one company row and record the
+    filing-history ETag. One INSERT ... ON CONFLICT DO NOTHING; RETURNING
+    gives the new ones.
+    """
+    inserted = upsert_rows(
+        session, 'company_filings', FILING_COLUMNS,
+        ({
+            'transaction_id': f.get('transaction_id'),
+            'category': f.get('category'),
+            'type': f.get('type'),
+            'date': f.get('date'),
+            'description': f.get('description'),
+            'paper_filed': f.get('paper_filed', False),
+            'raw_data': f,
+        } for f in filings),
+        conflict=('company_id', 'transaction_id'),
+        fixed={'company_id': company_id, 'tenant_id': tenant_id},
+        returning=('transaction_id', 'category', 'type', 'date', 'description'),
+    )
+    
+    session.execute(text(
+        "UPDATE companies SET companies_house_filings_etag = :etag WHERE id = :company_id"
+    ), {'etag': getattr(filings, 'etag', None), 'company_id': company_id})
+    
+    return [
+        dict(row, date=row['date'].isoformat() if row['date'] else None)
+        for row in inserted
+    ]
+
+def _filing_alerts(company_id, tenant_id: int, new_filings: List[Dict]) -> None:
+    """One alert per company for the important new filings."""
+    important = [f for f in new_filings if f.get('category') in ALERT_FILING_CATEGORIES]
+    if important:
+        publish_alert(
+            company_id=company_id,
+            tenant_id=tenant_id,
+            alert_type='new_filing',
+            data={'filings': important}
+        )
+
+@celery.task(bind=True, max_retries=3)
+def fetch_company_charges(self, company_number: str, company_id: int, tenant_id: int) -> List[Dict]:
+    """
+    Fetch and store company charges, updating ones whose status changed
+    
+    Returns:
+        New or changed charges
+    """
+    try:
+        api = CompaniesHouseAPI()
+        charges = api.get_charges(company_number)
+        digest = content_hash(charges)
+        
+        session = Session()
+        try:
+            hashes = session.execute(text(
+                "SELECT content_hashes FROM companies WHERE id = :company_id"
+            ), {'company_id': company_id}).scalar()
+            if is_unchanged(hashes, 'charges', digest):
+                logger.info(f"Charges content unchanged for {company_number}")
+                return []
+            changed = _store_charges(session, company_id, tenant_id, charges)
+            record_content_hash(session, company_id, 'charges', digest)
+            session.commit()
+        finally:
+            session.close()
+        
+        if changed:
+            publish_alert(
+                company_id=company_id,
+                tenant_id=tenant_id,
+                alert_type='charge_change',
+                data={'charges': changed}
+            )
+        
+        logger.info(f"Processed {len(charges)} charges for {company_number}, {len(changed)} new or changed")
+        return changed
+        
+    except Exception as e:
+        logger.error(f"Error fetching charges for {company_number}: {e}")
+        raise self.retry(exc=e, countdown=60)
+
+@celery.task(bind=True, max_retries=3)
+def fetch_company_pscs(self, company_number: str, company_id: int, tenant_id: int) -> List[Dict]:
+    """
+    Fetch and store persons with significant control, recording cessations
+    
+    Returns:
+        New or changed PSCs
+    """
+    try:
+        api = CompaniesHouseAPI()
+        pscs = api.get_persons_with_significant_control(company_number)
+        digest = content_hash(pscs)
+        
+        session = Session()
+        try:
+            hashes = session.execute(text(
+                "SELECT content_hashes FROM companies WHERE id = :company_id"
+            ), {'company_id': company_id}).scalar()
+            if is_unchanged(hashes, 'pscs', digest):
+                logger.info(f"PSCs content unchanged for {company_number}")
+                return []
+            changed = _store_pscs(session, company_id, tenant_id, pscs)
+            record_content_hash(session, company_id, 'pscs', digest)
+            session.commit()
+        finally:
+            session.close()
+        
+        if changed:
+            publish_alert(
+                company_id=company_id,
+                tenant_id=tenant_id,
+                alert_type='psc_change',
+                data={'pscs': changed}
+            )
+        
+        logger.info(f"Processed {len(pscs)} PSCs for {company_number}, {len(changed)} new or changed")
+        return changed
+        
+    except Exception as e:
+        logger.error(f"Error fetching PSCs for {company_number}: {e}")
+        raise self.retry(exc=e, countdown=60)
+
+def _store_charges(session, company_id, tenant_id: int, charges: List[Dict]) -> List[Dict]:
+    """Upsert charges for one company row; returns the new or changed ones."""
+    return upsert_rows(
+        session, 'company_charges', CHARGE_COLUMNS,
+        ({
+            'charge_number': str(c['charge_number']) if c.get('charge_number') is not None else None,
+            'charge_code': c.get('charge_code'),
+            'status': c.get('status'),
+            'classification': c.get('classification'),
+            'created_on': c.get('created_on'),
+            'delivered_on': c.get('delivered_on'),
+            'satisfied_on': c.get('satisfied_on'),
+            'persons_entitled': c.get('persons_entitled'),
+            'particulars': (c.get('particulars') or {}).get('description'),
+            'raw_data': c,
+        } for c in charges),
+        conflict=('company_id', 'charge_number'),
+        fixed={'company_id': company_id, 'tenant_id': tenant_id},
+        update=('status', 'satisfied_on', 'raw_data'),
+        returning=('charge_number', 'charge_code', 'status'),
+    )
+
+def _store_pscs(session, company_id, tenant_id: int, pscs: List[Dict]) -> List[Dict]:
+    """Upsert PSCs for one company row; returns the new or changed ones."""
+    return upsert_rows(
+        session, 'company_pscs', PSC_COLUMNS,
+        ({
+            # links.self is the stable identifier of a PSC statement
+            'psc_id': (p.get('links') or {}).get('self'),
+            'name': p.get('name'),
+            'kind': p.get('kind'),
+            'address': p.get('address'),
+            'nationality': p.get('nationality'),
+            'country_of_residence': p.get('country_of_residence'),
+            'notified_on': p.get('notified_on'),
+            'ceased_on': p.get('ceased_on'),
+            'is_active': not p.get('ceased_on'),
+            'nature_of_control': p.get('natures_of_control'),
+            'raw_data': p,
+        } for p in pscs),
+        conflict=('company_id', 'psc_id'),
+        fixed={'company_id': company_id, 'tenant_id': tenant_id},
+        update=('ceased_on', 'is_active', 'nature_of_control', 'raw_data'),
+        returning=('psc_id', 'name', 'kind', 'is_active'),
+    )
+
 @celery.task(bind=True, max_retries=3)
 def fetch_company_officers(self, company_number: str, company_id: int, tenant_id: int) -> Dict:
     """
@@ -214,94 +551,39 @@ def fetch_company_officers(self, company_number: str, company_id: int, tenant_id
         Officer change summary
     """
     try:
-        api = CompaniesHouseAPI()
-        officers = api.get_officers(company_number, active_only=False)
-        
         session = Session()
         changes = {
             'new_appointments': [],
             'resignations': [],
-            'total_officers': len(officers)
+            'details_changed': [],
+            'total_officers': 0
         }
         
         try:
-            # Get existing officers
-            existing_officers = session.execute(
-                """SELECT officer_id, name, resigned_on 
-                   FROM company_officers 
-                   WHERE company_id = %s""",
-                (company_id,)
-            ).fetchall()
-            
-            existing_map = {o[0]: o for o in existing_officers}
-            
-            for officer in officers:
-                officer_id = officer.get('links', {}).get('officer', {}).get('appointments', '').split('/')[-1]
-                
-                if officer_id in existing_map:
-                    # Check for status change
-                    if officer.get('resigned_on') and not existing_map[officer_id][2]:
-                        # New resignation
-                        changes['resignations'].append(officer)
-                        
-                        session.execute("""
-                            UPDATE company_officers 
-                            SET resigned_on = %s, is_active = FALSE, last_updated = NOW()
-                            WHERE company_id = %s AND officer_id = %s
-                        """, (
-                            officer.get('resigned_on'),
-                            company_id,
-                            officer_id
-                        ))
-                else:
-                    # New officer
-                    is_new_appointment = self._is_recent_date(officer.get('appointed_on'), days=30)
-                    if is_new_appointment:
-                        changes['new_appointments'].append(officer)
-                    
-                    session.execute("""
-                        INSERT INTO company_officers (
-                            company_id, tenant_id, officer_id, name,
-                            role, appointed_on, resigned_on, is_active,
-                            nationality, date_of_birth, country_of_residence,
-                            address, raw_data, created_at, last_updated
-                        ) VALUES (
-                            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW()
-                        )
-                    """, (
-                        company_id,
-                        tenant_id,
-                        officer_id,
-                        officer.get('name'),
-                        officer.get('officer_role'),
-                        officer.get('appointed_on'),
-                        officer.get('resigned_on'),
-                        officer.get('is_active', True),
-                        officer.get('nationality'),
-                        officer.get('date_of_birth'),
-                        officer.get('country_of_residence'),
-                        json.dumps(officer.get('address', {})),
-                        json.dumps(officer)
-                    ))
+            etag, hashes = session.execute(text(
+                "SELECT companies_house_officers_etag, content_hashes FROM companies WHERE id = :company_id"
+            ), {'company_id': company_id}).fetchone()
             
-            session.commit()
+            api = CompaniesHouseAPI()
+            officers = api.get_officers(company_number, active_only=False, etag=etag)
+            if officers is NOT_MODIFIED:
+                logger.info(f"Officers unchanged (304) for {company_number}")
+                changes['not_modified'] = True
+                return changes
+            changes['total_officers'] = len(officers)
+            digest = content_hash(officers)
+            if is_unchanged(hashes, 'officers', digest):
+                _store_etag(session, company_id, 'officers', getattr(officers, 'etag', None))
+                session.commit()
+                logger.info(f"Officers content unchanged for {company_number}")
+                changes['not_modified'] = True
+                return changes
             
-            # Generate alerts for significant changes
-            if changes['new_appointments']:
-                generate_company_alert.delay(
-                    company_id=company_id,
-                    tenant_id=tenant_id,
-                    alert_type='new_director',
-                    data={'appointments': changes['new_appointments']}
-                )
+            changes.update(_store_officers(session, company_id, tenant_id, officers))
+            record_content_hash(session, company_id, 'officers', digest)
+            session.commit()
             
-            if changes['resignations']:
-                generate_company_alert.delay(
-                    company_id=company_id,
-                    tenant_id=tenant_id,
-                    alert_type='director_resignation',
-                    data={'resignations': changes['resignations']}
-                )
+            _officer_alerts(company_id, tenant_id, changes)
             
             logger.info(f"Processed {len(officers)} officers for {company_number}")
             
@@ -314,11 +596,161 @@ def fetch_company_officers(self, company_number: str, company_id: int, tenant_id
         logger.error(f"Error fetching officers for {company_number}: {e}")
         raise self.retry(exc=e, countdown=60)
 
+def _store_officers(session, company_id, tenant_id: int, officers: List[Dict]) -> Dict:
+    """
+    Diff and apply officers for one company row in one statement and record
+    the officers ETag. The summary comes from the same rows the upsert touched.
+    """
+    changes = {'new_appointments': [], 'resignations': [], 'details_changed': []}
+    for row in session.execute(OFFICER_SYNC_SQL, {
+        'company_id': company_id,
+        'tenant_id': tenant_id,
+        'officers': json.dumps([_officer_row(o) for o in officers if _officer_id(o)])
+    }):
+        officer = {
+            'officer_id': row.officer_id,
+            'name': row.name,
+            'officer_role': row.role,
+            'appointed_on': row.appointed_on.isoformat() if row.appointed_on else None,
+            'resigned_on': row.resigned_on.isoformat() if row.resigned_on else None,
+        }
+        if row.change == 'appointed':
+            # First sync of a company stores its whole history; only
+            # recent appointments are news
+            if _is_recent_date(officer['appointed_on'], days=30):
+                changes['new_appointments'].append(officer)
+        elif row.change == 'resigned':
+            changes['resignations'].append(officer)
+        else:
+            changes['details_changed'].append(officer)
+    
+    session.execute(text(
+        "UPDATE companies SET companies_house_officers_etag = :etag WHERE id = :company_id"
+    ), {'etag': getattr(officers, 'etag', None), 'company_id': company_id})
+    return changes
+
+def _officer_alerts(company_id, tenant_id: int, changes: Dict) -> None:
+    """Alert on new appointments and resignations."""
+    if changes.get('new_appointments'):
+        publish_alert(
+            company_id=company_id,
+            tenant_id=tenant_id,
+            alert_type='new_director',
+            data={'appointments': changes['new_appointments']}
+        )
+    
+    if changes.get('resignations'):
+        publish_alert(
+            company_id=company_id,
+            tenant_id=tenant_id,
+            alert_type='director_resignation',
+            data={'resignations': changes['resignations']}
+        )
+
+# Stages the incoming officers with jsonb_to_recordset, upserts those that
+# are new or differ, and classifies each touched row against the state the
+# statement started from (all CTEs share one snapshot)
+OFFICER_SYNC_SQL = text("""
+    WITH incoming AS (
+        SELECT * FROM jsonb_to_recordset(CAST(:officers AS jsonb)) AS r(
+            officer_id varchar, name varchar, role varchar, appointed_on date, resigned_on date,
+            nationality varchar, date_of_birth varchar, country_of_residence varchar,
+            occupation varchar, address jsonb, raw_data jsonb
+        )
+    ),
+    previous AS (
+        SELECT o.officer_id, o.resigned_on
+        FROM company_officers o
+        WHERE o.company_id = CAST(:company_id AS uuid)
+          AND o.officer_id IN (SELECT officer_id FROM incoming)
+    ),
+    upserted AS (
+        INSERT INTO company_officers (
+            company_id, tenant_id, officer_id, name, role, appointed_on, resigned_on,
+            is_active, nationality, date_of_birth, country_of_residence, occupation,
+            address, raw_data, created_at, last_updated
+        )
+        SELECT DISTINCT ON (i.officer_id)
+               CAST(:company_id AS uuid), :tenant_id, i.officer_id, i.name, i.role,
+               i.appointed_on, i.resigned_on, i.resigned_on IS NULL, i.nationality,
+               i.date_of_birth, i.country_of_residence, i.occupation, i.address, i.raw_data,
+               NOW(), NOW()
+        FROM incoming i
+        ON CONFLICT (company_id, officer_id) DO UPDATE SET
+            name = EXCLUDED.name,
+            role = EXCLUDED.role,
+            appointed_on = EXCLUDED.appointed_on,
+            resigned_on = EXCLUDED.resigned_on,
+            is_active = EXCLUDED.is_active,
+            nationality = EXCLUDED.nationality,
+            country_of_residence = EXCLUDED.country_of_residence,
+            occupation = EXCLUDED.occupation,
+            address = EXCLUDED.address,
+            raw_data = EXCLUDED.raw_data,
+            last_updated = NOW()
+        WHERE (company_officers.name, company_officers.role, company_officers.resigned_on,
+               company_officers.nationality, company_officers.country_of_residence,
+               company_officers.occupation, company_officers.address)
+              IS DISTINCT FROM
+              (EXCLUDED.name, EXCLUDED.role, EXCLUDED.resigned_on, EXCLUDED.nationality,
+               EXCLUDED.country_of_residence, EXCLUDED.occupation, EXCLUDED.address)
+        RETURNING officer_id, name, role, appointed_on, resigned_on
+    )
+    SELECT u.officer_id, u.name, u.role, u.appointed_on, u.resigned_on,
+           CASE
+               WHEN p.officer_id IS NULL THEN 'appointed'
+               WHEN p.resigned_on IS NULL AND u.resigned_on IS NOT NULL THEN 'resigned'
+               ELSE 'updated'
+           END AS change
+    FROM upserted u
+    LEFT JOIN previous p ON p.officer_id = u.officer_id
+""")
+
+def _officer_id(officer: Dict) -> Optional[str]:
+    """
+    Stable key of an appointment: the id in links.self
+    (/company/{number}/appointments/{id}). One person can hold several
+    appointments at a company, so the person-level officer id is not unique.
+    """
+    links = officer.get('links') or {}
+    path = links.get('self') or (links.get('officer') or {}).get('appointments') or ''
+    parts = [p for p in path.split('/') if p]
+    if len(parts) >= 4 and parts[2] == 'appointments':
+        return parts[3]
+    if len(parts) >= 2 and parts[0] == 'officers':
+        return parts[1]
+    return None
+
+def _officer_row(officer: Dict) -> Dict:
+    """Officer API item -> company_officers columns."""
+    return {
+        'officer_id': _officer_id(officer),
+        'name': officer.get('name'),
+        'role': officer.get('officer_role'),
+        'appointed_on': officer.get('appointed_on'),
+        'resigned_on': officer.get('resigned_on'),
+        'nationality': officer.get('nationality'),
+        'date_of_birth': _format_dob(officer.get('date_of_birth')),
+        'country_of_residence': officer.get('country_of_residence'),
+        'occupation': officer.get('occupation'),
+        'address': officer.get('address') or {},
+        'raw_data': officer,
+    }
+
+def _format_dob(dob) -> Optional[str]:
+    """Month/year only, as YYYY-MM (the API never returns the day)."""
+    if isinstance(dob, dict) and dob.get('year') and dob.get('month'):
+        return f"{dob['year']:04d}-{dob['month']:02d}"
+    return dob if isinstance(dob, str) else None
+
 @celery.task
 def monitor_all_companies(tenant_id: int) -> Dict:
     """
     Monitor all companies for a tenant for changes
     
+    Each company is fetched once and written to every tenant's row for
+    that company number, so other tenants monitoring it are refreshed too.
+    
     Args:
         tenant_id: Tenant ID to monitor
         
@@ -327,26 +759,17 @@ def monitor_all_companies(tenant_id: int) -> Dict:
     """
     session = Session()
     try:
-        # Get all active companies for tenant
-        companies = session.execute(
-            """SELECT id, company_number, company_name, last_companies_house_check
-               FROM companies 
-               WHERE tenant_id = %s AND is_monitored = TRUE""",
-            (tenant_id,)
-        ).fetchall()
-        
-        # Create task group for parallel processing
-        job = group(
-            check_company_changes.s(
-                company_id=c[0],
-                company_number=c[1],
-                tenant_id=tenant_id,
-                last_check=c[3]
-            ) for c in companies
-        )
+        companies = session.execute(text(MONITORED_TARGETS_SQL.format(filter="""
+            AND c.company_number IN (
+                SELECT company_number FROM companies
+                WHERE tenant_id = :tenant_id AND is_monitored = TRUE
+            )
+        """)), {'tenant_id': tenant_id}).fetchall()
         
-        # Execute all checks in parallel
-        result = job.apply_async()
+        # One sync per company, run in parallel by the workers; companies
+        # already being synced (by the scheduler or another tenant) are skipped
+        for c in companies:
+            enqueue_once(sync_company_for_tenants, (c.company_number, c.targets), key_parts=(c.company_number,))
         
         logger.info(f"Monitoring {len(companies)} companies for tenant {tenant_id}")
         
@@ -365,6 +788,10 @@ def check_company_changes(company_id: int, company_number: str,
     """
     Check a single company for changes since last check
     
+    Profile, filings and officers are requested with the ETags stored by
+    the tasks that persist them. If all three come back 304 nothing is
+    written and nothing is enqueued.
+    
     Args:
         company_id: Internal company ID
         company_number: UK company registration number
@@ -375,97 +802,464 @@ def check_company_changes(company_id: int, company_number: str,
         Dictionary of detected changes
     """
     try:
-        api = CompaniesHouseAPI()
-        changes = api.monitor_company_changes(company_number, last_check)
-        
-        if changes['changes_detected']:
-            session = Session()
-            try:
+        session = Session()
+        try:
+            row = session.execute(text(
+                """SELECT companies_house_etag, companies_house_filings_etag,
+                          companies_house_officers_etag
+                   FROM companies WHERE id = :company_id"""
+            ), {'company_id': company_id}).fetchone()
+            etags = {
+                'profile': row.companies_house_etag,
+                'filings': row.companies_house_filings_etag,
+                'officers': row.companies_house_officers_etag,
+            } if row else {}
+            
+            api = CompaniesHouseAPI()
+            changes = api.monitor_company_changes(company_number, last_check, etags=etags)
+            
+            if changes['not_modified']:
+                logger.info(f"No changes for {company_number} (all 304)")
+                return changes
+            
+            # Only keep ETags for resources with nothing left to persist;
+            # the others belong to the fetch tasks that store their data
+            profile_changed = changes['etags'].get('profile') not in (None, etags.get('profile'))
+            stored = dict(etags)
+            if not changes['new_filings']:
+                stored['filings'] = changes['etags'].get('filings')
+            if not changes['officer_changes']:
+                stored['officers'] = changes['etags'].get('officers')
+            
+            session.execute(text(
+                """UPDATE companies
+                   SET companies_house_filings_etag = :filings,
+                       companies_house_officers_etag = :officers
+                   WHERE id = :company_id"""
+            ), {'filings': stored.get('filings'), 'officers': stored.get('officers'),
+                'company_id': company_id})
+            
+            if changes['changes_detected']:
                 # Update last check timestamp
-                session.execute(
+                session.execute(text(
                     """UPDATE companies 
                        SET last_companies_house_check = NOW() 
-                       WHERE id = %s""",
-                    (company_id,)
-                )
+                       WHERE id = :company_id"""
+                ), {'company_id': company_id})
                 
                 # Store change log
-                session.execute("""
+                session.execute(text("""
                     INSERT INTO company_change_logs (
                         company_id, tenant_id, change_type, 
                         change_data, detected_at
-                    ) VALUES (%s, %s, %s, %s, NOW())
-                """, (
-                    company_id,
-                    tenant_id,
-                    'companies_house_update',
-                    json.dumps(changes)
-                ))
+                    ) VALUES (:company_id, :tenant_id, :change_type, :change_data, NOW())
+                """), {
+                    'company_id': company_id,
+                    'tenant_id': tenant_id,
+                    'change_type': 'companies_house_update',
+                    'change_data': json.dumps(changes)
+                })
+            
+            session.commit()
+        finally:
+            session.close()
+        
+        if profile_changed:
+            # The profile refresh also refreshes filings and officers
+            enqueue_once(fetch_company_profile, (company_number, tenant_id))
+        elif changes['changes_detected']:
+            # Trigger updates for specific changes
+            if changes['new_filings']:
+                enqueue_once(fetch_company_filings, (company_number, company_id, tenant_id))
+            
+            if changes['officer_changes']:
+                enqueue_once(fetch_company_officers, (company_number, company_id, tenant_id))
+        
+        if changes['changes_detected']:
+            logger.info(f"Changes detected for {company_number}")
+        
+        return changes
+        
+    except Exception as e:
+        logger.error(f"Error checking changes for {company_number}: {e}")
+        return {'error': str(e)}
+
+@celery.task(bind=True, max_retries=3)
+def sync_company_for_tenants(self, company_number: str, targets: List[Dict]) -> Dict:
+    """
+    Fetch a company once and apply it to every tenant row that monitors it
+    
+    The profile is always requested; filings, officers, charges and PSCs
+    only when at least one target's monitoring config asks for them. Each
+    resource is requested a single time (conditionally when every row
+    holds the same ETag) and the result is fanned out: each tenant row is
+    updated, diffed and alerted on independently, and only for the
+    resources its own config asks for.
+    
+    Args:
+        company_number: UK company registration number
+        targets: [{'company_id': ..., 'tenant_id': ..., 'endpoints': [...]}]
+            rows to update; 'endpoints' defaults to filings and officers
+        
+    Returns:
+        Per-tenant change summary
+    """
+    try:
+        session = Session()
+        alerts = []
+        summary = {'company_number': company_number, 'targets': len(targets), 'changed': 0}
+        endpoints = {
+            str(t['company_id']): set(t.get('endpoints', DEFAULT_MONITORED_ENDPOINTS))
+            for t in targets
+        }
+        
+        try:
+            rows = session.execute(text("""
+                SELECT c.id, c.tenant_id, c.companies_house_etag, c.companies_house_filings_etag,
+                       c.companies_house_officers_etag, c.content_hashes,
+                       (SELECT MAX(f.date) FROM company_filings f WHERE f.company_id = c.id) AS latest_filing
+                FROM companies c WHERE c.id = ANY(CAST(:ids AS uuid[]))
+            """), {'ids': list(endpoints)}).fetchall()
+            if not rows:
+                return summary
+            
+            def wants(endpoint):
+                return [r for r in rows if endpoint in endpoints[str(r.id)]]
+            
+            def shared(values):
+                # A conditional request is only safe when every row agrees
+                values = set(values)
+                return values.pop() if len(values) == 1 else None
+            
+            def newer(result, stored_etag):
+                # Fetched data this row does not hold yet (no ETag: assume so)
+                etag = getattr(result, 'etag', None)
+                return result not in (None, NOT_MODIFIED) and (not etag or etag != stored_etag)
+            
+            api = CompaniesHouseAPI()
+            calls = {
+                'profile': (api.get_company_profile, (company_number,),
+                            {'etag': shared(r.companies_house_etag for r in rows)}),
+            }
+            if wants('filings'):
+                latest = [r.latest_filing for r in wants('filings')]
+                since = None if None in latest else min(latest)
+                calls['filings'] = (api.get_filing_history, (company_number,), {
+                    'items_per_page': 50, 'since': since, 'all_pages': since is None,
+                    'etag': shared(r.companies_house_filings_etag for r in wants('filings')),
+                })
+            if wants('officers'):
+                calls['officers'] = (api.get_officers, (company_number,), {
+                    'active_only': False,
+                    'etag': shared(r.companies_house_officers_etag for r in wants('officers')),
+                })
+            if wants('charges'):
+                calls['charges'] = (api.get_charges, (company_number,), {})
+            if wants('pscs'):
+                calls['pscs'] = (api.get_persons_with_significant_control, (company_number,), {})
+            
+            results = fetch_concurrently(calls)
+            metrics.incr('monitoring.shared_fetches')
+            metrics.incr('monitoring.tenant_rows', len(rows))
+            for endpoint in MONITORED_ENDPOINTS:
+                if endpoint not in calls:
+                    metrics.incr(f'monitoring.skipped.{endpoint}')
+            
+            profile = results['profile']
+            filings, officers = results.get('filings'), results.get('officers')
+            charges, pscs = results.get('charges'), results.get('pscs')
+            if not profile:
+                logger.warning(f"Company not found during monitoring: {company_number}")
+            
+            # Hashed once, compared per row: a new ETag over the same
+            # content skips the row's write
+            digests = {
+                name: content_hash(value) for name, value in results.items()
+                if value is not None and value is not NOT_MODIFIED
+            }
+            
+            def needs_write(row, endpoint, stored_etag=None):
+                value = results.get(endpoint)
+                if endpoint != 'profile' and (endpoint not in endpoints[str(row.id)] or not isinstance(value, list)):
+                    return False
+                if not newer(value, stored_etag):
+                    return False
+                if not is_unchanged(row.content_hashes, endpoint, digests[endpoint]):
+                    return True
+                if endpoint in ETAG_COLUMNS:
+                    _store_etag(session, row.id, endpoint, getattr(value, 'etag', None))
+                return False
+            
+            for row in rows:
+                profile_updated = needs_write(row, 'profile', row.companies_house_etag)
+                if profile_updated:
+                    _store_profile(session, row.tenant_id, company_number, profile, row.id)
+                    record_content_hash(session, row.id, 'profile', digests['profile'])
                 
-                session.commit()
+                new_filings = []
+                if needs_write(row, 'filings', row.companies_house_filings_etag):
+                    new_filings = _store_filings(session, row.id, row.tenant_id, filings)
+                    record_content_hash(session, row.id, 'filings', digests['filings'])
                 
-                # Trigger updates for specific changes
-                if changes['new_filings']:
-                    fetch_company_filings.delay(company_number, company_id, tenant_id)
+                officer_changes = {'new_appointments': [], 'resignations': [], 'details_changed': []}
+                if needs_write(row, 'officers', row.companies_house_officers_etag):
+                    officer_changes = _store_officers(session, row.id, row.tenant_id, officers)
+                    record_content_hash(session, row.id, 'officers', digests['officers'])
                 
-                if changes['officer_changes']:
-                    fetch_company_officers.delay(company_number, company_id, tenant_id)
+                changed_charges = []
+                if needs_write(row, 'charges'):
+                    changed_charges = _store_charges(session, row.id, row.tenant_id, charges)
+                    record_content_hash(session, row.id, 'charges', digests['charges'])
                 
-                logger.info(f"Changes detected for {company_number}")
+                changed_pscs = []
+                if needs_write(row, 'pscs'):
+                    changed_pscs = _store_pscs(session, row.id, row.tenant_id, pscs)
+                    record_content_hash(session, row.id, 'pscs', digests['pscs'])
                 
-            finally:
-                session.close()
+                if profile_updated or new_filings or changed_charges or changed_pscs \
+                        or any(officer_changes.values()):
+                    summary['changed'] += 1
+                    session.execute(text("""
+                        INSERT INTO company_change_logs (
+                            company_id, tenant_id, change_type, 
+                            change_data, detected_at
+                        ) VALUES (:company_id, :tenant_id, :change_type, :change_data, NOW())
+                    """), {
+                        'company_id': row.id,
+                        'tenant_id': row.tenant_id,
+                        'change_type': 'companies_house_update',
+                        'change_data': json.dumps({
+                            'company_number': company_number,
+                            'checked_at': datetime.utcnow().isoformat(),
+                            'profile_updated': profile_updated,
+                            'new_filings': new_filings,
+                            'officer_changes': officer_changes,
+                            'charges': changed_charges,
+                            'pscs': changed_pscs,
+                        })
+                    })
+                    alerts.append((row.id, row.tenant_id, new_filings, officer_changes,
+                                   changed_charges, changed_pscs))
+            
+            session.execute(text(
+                "UPDATE companies SET last_companies_house_check = NOW() WHERE id = ANY(CAST(:ids AS uuid[]))"
+            ), {'ids': [str(r.id) for r in rows]})
+            session.commit()
+            
+        finally:
+            session.close()
         
-        return changes
+        # Alerts only once every tenant's rows are committed
+        for company_id, tenant_id, new_filings, officer_changes, changed_charges, changed_pscs in alerts:
+            _filing_alerts(company_id, tenant_id, new_filings)
+            _officer_alerts(company_id, tenant_id, officer_changes)
+            if changed_charges:
+                publish_alert(
+                    company_id=company_id, tenant_id=tenant_id,
+                    alert_type='charge_change', data={'charges': changed_charges}
+                )
+            if changed_pscs:
+                publish_alert(
+                    company_id=company_id, tenant_id=tenant_id,
+                    alert_type='psc_change', data={'pscs': changed_pscs}
+                )
+        
+        logger.info(
+            f"Synced {company_number} ({', '.join(calls)}) for {summary['targets']} tenant rows, "
+            f"{summary['changed']} changed"
+        )
+        return summary
         
     except Exception as e:
-        logger.error(f"Error checking changes for {company_number}: {e}")
-        return {'error': str(e)}
+        logger.error(f"Error syncing {company_number} across tenants: {e}")
+        raise self.retry(exc=e, countdown=60)
 
-@celery.task
-def bulk_import_companies(company_numbers: List[str], tenant_id: int) -> Dict:
+def normalize_company_number(value) -> Optional[str]:
+    """Canonical 8-character company number (zero-padded), or None if invalid."""
+    number = str(value or '').strip().upper().replace(' ', '')
+    if number.isdigit():
+        number = number.zfill(8)
+    elif len(number) < 8 and number[:2].isalpha() and number[2:].isdigit():
+        # Prefixed numbers (SC, NI, OC, ...) pad after the prefix
+        number = number[:2] + number[2:].zfill(6)
+    return number if COMPANY_NUMBER_RE.match(number) else None
+
+@celery.task(bind=True, ignore_result=True)
+def bulk_import_companies(self, company_numbers: List[str], tenant_id: int) -> Dict:
     """
-    Bulk import multiple companies
+    Bulk import multiple companies at the rate the shared API budget allows
+    
+    The input is deduplicated and companies checked within the last
+    BULK_IMPORT_FRESH_HOURS are skipped. The rest are queued in Redis and
+    released a chunk at a time by release_bulk_import_chunk, which
+    schedules the next chunk one chunk-interval later at the background
+    lane's sustained rate. Only one short countdown is ever pending, well
+    inside the broker's visibility timeout, so fetches spread over all
+    workers without queueing behind the rate limiter.
+    
+    Progress is written to this task's meta as PROGRESS {current, total}
+    (read by /task/<task_id>) and the final summary as SUCCESS. The task
+    ignores its own return value so that finishing the scheduling does not
+    overwrite the progress.
     
     Args:
         company_numbers: List of UK company registration numbers
         tenant_id: Tenant ID
         
     Returns:
-        Import summary
+        Scheduling summary
     """
-    # Create chain of tasks for sequential processing
-    # (to respect API rate limits)
-    job = chain(
-        fetch_company_profile.s(company_number, tenant_id)
-        for company_number in company_numbers
-    )
+    # Called synchronously there is no task id; the chunk chain still needs one
+    import_id = self.request.id or str(uuid.uuid4())
+    numbers = list(dict.fromkeys(
+        n for n in (normalize_company_number(v) for v in company_numbers) if n
+    ))
+    invalid = len(company_numbers) - len([v for v in company_numbers if normalize_company_number(v)])
     
-    result = job.apply_async()
+    session = Session()
+    try:
+        fresh = {row[0] for row in session.execute(text("""
+            SELECT company_number FROM companies
+            WHERE tenant_id = :tenant_id
+              AND company_number = ANY(:numbers)
+              AND last_companies_house_check > NOW() - make_interval(hours => :hours)
+        """), {'tenant_id': tenant_id, 'numbers': numbers, 'hours': BULK_IMPORT_FRESH_HOURS})}
+    finally:
+        session.close()
     
-    return {
+    to_fetch = [n for n in numbers if n not in fresh]
+    summary = {
+        'current': len(fresh),
+        'total': len(numbers),
         'tenant_id': tenant_id,
-        'companies_queued': len(company_numbers),
+        'invalid': invalid,
+        'duplicates': len(company_numbers) - invalid - len(numbers),
+        'skipped_fresh': len(fresh),
+        'queued': len(to_fetch),
         'timestamp': datetime.now().isoformat()
     }
+    
+    redis = get_redis()
+    key = f"bulk_import:{import_id}"
+    pipe = redis.pipeline()
+    pipe.hset(key, mapping={'total': len(numbers), 'skipped_fresh': len(fresh), 'invalid': invalid})
+    if fresh:
+        pipe.sadd(f"{key}:done", *fresh)
+    if to_fetch:
+        pipe.rpush(f"{key}:queue", *to_fetch)
+    for suffix in ('', ':done', ':queue'):
+        pipe.expire(f"{key}{suffix}", BULK_IMPORT_KEY_TTL)
+    pipe.execute()
+    
+    if not to_fetch:
+        _store_bulk_import_state(import_id, 'SUCCESS', summary)
+        return summary
+    _store_bulk_import_state(import_id, 'PROGRESS', summary)
+    
+    release_bulk_import_chunk.delay(import_id, tenant_id, 0)
+    
+    logger.info(
+        f"Bulk import {import_id}: {len(to_fetch)} to fetch, {len(fresh)} fresh, "
+        f"~{len(to_fetch) * BULK_IMPORT_REQUESTS_PER_COMPANY / _bulk_import_rate() / 60:.0f} min at the API rate"
+    )
+    return summary
+
+def _bulk_import_rate() -> float:
+    """Sustained background rate in requests/s; the first chunk rides the burst."""
+    return (settings.COMPANIES_HOUSE_RATE_LIMIT - settings.COMPANIES_HOUSE_RATE_BURST) \
+        / float(settings.COMPANIES_HOUSE_RATE_WINDOW)
+
+@celery.task(ignore_result=True)
+def release_bulk_import_chunk(import_id: str, tenant_id: int, seq: int) -> None:
+    """
+    Enqueue the next chunk of a bulk import and schedule the chunk after it.
+    
+    Each release is claimed by sequence number, so a redelivered message
+    neither releases a chunk twice nor forks a second chain. A company
+    whose profile fetch is already queued (by the API or another import)
+    is merged into that fetch and counted as done with outcome 'merged'.
+    """
+    redis = get_redis()
+    key = f"bulk_import:{import_id}"
+    if not redis.set(f"{key}:released:{seq}", 1, nx=True, ex=BULK_IMPORT_KEY_TTL):
+        logger.info(f"Bulk import {import_id}: chunk {seq} already released")
+        return
+    
+    company_numbers = redis.lpop(f"{key}:queue", BULK_IMPORT_CHUNK_SIZE) or []
+    if not company_numbers:
+        return
+    for company_number in company_numbers:
+        queued = enqueue_once(fetch_company_profile, (company_number, tenant_id), kwargs={'import_id': import_id})
+        if queued.merged:
+            # The queued fetch reports to whoever queued it, not this import
+            _bulk_import_progress(import_id, company_number, 'merged')
+    
+    if redis.llen(f"{key}:queue"):
+        chunk_seconds = len(company_numbers) * BULK_IMPORT_REQUESTS_PER_COMPANY / _bulk_import_rate()
+        release_bulk_import_chunk.apply_async((import_id, tenant_id, seq + 1), countdown=int(chunk_seconds))
+
+def _store_bulk_import_state(import_id: Optional[str], state: str, meta: Dict) -> None:
+    if import_id:
+        celery.backend.store_result(import_id, meta, state)
+
+def _bulk_import_progress(import_id: Optional[str], company_number: str, outcome: str) -> None:
+    """
+    Count one finished company of a bulk import and publish progress.
+    
+    Companies are counted once each (a set of finished numbers), so a
+    redelivered or repeated fetch cannot finish the import early.
+    Outcomes are created/updated/not_modified/not_found/failed/merged.
+    """
+    if not import_id:
+        return
+    try:
+        redis = get_redis()
+        key = f"bulk_import:{import_id}"
+        if redis.sadd(f"{key}:done", company_number):
+            redis.hincrby(key, outcome, 1)
+        pipe = redis.pipeline()
+        pipe.scard(f"{key}:done")
+        pipe.hgetall(key)
+        done, counts = pipe.execute()
+        
+        total = int(counts.get('total', 0))
+        meta = {'current': int(done), 'total': total}
+        if done >= total:
+            meta.update({k: int(v) for k, v in counts.items() if k != 'total'})
+            _store_bulk_import_state(import_id, 'SUCCESS', meta)
+        else:
+            _store_bulk_import_state(import_id, 'PROGRESS', meta)
+    except Exception as e:
+        # Progress is best-effort; never fail the import over it
+        logger.warning(f"Could not record progress for bulk import {import_id}: {e}")
 
 # Scheduled tasks (to be configured in Celery beat)
 @celery.task
 def daily_company_monitoring():
     """
     Daily task to monitor all companies across all tenants
+    
+    Skipped while the streaming consumers are healthy: they already
+    refresh monitored companies as changes are published.
     """
+    if stream_is_healthy():
+        logger.info("Streaming consumers healthy, skipping daily polling")
+        return
+    if scheduler_is_active():
+        logger.info("Refresh scheduler active, skipping daily polling")
+        return
+    
     session = Session()
     try:
-        # Get all active tenants
-        tenants = session.execute(
-            "SELECT id FROM tenants WHERE is_active = TRUE"
-        ).fetchall()
+        # One entry per company number across all active tenants
+        companies = session.execute(text(MONITORED_TARGETS_SQL.format(filter=""))).fetchall()
         
-        for tenant in tenants:
-            monitor_all_companies.delay(tenant[0])
+        for company in companies:
+            enqueue_once(sync_company_for_tenants, (company.company_number, company.targets),
+                         key_parts=(company.company_number,))
         
-        logger.info(f"Triggered monitoring for {len(tenants)} tenants")
+        rows = sum(len(c.targets) for c in companies)
+        logger.info(f"Triggered monitoring for {len(companies)} companies ({rows} tenant rows)")
         
     finally:
         session.close()
@@ -473,31 +1267,283 @@ def daily_company_monitoring():
 @celery.task
 def hourly_priority_company_check():
     """
-    Hourly check for high-priority companies
+    Hourly check for high-priority companies (skipped while streaming is
+    healthy or the refresh scheduler is running)
     """
+    if stream_is_healthy():
+        logger.info("Streaming consumers healthy, skipping priority polling")
+        return
+    if scheduler_is_active():
+        logger.info("Refresh scheduler active, skipping priority polling")
+        return
+    
     session = Session()
     try:
-        # Get high-priority companies (e.g., key accounts)
-        companies = session.execute(
-            """SELECT c.id, c.company_number, c.tenant_id, c.last_companies_house_check
-               FROM companies c
-               JOIN company_monitoring_config cfg ON c.id = cfg.company_id
-               WHERE cfg.priority = 'high' AND cfg.is_active = TRUE"""
-        ).fetchall()
+        # High-priority companies (e.g., key accounts), fetched once and
+        # applied to every tenant monitoring them
+        companies = session.execute(text(MONITORED_TARGETS_SQL.format(filter="""
+            AND c.company_number IN (
+                SELECT p.company_number
+                FROM companies p
+                JOIN company_monitoring_config cfg ON p.id = cfg.company_id
+                WHERE cfg.priority = 'high' AND cfg.is_active = TRUE
+            )
+        """))).fetchall()
         
         for company in companies:
-            check_company_changes.delay(
-                company_id=company[0],
-                company_number=company[1],
-                tenant_id=company[2],
-                last_check=company[3]
-            )
+            enqueue_once(sync_company_for_tenants, (company.company_number, company.targets),
+                         key_parts=(company.company_number,))
         
         logger.info(f"Triggered priority check for {len(companies)} companies")
         
     finally:
         session.close()
 
+def scheduler_is_active() -> bool:
+    """True while monitoring_scheduler_tick has run in the last few ticks."""
+    try:
+        return bool(get_redis().exists(f'{SCHEDULE_KEY}:heartbeat'))
+    except Exception as e:
+        logger.debug(f"Scheduler state unknown: {e}")
+        return False
+
+def _interval_seconds(company, now: Optional[datetime] = None) -> int:
+    """Check interval for a MONITORED_TARGETS_SQL row, from its config and deadlines."""
+    hours = polling_interval_hours(
+        company.config_interval_hours,
+        (company.accounts_next_due, company.confirmation_next_due),
+        now or datetime.utcnow(),
+    )
+    return hours * 3600
+
+def _resync_schedule(session, redis) -> int:
+    """
+    Reconcile the schedule with the monitored companies.
+    
+    New companies get a random first due time within their interval, so a
+    large import is spread over the window instead of all falling due at
+    once. Companies whose interval shrank (a config change, or a deadline
+    coming into range) are pulled forward; ones nobody monitors any more
+    are dropped.
+    
+    Returns:
+        Number of scheduled companies
+    """
+    now = time.time()
+    wanted = {
+        row.company_number: _interval_seconds(row)
+        for row in session.execute(text(
+            MONITORED_TARGETS_SQL.format(filter="")
+        )).fetchall()
+    }
+    current = {number: int(seconds) for number, seconds in redis.hgetall(SCHEDULE_INTERVALS_KEY).items()}
+    
+    pipe = redis.pipeline(transaction=False)
+    for number, interval in wanted.items():
+        if current.get(number) == interval:
+            continue
+        if number not in current:
+            pipe.zadd(SCHEDULE_KEY, {number: now + random.uniform(0, interval)}, nx=True)
+        elif interval < current[number]:
+            # Only ever moves the due time earlier; a longer interval takes
+            # effect at the next reschedule
+            pipe.zadd(SCHEDULE_KEY, {number: now + random.uniform(0, interval)}, lt=True)
+        pipe.hset(SCHEDULE_INTERVALS_KEY, number, interval)
+    
+    removed = [number for number in current if number not in wanted]
+    for start in range(0, len(removed), 1000):
+        pipe.zrem(SCHEDULE_KEY, *removed[start:start + 1000])
+        pipe.hdel(SCHEDULE_INTERVALS_KEY, *removed[start:start + 1000])
+    pipe.execute()
+    
+    logger.info(f"Refresh schedule holds {len(wanted)} companies ({len(removed)} removed)")
+    return len(wanted)
+
+@celery.task(ignore_result=True)
+def monitoring_scheduler_tick() -> None:
+    """
+    Enqueue the monitored companies that are due, every SCHEDULER_TICK_SECONDS
+    
+    Next-due times live in a Redis sorted set keyed by company number, so a
+    tick reads only what is due (oldest first), at most
+    MONITORING_MAX_PER_TICK of them. Each company is rescheduled one
+    interval after its previous due time, which keeps checks evenly phased
+    across the window instead of drifting into bursts. Intervals follow the
+    company's accounts and confirmation statement deadlines (see
+    backend.utils.polling_policy), bounded by company_monitoring_config
+    (check_frequency_hours, capped by priority), and each sync only fetches
+    the endpoints the configs ask for.
+    
+    Stands down while the streaming consumers are healthy.
+    """
+    if stream_is_healthy():
+        return
+    
+    redis = get_redis()
+    if not redis.set(f'{SCHEDULE_KEY}:lock', 1, nx=True, ex=SCHEDULER_TICK_SECONDS):
+        return
+    
+    session = Session()
+    try:
+        if redis.set(f'{SCHEDULE_KEY}:resynced', 1, nx=True, ex=SCHEDULER_RESYNC_SECONDS):
+            _resync_schedule(session, redis)
+        
+        now = time.time()
+        due = redis.zrangebyscore(
+            SCHEDULE_KEY, '-inf', now, start=0, num=settings.MONITORING_MAX_PER_TICK, withscores=True
+        )
+        if due:
+            companies = session.execute(text(MONITORED_TARGETS_SQL.format(
+                filter="AND c.company_number = ANY(:numbers)"
+            )), {'numbers': [number for number, _ in due]}).fetchall()
+            by_number = {c.company_number: c for c in companies}
+            
+            pipe = redis.pipeline(transaction=False)
+            for number, due_at in due:
+                company = by_number.get(number)
+                if company is None:
+                    pipe.zrem(SCHEDULE_KEY, number)
+                    pipe.hdel(SCHEDULE_INTERVALS_KEY, number)
+                    continue
+                
+                enqueue_once(sync_company_for_tenants, (number, company.targets), key_parts=(number,))
+                interval = _interval_seconds(company)
+                # Keep the company's phase; after an outage restart from now
+                next_due = due_at + interval
+                if next_due <= now:
+                    next_due = now + random.uniform(0, interval)
+                pipe.zadd(SCHEDULE_KEY, {number: next_due})
+            pipe.execute()
+            
+            backlog = redis.zcount(SCHEDULE_KEY, '-inf', now)
+            metrics.incr('monitoring.scheduled', len(by_number))
+            logger.info(f"Scheduled {len(by_number)} due companies ({backlog} still due)")
+        
+        redis.set(f'{SCHEDULE_KEY}:heartbeat', int(now), ex=SCHEDULER_TICK_SECONDS * 3)
+    finally:
+        session.close()
+        redis.delete(f'{SCHEDULE_KEY}:lock')
+
+@celery.task
+def process_snapshot_delta(source: Optional[str] = None, buckets: int = 64) -> Dict:
+    """
+    Diff the two newest Basic Company Data snapshots and record the changes
+    to monitored companies, without any API calls.
+    
+    The full change set is kept in data/processed; events for monitored
+    companies are written to company_change_logs and raised as alerts.
+    Each snapshot pair is processed once: the change set is claimed in
+    snapshot_deltas_applied in the same transaction as the change logs,
+    and each alert is published under a (change set, line, company) key,
+    so a run that crashed part-way only finishes publishing.
+    
+    Args:
+        source: Directory holding the snapshot parts (default data/raw)
+        buckets: Hash partitions used for the bounded-memory diff
+        
+    Returns:
+        Summary with change counts per type
+    """
+    snapshots = group_snapshots(source or os.path.join(DATA_DIR, "raw"))
+    if len(snapshots) < 2:
+        logger.info("Snapshot delta: fewer than two snapshots available, nothing to compare")
+        return {'status': 'skipped', 'reason': 'need two snapshots'}
+    
+    (old_date, old_files), (new_date, new_files) = list(snapshots.items())[-2:]
+    processed_dir = os.path.join(DATA_DIR, "processed")
+    os.makedirs(processed_dir, exist_ok=True)
+    change_set_name = f"snapshot_delta_{old_date}_{new_date}.jsonl"
+    change_set = os.path.join(processed_dir, change_set_name)
+    
+    session = Session()
+    try:
+        published_at = session.execute(text(
+            "SELECT alerts_published_at FROM snapshot_deltas_applied WHERE change_set = :change_set"
+        ), {'change_set': change_set_name}).scalar()
+        session.rollback()
+        if published_at is not None:
+            logger.info(f"Snapshot delta {old_date} -> {new_date} already applied")
+            return {'status': 'skipped', 'reason': 'already applied'}
+        
+        if not os.path.exists(change_set):
+            counts = write_change_set(compute_delta(old_files, new_files, buckets), change_set)
+            logger.info(f"Snapshot delta {old_date} -> {new_date}: {counts}")
+        else:
+            counts = {}
+        
+        # A concurrent run blocks on the primary key until this one commits
+        claimed = session.execute(text("""
+            INSERT INTO snapshot_deltas_applied (change_set, old_snapshot, new_snapshot)
+            VALUES (:change_set, :old_snapshot, :new_snapshot)
+            ON CONFLICT (change_set) DO NOTHING
+            RETURNING change_set
+        """), {
+            'change_set': change_set_name,
+            'old_snapshot': old_date,
+            'new_snapshot': new_date
+        }).fetchone() is not None
+        if not claimed:
+            logger.info(f"Snapshot delta {old_date} -> {new_date} already logged, finishing alerts")
+        
+        monitored: Dict[str, List] = {}
+        for company_id, tenant_id, company_number in session.execute(text(
+            "SELECT id, tenant_id, company_number FROM companies WHERE is_monitored = TRUE"
+        )):
+            monitored.setdefault(company_number, []).append((company_id, tenant_id))
+        
+        insert = text("""
+            INSERT INTO company_change_logs (
+                company_id, tenant_id, change_type, change_data, detected_at, alert_generated
+            ) VALUES (:company_id, :tenant_id, :change_type, :change_data, NOW(), TRUE)
+        """)
+        alerts = []
+        batch = []
+        for line, event in enumerate(read_change_set(change_set), 1):
+            for company_id, tenant_id in monitored.get(event['company_number'], ()):
+                change_data = dict(event, source='snapshot', snapshot_date=new_date.isoformat())
+                if claimed:
+                    batch.append({
+                        'company_id': company_id,
+                        'tenant_id': tenant_id,
+                        'change_type': event['change_type'],
+                        'change_data': json.dumps(change_data)
+                    })
+                alerts.append((f"{change_set_name}:{line}:{company_id}", company_id, tenant_id,
+                               event['change_type'], change_data))
+            if len(batch) >= 1000:
+                session.execute(insert, batch)
+                batch = []
+        if batch:
+            session.execute(insert, batch)
+        session.commit()
+        
+        # Only once the change logs are committed
+        for dedup_key, company_id, tenant_id, alert_type, data in alerts:
+            publish_alert(
+                company_id=str(company_id),
+                tenant_id=tenant_id,
+                alert_type=alert_type,
+                data=data,
+                dedup_key=dedup_key
+            )
+        
+        session.execute(text("""
+            UPDATE snapshot_deltas_applied SET alerts_published_at = NOW()
+            WHERE change_set = :change_set
+        """), {'change_set': change_set_name})
+        session.commit()
+    finally:
+        session.close()
+    
+    logger.info(f"Snapshot delta {old_date} -> {new_date}: {len(alerts)} changes to monitored companies")
+    return {
+        'status': 'success',
+        'old_snapshot': old_date.isoformat(),
+        'new_snapshot': new_date.isoformat(),
+        'change_counts': counts,
+        'monitored_changes': len(alerts)
+    }
+
 def _is_recent_date(date_str: Optional[str], days: int = 30) -> bool:
     """Helper: Check if date is within recent period"""
     if not date_str:
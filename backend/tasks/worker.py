@@ -1,4 +1,7 @@
 import os
+import time
+import uuid
+import base64
 import requests
 import logging
 from datetime import datetime, timedelta
@@ -6,6 +9,17 @@ from celery import Celery
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
+from backend.config import settings
+from backend.data_sources.companies_house import NOT_MODIFIED, CompanyProfile, retry_after_seconds, with_etag
+from backend.data_sources.companies_house_async import bulk_fetch_company_profiles
+from backend.data_sources.companies_house_stream import stream_is_healthy
+from backend.services.dashboard_service import record_alerts
+from backend.utils import metrics
+from backend.utils.content_hash import content_hash, is_unchanged
+from backend.utils.http_session import get_http_session
+from backend.utils.rate_limiter import BACKGROUND, get_companies_house_limiter
+from backend.utils.redis_client import get_redis
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,17 +56,39 @@ def get_db_session():
     return Session()
 
 # Companies House API Helper
-def fetch_company_data(company_number, api_key):
-    """Fetch company data from Companies House API"""
+def fetch_company_data(company_number, api_key, etag=None):
+    """
+    Fetch company data from Companies House API
+    
+    Returns NOT_MODIFIED when ``etag`` is given and the profile is unchanged.
+    """
     url = f"https://api.company-information.service.gov.uk/company/{company_number}"
+    # Basic auth with the key as username and a blank password
+    auth = base64.b64encode(f"{api_key}:".encode("ascii")).decode("ascii")
     headers = {
-        'Authorization': f'Basic {api_key}:'
+        'Authorization': f'Basic {auth}'
     }
+    if etag:
+        headers['If-None-Match'] = etag
+    
+    # Shares the API key's budget with the web app and the ingestion tasks
+    limiter = get_companies_house_limiter()
+    limiter.acquire(lane=BACKGROUND)
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_http_session().get(url, headers=headers)
+        if etag:
+            metrics.incr("companies_house.conditional_requests")
+        if response.status_code == 304:
+            metrics.incr("companies_house.not_modified")
+            return NOT_MODIFIED
         if response.status_code == 200:
-            return response.json()
+            return with_etag(response.json(), response.headers.get('ETag'))
+        elif response.status_code == 429:
+            logger.warning(f"Companies House rate limit hit fetching {company_number}")
+            metrics.incr("companies_house.http_429")
+            limiter.penalize(retry_after_seconds(response.headers))
+            return None
         else:
             logger.error(f"Companies House API error for {company_number}: {response.status_code}")
             return None
@@ -66,127 +102,272 @@ def ping(self):
     """Simple health check task"""
     return "pong"
 
+# Continuous monitoring sweep state (Redis): keyset cursor, lap start and
+# the id of the one live self-rescheduling chain
+SWEEP_KEY = "monitor_companies:sweep"
+# Extra lifetime of the chain id beyond the next scheduled batch; if the
+# chain dies, the periodic trigger starts a new one after this
+SWEEP_CHAIN_GRACE = 300
+# Pause before starting over when there is nothing to monitor
+SWEEP_IDLE_SECONDS = 300
+
+SWEEP_BATCH_SQL = """
+    SELECT c.id, c.companies_house_number, c.name, c.status, c.tenant_id,
+           c.updated_at, c.companies_house_etag, c.accounts_next_due, c.content_hashes,
+           t.name as tenant_name
+    FROM companies c 
+    JOIN tenants t ON c.tenant_id = t.id 
+    WHERE c.is_monitored = true AND t.is_active = true {after}
+    ORDER BY c.id
+    LIMIT :batch_size
+"""
+
 @celery.task(bind=True, max_retries=3)
-def monitor_companies(self):
+def monitor_companies(self, chain_id=None):
     """
     Monitor all companies for changes and generate alerts
-    This task runs periodically to check for updates
+    
+    A continuous, resumable sweep: each run checks one keyset-paged batch
+    of monitored companies (ordered by id, after the cursor persisted in
+    Redis), commits it, advances the cursor and schedules the next batch
+    so the sweep holds MONITOR_SWEEP_COMPANIES_PER_HOUR. When a lap ends
+    the cursor resets and the next lap starts from the beginning.
+    
+    The periodic trigger (no chain_id) only starts a chain when none is
+    alive, so it doubles as a watchdog that restarts a broken chain.
     """
     try:
-        session = get_db_session()
-        api_key = os.getenv("COMPANIES_HOUSE_API_KEY")
+        redis = get_redis()
+        chain_key = f"{SWEEP_KEY}:chain"
+        batch_size = settings.MONITOR_SWEEP_BATCH_SIZE
+        per_hour = max(settings.MONITOR_SWEEP_COMPANIES_PER_HOUR, 1)
         
+        if chain_id is None:
+            claim = uuid.uuid4().hex
+            ttl = int(batch_size * 3600 / per_hour) + SWEEP_CHAIN_GRACE
+            if not redis.set(chain_key, claim, nx=True, ex=ttl):
+                return {"status": "running"}
+            # From here on a retry must carry the id, or it would find the
+            # chain running and stall until the key expires
+            chain_id = claim
+            logger.info(f"Starting monitoring sweep chain {chain_id}")
+        elif redis.get(chain_key) != chain_id:
+            logger.info(f"Monitoring sweep chain {chain_id} superseded, stopping")
+            return {"status": "superseded"}
+        
+        api_key = os.getenv("COMPANIES_HOUSE_API_KEY")
         if not api_key:
+            redis.delete(chain_key)
             logger.error("Companies House API key not configured")
             return {"status": "error", "message": "API key not configured"}
         
-        # Get all monitored companies
-        query = text("""
-            SELECT c.id, c.companies_house_number, c.name, c.status, c.tenant_id,
-                   c.updated_at, t.name as tenant_name
-            FROM companies c 
-            JOIN tenants t ON c.tenant_id = t.id 
-            WHERE c.is_monitored = true AND t.is_active = true
-            ORDER BY c.updated_at ASC
-            LIMIT 50
-        """)
+        started = time.monotonic()
+        cursor = redis.get(f"{SWEEP_KEY}:cursor")
+        if cursor is None:
+            redis.set(f"{SWEEP_KEY}:lap_started", int(time.time()), nx=True)
         
-        result = session.execute(query)
-        companies = result.fetchall()
+        session = get_db_session()
+        try:
+            summary = _monitor_batch(session, api_key, cursor, batch_size)
+        finally:
+            session.close()
         
-        updates_found = 0
-        alerts_created = 0
+        # Advance only after the batch is committed, so a crash re-checks
+        # at most one batch
+        if summary["companies_checked"] == batch_size:
+            redis.set(f"{SWEEP_KEY}:cursor", summary["last_id"])
+        elif summary["companies_checked"] or cursor:
+            _finish_sweep_lap(redis)
+        else:
+            redis.delete(f"{SWEEP_KEY}:lap_started")
         
-        for company in companies:
-            try:
-                # Fetch current data from Companies House
-                current_data = fetch_company_data(company.companies_house_number, api_key)
-                
-                if not current_data:
-                    continue
-                
-                # Check for status changes
-                new_status = current_data.get('company_status')
-                if new_status and new_status != company.status:
-                    # Update company status
-                    update_query = text("""
-                        UPDATE companies 
-                        SET status = :new_status, updated_at = CURRENT_TIMESTAMP 
-                        WHERE id = :company_id
-                    """)
-                    session.execute(update_query, {
-                        'new_status': new_status,
-                        'company_id': company.id
-                    })
-                    
-                    # Create alert
-                    alert_query = text("""
-                        INSERT INTO alerts (tenant_id, company_id, alert_type, title, description, severity)
-                        VALUES (:tenant_id, :company_id, 'status_change', :title, :description, 'medium')
-                    """)
-                    session.execute(alert_query, {
-                        'tenant_id': company.tenant_id,
-                        'company_id': company.id,
-                        'title': f'Status Change: {company.name}',
-                        'description': f'Company status changed from {company.status} to {new_status}'
-                    })
-                    
-                    alerts_created += 1
-                    updates_found += 1
-                    logger.info(f"Status change detected for {company.name}: {company.status} -> {new_status}")
-                
-                # Check for new filings (simplified - would need filing history API)
-                accounts = current_data.get('accounts', {})
-                if accounts.get('next_accounts', {}).get('due_on'):
-                    due_date = accounts['next_accounts']['due_on']
-                    # Check if due date is approaching (within 30 days)
-                    try:
-                        due_datetime = datetime.strptime(due_date, '%Y-%m-%d')
-                        days_until_due = (due_datetime - datetime.now()).days
-                        
-                        if 0 <= days_until_due <= 30:
-                            # Check if we already have a recent alert for this
-                            recent_alert_query = text("""
-                                SELECT COUNT(*) as count FROM alerts 
-                                WHERE company_id = :company_id 
-                                AND alert_type = 'filing_due' 
-                                AND created_at > CURRENT_TIMESTAMP - INTERVAL '7 days'
-                            """)
-                            recent_alert = session.execute(recent_alert_query, {'company_id': company.id}).fetchone()
-                            
-                            if recent_alert.count == 0:
-                                alert_query = text("""
-                                    INSERT INTO alerts (tenant_id, company_id, alert_type, title, description, severity)
-                                    VALUES (:tenant_id, :company_id, 'filing_due', :title, :description, 'high')
-                                """)
-                                session.execute(alert_query, {
-                                    'tenant_id': company.tenant_id,
-                                    'company_id': company.id,
-                                    'title': f'Filing Due: {company.name}',
-                                    'description': f'Accounts filing due on {due_date} ({days_until_due} days remaining)'
-                                })
-                                alerts_created += 1
-                    except ValueError:
-                        pass  # Invalid date format
-                
-            except Exception as e:
-                logger.error(f"Error monitoring company {company.name}: {e}")
-                continue
+        metrics.incr("monitoring.sweep_companies", summary["companies_checked"])
         
-        session.commit()
-        session.close()
+        # Pace the next batch to the configured rate
+        if summary["companies_checked"]:
+            delay = max(summary["companies_checked"] * 3600 / per_hour - (time.monotonic() - started), 0)
+        else:
+            delay = SWEEP_IDLE_SECONDS
+        redis.set(chain_key, chain_id, ex=int(delay) + SWEEP_CHAIN_GRACE)
+        monitor_companies.apply_async(kwargs={"chain_id": chain_id}, countdown=delay)
         
-        logger.info(f"Company monitoring complete: {updates_found} updates, {alerts_created} alerts created")
-        return {
-            "status": "success",
-            "companies_checked": len(companies),
-            "updates_found": updates_found,
-            "alerts_created": alerts_created
-        }
+        logger.info(f"Company monitoring batch complete: {summary['updates_found']} updates, "
+                    f"{summary['alerts_created']} alerts created, {summary['not_modified']} unchanged (304), "
+                    f"{summary['skipped']} left to the stream; "
+                    f"next batch in {delay:.0f}s")
+        summary.pop("last_id")
+        return dict(summary, status="success")
         
     except Exception as e:
         logger.error(f"Error in monitor_companies task: {e}")
-        self.retry(countdown=60 * (self.request.retries + 1))
+        self.retry(kwargs={"chain_id": chain_id}, countdown=60 * (self.request.retries + 1))
+
+def _finish_sweep_lap(redis):
+    """Reset the cursor at the end of a lap and record how long it took."""
+    lap_started = redis.get(f"{SWEEP_KEY}:lap_started")
+    redis.delete(f"{SWEEP_KEY}:cursor", f"{SWEEP_KEY}:lap_started")
+    metrics.incr("monitoring.sweep_laps")
+    if lap_started:
+        logger.info(f"Monitoring sweep lap finished in {(time.time() - int(lap_started)) / 3600:.1f}h")
+
+def _monitor_batch(session, api_key, cursor, batch_size):
+    """
+    Check one batch of monitored companies and commit it.
+    
+    Profiles are fetched concurrently by the asyncio client (each still
+    takes a token from the shared rate budget) and the filing-due alert
+    de-duplication runs as one query for the whole batch.
+    
+    Returns:
+        Batch summary, including the last company id for the cursor
+    """
+    after = "AND c.id > CAST(:cursor AS uuid)" if cursor else ""
+    companies = session.execute(
+        text(SWEEP_BATCH_SQL.format(after=after)), {"cursor": cursor, "batch_size": batch_size}
+    ).fetchall()
+    
+    summary = {
+        "companies_checked": len(companies),
+        "updates_found": 0,
+        "alerts_created": 0,
+        "not_modified": 0,
+        "skipped": 0,
+        "last_id": str(companies[-1].id) if companies else None,
+        # While the streaming consumers are up, profile changes arrive as
+        # events; only the deadline checks below still need to run
+        "streaming": stream_is_healthy(),
+    }
+    if not companies:
+        return summary
+    
+    if summary["streaming"]:
+        profiles = {}
+    else:
+        # One request per company number over the asyncio client, conditional
+        # when every row holding the number agrees on the ETag
+        etags = {}
+        for c in companies:
+            if c.companies_house_number:
+                etags.setdefault(c.companies_house_number, set()).add(c.companies_house_etag)
+        fetched = bulk_fetch_company_profiles(
+            {number: (tags.pop() if len(tags) == 1 else None) for number, tags in etags.items()}, api_key
+        )
+        profiles = {str(c.id): fetched.get(c.companies_house_number) for c in companies}
+    
+    profile_updates = []
+    etag_updates = []
+    status_changes = []
+    due_soon = {}
+    
+    for company in companies:
+        current_data = profiles.get(str(company.id), NOT_MODIFIED)
+        if not current_data:
+            continue
+        
+        if summary["streaming"]:
+            # Not fetched: the stream refreshes changed profiles
+            summary["skipped"] += 1
+            due_date = company.accounts_next_due.isoformat() if company.accounts_next_due else None
+        elif current_data is NOT_MODIFIED or is_unchanged(
+                company.content_hashes, 'profile', content_hash(CompanyProfile.from_api(current_data))):
+            # Profile unchanged (304 or same content): skip the diff, only
+            # re-check the stored deadline since "days until due" moves daily
+            summary["not_modified"] += 1
+            due_date = company.accounts_next_due.isoformat() if company.accounts_next_due else None
+            if current_data is not NOT_MODIFIED and current_data.get('etag'):
+                # Same content under a new ETag: keep the ETag so the next
+                # request is conditional again
+                etag_updates.append({'etag': current_data['etag'], 'company_id': company.id})
+        else:
+            due_date = current_data.get('accounts', {}).get('next_accounts', {}).get('due_on')
+            profile_updates.append({
+                'etag': current_data.get('etag'),
+                'due_on': due_date,
+                'company_id': company.id
+            })
+            
+            # Check for status changes
+            new_status = current_data.get('company_status')
+            if new_status and new_status != company.status:
+                status_changes.append((company, new_status))
+        
+        if due_date:
+            try:
+                days_until_due = (datetime.strptime(due_date, '%Y-%m-%d') - datetime.now()).days
+            except ValueError:
+                continue  # Invalid date format
+            if 0 <= days_until_due <= 30:
+                due_soon[str(company.id)] = (company, due_date, days_until_due)
+    
+    if profile_updates:
+        session.execute(text("""
+            UPDATE companies
+            SET companies_house_etag = :etag, accounts_next_due = :due_on
+            WHERE id = :company_id
+        """), profile_updates)
+    if etag_updates:
+        session.execute(text(
+            "UPDATE companies SET companies_house_etag = :etag WHERE id = :company_id"
+        ), etag_updates)
+    
+    alerts = []
+    for company, new_status in status_changes:
+        session.execute(text("""
+            UPDATE companies 
+            SET status = :new_status, updated_at = CURRENT_TIMESTAMP 
+            WHERE id = :company_id
+        """), {'new_status': new_status, 'company_id': company.id})
+        alerts.append({
+            'tenant_id': company.tenant_id,
+            'company_id': company.id,
+            'company_name': company.name,
+            'alert_type': 'status_change',
+            'title': f'Status Change: {company.name}',
+            'description': f'Company status changed from {company.status} to {new_status}',
+            'severity': 'medium'
+        })
+        summary["updates_found"] += 1
+        logger.info(f"Status change detected for {company.name}: {company.status} -> {new_status}")
+    
+    if due_soon:
+        # One query for the whole batch: who already had a filing_due alert this week
+        alerted = {
+            str(row.company_id) for row in session.execute(text("""
+                SELECT DISTINCT company_id FROM alerts
+                WHERE company_id = ANY(CAST(:ids AS uuid[]))
+                AND alert_type = 'filing_due'
+                AND created_at > CURRENT_TIMESTAMP - INTERVAL '7 days'
+            """), {'ids': list(due_soon)})
+        }
+        for company_id, (company, due_date, days_until_due) in due_soon.items():
+            if company_id in alerted:
+                continue
+            alerts.append({
+                'tenant_id': company.tenant_id,
+                'company_id': company.id,
+                'company_name': company.name,
+                'alert_type': 'filing_due',
+                'title': f'Filing Due: {company.name}',
+                'description': f'Accounts filing due on {due_date} ({days_until_due} days remaining)',
+                'severity': 'high'
+            })
+    
+    if alerts:
+        created_at = datetime.utcnow()
+        for alert in alerts:
+            alert.update(id=str(uuid.uuid4()), created_at=created_at)
+        session.execute(text("""
+            INSERT INTO alerts (id, tenant_id, company_id, alert_type, title, description, severity, created_at)
+            VALUES (:id, :tenant_id, :company_id, :alert_type, :title, :description, :severity, :created_at)
+        """), alerts)
+        summary["alerts_created"] = len(alerts)
+    
+    session.commit()
+    record_alerts([
+        dict(alert, company_id=str(alert['company_id']), created_at=created_at.isoformat(), is_read=False)
+        for alert in alerts
+    ])
+    return summary
 
 @celery.task(bind=True, max_retries=3)
 def fetch_company_updates(self, company_id):
@@ -199,7 +380,7 @@ def fetch_company_updates(self, company_id):
         
         # Get company details
         query = text("""
-            SELECT companies_house_number, name, tenant_id 
+            SELECT companies_house_number, name, tenant_id, content_hashes
             FROM companies 
             WHERE id = :company_id AND is_monitored = true
         """)
@@ -213,6 +394,13 @@ def fetch_company_updates(self, company_id):
         if not current_data:
             return {"status": "error", "message": "Failed to fetch company data"}
         
+        # Same content as the profile ingestion last stored: the columns
+        # below are already current. Only the ingestion tasks, which write
+        # the whole profile, record the hash.
+        if is_unchanged(result.content_hashes, 'profile', content_hash(CompanyProfile.from_api(current_data))):
+            session.close()
+            return {"status": "success", "company": result.name, "updated": False}
+        
         # Update company information
         update_query = text("""
             UPDATE companies 
@@ -366,9 +554,9 @@ def setup_periodic_tasks():
     """
     from celery.schedules import crontab
     
-    # Monitor companies every 6 hours
+    # Keep the continuous monitoring sweep alive (a no-op while it runs)
     celery.add_periodic_task(
-        crontab(minute=0, hour='*/6'),
+        crontab(minute='*/5'),
         monitor_companies.s(),
         name='monitor-companies'
     )
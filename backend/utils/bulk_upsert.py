@@ -0,0 +1,94 @@
+# backend/utils/bulk_upsert.py
+"""
+Set-based inserts for child rows of a company (filings, charges, PSCs).
+
+A whole batch is sent as a single JSON parameter and expanded server-side
+with jsonb_to_recordset, so storing 100 filings costs one round-trip
+instead of a SELECT and an INSERT per row. RETURNING reports exactly
+which rows were new (or changed), and callers build alerts from those.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Rows per statement; keeps the JSON parameter to a few MB
+BATCH_SIZE = 5000
+
+
+def _dedupe(rows: Iterable[Dict], key: Sequence[str]) -> List[Dict]:
+    """Drop rows missing a key value and keep the last row per key."""
+    unique: Dict[Tuple, Dict] = {}
+    for row in rows:
+        values = tuple(row.get(k) for k in key)
+        if any(v is None for v in values):
+            continue
+        unique[values] = row
+    return list(unique.values())
+
+
+def upsert_rows(session, table: str, columns: Sequence[Tuple[str, str]], rows: Iterable[Dict],
+                conflict: Sequence[str], fixed: Optional[Dict[str, Any]] = None,
+                update: Optional[Sequence[str]] = None,
+                returning: Optional[Sequence[str]] = None) -> List[Dict]:
+    """
+    Insert rows in one statement per batch, skipping (or updating) existing ones.
+
+    Args:
+        session: SQLAlchemy session (the caller commits)
+        table: Target table
+        columns: (column, SQL type) pairs read from each row dict
+        rows: Row dicts; dict/list values are stored as JSON
+        conflict: Unique key columns, e.g. ("company_id", "transaction_id")
+        fixed: Values shared by every row, e.g. company_id and tenant_id
+        update: Columns to overwrite when the row exists and differs;
+            None means existing rows are left alone (DO NOTHING)
+        returning: Columns to return for new/changed rows (default: all
+            of ``columns``)
+
+    Returns:
+        One dict per inserted or changed row, with an ``inserted`` flag
+    """
+    fixed = fixed or {}
+    row_key = [c for c in conflict if c not in fixed]
+    batch_rows = _dedupe(rows, row_key)
+    if not batch_rows:
+        return []
+
+    names = [name for name, _ in columns]
+    fixed_names = list(fixed)
+    record_def = ", ".join(f"{name} {sql_type}" for name, sql_type in columns)
+    select_list = ", ".join([f"CAST(:fixed_{n} AS {_fixed_type(n)})" for n in fixed_names] + [f"r.{n}" for n in names])
+    returning = list(returning or names)
+
+    if update:
+        assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in update)
+        changed = " OR ".join(f"{table}.{c} IS DISTINCT FROM EXCLUDED.{c}" for c in update)
+        on_conflict = f"DO UPDATE SET {assignments} WHERE {changed}"
+    else:
+        on_conflict = "DO NOTHING"
+
+    statement = text(f"""
+        INSERT INTO {table} ({", ".join(fixed_names + names)})
+        SELECT {select_list}
+        FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r({record_def})
+        ON CONFLICT ({", ".join(conflict)}) {on_conflict}
+        RETURNING {", ".join(returning)}, (xmax = 0) AS inserted
+    """)
+    params = {f"fixed_{n}": v for n, v in fixed.items()}
+
+    results = []
+    for start in range(0, len(batch_rows), BATCH_SIZE):
+        chunk = batch_rows[start:start + BATCH_SIZE]
+        params["rows"] = json.dumps([{n: row.get(n) for n in names} for row in chunk], default=str)
+        results.extend(dict(r._mapping) for r in session.execute(statement, params))
+    return results
+
+
+def _fixed_type(name: str) -> str:
+    """SQL type of the shared columns used across the company child tables."""
+    return {"company_id": "uuid", "tenant_id": "integer"}.get(name, "text")
@@ -0,0 +1,329 @@
+# backend/utils/cache.py
+"""
+Two-tier read-through cache for upstream API responses.
+
+Tier one is a bounded in-process LRU, so repeat reads in the same gunicorn
+or Celery process cost nothing. Tier two is a Redis cache shared by every
+process, so a profile fetched by one worker is reused by all the others.
+
+Each entry carries the time it was fetched. Within its TTL an entry is
+served as-is. For a further ``stale_ttl`` seconds it is still served, but
+one background refresh is started (stale-while-revalidate). "Not found"
+results are cached for ``negative_ttl`` seconds, so repeated lookups of a
+bad company number don't spend API budget.
+
+Misses are single-flight: one thread per process holds a local lock, and
+one process across the cluster holds a short Redis lock, while the others
+wait for its result. This stops a thundering herd against the API.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.config import settings
+from backend.utils import metrics
+from backend.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# How long a miss may hold the cluster-wide fetch lock, and how long other
+# processes wait for its result before fetching themselves
+LOCK_TTL_SECONDS = 10
+LOCK_WAIT_SECONDS = 5.0
+
+# Seconds between flushes of buffered hit/miss counters to shared metrics
+METRICS_FLUSH_SECONDS = 5.0
+
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refresh_pid: Optional[int] = None
+_refresh_lock = threading.Lock()
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    """Small per-process pool for background revalidation (recreated after fork)."""
+    global _refresh_executor, _refresh_pid
+    pid = os.getpid()
+    if _refresh_executor is None or _refresh_pid != pid:
+        with _refresh_lock:
+            if _refresh_executor is None or _refresh_pid != pid:
+                _refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+                _refresh_pid = pid
+    return _refresh_executor
+
+
+class _LRU:
+    """Thread-safe bounded LRU of key -> (serialised value, fetched_at)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, payload: str, fetched_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (payload, fetched_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TwoTierCache:
+    """
+    Read-through cache with an in-process LRU in front of Redis.
+
+    Values must be JSON-serialisable. A fetch returning None is treated as
+    "not found" and cached negatively; exceptions are never cached.
+    """
+
+    def __init__(self, name: str, ttls: Dict[str, int], default_ttl: int = 300,
+                 stale_ttl: int = 3600, negative_ttl: int = 300, lru_size: int = 1024):
+        self.name = name
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.prefix = f"cache:{name}:"
+
+        self._lru = _LRU(lru_size)
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_guard = threading.Lock()
+        self._refreshing = set()
+
+        self._counts: Counter = Counter()
+        self._counts_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get_or_fetch(self, key: str, kind: str, fetch: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Return the cached value for ``key``, calling ``fetch`` on a miss.
+
+        Args:
+            key: Cache key, unique per request (e.g. endpoint and params)
+            kind: Endpoint type, selects the TTL
+            fetch: Callable returning the fresh value, or None if not found
+
+        Returns:
+            The cached or freshly fetched value (None if not found)
+        """
+        ttl = self.ttls.get(kind, self.default_ttl)
+
+        entry, tier = self._lookup(key)
+        if entry is not None:
+            value, missing, age = entry
+            max_age = self.negative_ttl if missing else ttl
+            if age < max_age:
+                self._count(f"hit_{tier}")
+                return value
+            if not missing and age < ttl + self.stale_ttl:
+                self._count("stale")
+                self._revalidate(key, kind, fetch)
+                return value
+
+        self._count("miss")
+        return self._fetch_single_flight(key, kind, fetch)
+
+    def set(self, key: str, kind: str, value: Optional[Any]) -> None:
+        """Store a value fetched elsewhere (e.g. by a conditional request)."""
+        self._store(key, kind, value, time.time())
+
+    def invalidate(self, key: str) -> None:
+        """Drop ``key`` from both tiers in this process and from Redis."""
+        self._lru.delete(key)
+        try:
+            get_redis().delete(self.prefix + key)
+        except Exception as e:
+            logger.debug(f"Cache '{self.name}' invalidate failed for {key}: {e}")
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _lookup(self, key: str) -> Tuple[Optional[Tuple[Any, bool, float]], Optional[str]]:
+        cached = self._lru.get(key)
+        tier = "local"
+        if cached is None:
+            tier = "redis"
+            try:
+                raw = get_redis().get(self.prefix + key)
+            except Exception as e:
+                logger.debug(f"Cache '{self.name}' Redis read failed: {e}")
+                raw = None
+            if raw is None:
+                return None, None
+            try:
+                fetched_at = float(json.loads(raw)["t"])
+            except (ValueError, KeyError, TypeError):
+                return None, None
+            cached = (raw, fetched_at)
+            self._lru.set(key, raw, fetched_at)
+
+        payload, fetched_at = cached
+        data = json.loads(payload)
+        return (data.get("v"), bool(data.get("nf")), time.time() - fetched_at), tier
+
+    def _store(self, key: str, kind: str, value: Optional[Any], fetched_at: float) -> None:
+        missing = value is None
+        payload = json.dumps({"v": value, "t": fetched_at, "nf": missing})
+        self._lru.set(key, payload, fetched_at)
+
+        if missing:
+            expiry = self.negative_ttl
+        else:
+            expiry = self.ttls.get(kind, self.default_ttl) + self.stale_ttl
+        try:
+            get_redis().set(self.prefix + key, payload, ex=max(int(expiry), 1))
+        except Exception as e:
+            logger.debug(f"Cache '{self.name}' Redis write failed: {e}")
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._key_locks_guard:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _release_key_lock(self, key: str, lock: threading.Lock) -> None:
+        lock.release()
+        with self._key_locks_guard:
+            if self._key_locks.get(key) is lock and not lock.locked():
+                del self._key_locks[key]
+
+    def _fetch_single_flight(self, key: str, kind: str, fetch: Callable[[], Optional[Any]]) -> Optional[Any]:
+        lock = self._key_lock(key)
+        lock.acquire()
+        try:
+            # Another thread in this process may have filled it meanwhile
+            entry, _ = self._lookup(key)
+            if entry is not None and entry[2] < (self.negative_ttl if entry[1] else self.ttls.get(kind, self.default_ttl)):
+                self._count("coalesced")
+                return entry[0]
+
+            if not self._acquire_remote_lock(key):
+                # Another process is fetching: wait briefly for its result
+                deadline = time.monotonic() + LOCK_WAIT_SECONDS
+                while time.monotonic() < deadline:
+                    time.sleep(0.1)
+                    entry, _ = self._lookup(key)
+                    if entry is not None and entry[2] < LOCK_WAIT_SECONDS + 1:
+                        self._count("coalesced")
+                        return entry[0]
+                logger.debug(f"Cache '{self.name}' gave up waiting for {key}, fetching")
+
+            try:
+                value = fetch()
+                self._store(key, kind, value, time.time())
+                return value
+            finally:
+                self._release_remote_lock(key)
+        finally:
+            self._release_key_lock(key, lock)
+
+    def _acquire_remote_lock(self, key: str) -> bool:
+        try:
+            return bool(get_redis().set(f"{self.prefix}lock:{key}", os.getpid(), nx=True, ex=LOCK_TTL_SECONDS))
+        except Exception:
+            # Without Redis, the local lock is the best we can do
+            return True
+
+    def _release_remote_lock(self, key: str) -> None:
+        try:
+            get_redis().delete(f"{self.prefix}lock:{key}")
+        except Exception:
+            pass
+
+    def _revalidate(self, key: str, kind: str, fetch: Callable[[], Optional[Any]]) -> None:
+        """Refresh a stale entry in the background, at most once at a time per key."""
+        with self._key_locks_guard:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                if not self._acquire_remote_lock(key):
+                    return
+                try:
+                    self._store(key, kind, fetch(), time.time())
+                    self._count("revalidated")
+                finally:
+                    self._release_remote_lock(key)
+            except Exception as e:
+                logger.warning(f"Cache '{self.name}' background refresh failed for {key}: {e}")
+            finally:
+                with self._key_locks_guard:
+                    self._refreshing.discard(key)
+
+        try:
+            _get_refresh_executor().submit(refresh)
+        except RuntimeError:
+            # Interpreter shutting down
+            with self._key_locks_guard:
+                self._refreshing.discard(key)
+
+    def _count(self, event: str) -> None:
+        """Buffer hit/miss counts locally so a local hit never touches Redis."""
+        with self._counts_lock:
+            self._counts[event] += 1
+            if time.monotonic() - self._last_flush < METRICS_FLUSH_SECONDS:
+                return
+            counts, self._counts = self._counts, Counter()
+            self._last_flush = time.monotonic()
+
+        for event_name, amount in counts.items():
+            metrics.incr(f"cache.{self.name}.{event_name}", amount)
+
+
+_companies_house_cache: Optional[TwoTierCache] = None
+
+
+def get_companies_house_cache() -> TwoTierCache:
+    """Return the process-wide cache for Companies House responses."""
+    global _companies_house_cache
+    if _companies_house_cache is None:
+        _companies_house_cache = TwoTierCache(
+            name="companies_house",
+            ttls={
+                "search": settings.COMPANIES_HOUSE_CACHE_TTL_SEARCH,
+                "profile": settings.COMPANIES_HOUSE_CACHE_TTL_PROFILE,
+                "officers": settings.COMPANIES_HOUSE_CACHE_TTL_PROFILE,
+                "filings": settings.COMPANIES_HOUSE_CACHE_TTL_PROFILE,
+                "charges": settings.COMPANIES_HOUSE_CACHE_TTL_STABLE,
+                "pscs": settings.COMPANIES_HOUSE_CACHE_TTL_STABLE,
+                "insolvency": settings.COMPANIES_HOUSE_CACHE_TTL_STABLE,
+            },
+            default_ttl=settings.COMPANIES_HOUSE_CACHE_TTL_PROFILE,
+            stale_ttl=settings.COMPANIES_HOUSE_CACHE_STALE_TTL,
+            negative_ttl=settings.COMPANIES_HOUSE_CACHE_NEGATIVE_TTL,
+            lru_size=settings.COMPANIES_HOUSE_CACHE_LRU_SIZE,
+        )
+    return _companies_house_cache
+
+
+metrics.register_gauge(
+    "cache.companies_house.local_entries",
+    lambda: len(get_companies_house_cache()._lru),
+)
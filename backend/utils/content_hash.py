@@ -0,0 +1,92 @@
+# backend/utils/content_hash.py
+"""
+Content hashes of Companies House payloads, to skip writes that change nothing.
+
+Companies House hands out a new ETag (or a full 200) for many refreshes
+that carry the same data. Each company row keeps a sha256 per endpoint
+(profile, filings, officers, charges, pscs) of the normalised payload in
+``companies.content_hashes``; a refresh whose hash matches skips the write
+and everything downstream of it.
+
+Counters ``content_hash.<endpoint>.skipped`` / ``.changed`` feed the
+``content_hash.skip_rate`` gauges.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from backend.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+ENDPOINTS = ("profile", "filings", "officers", "charges", "pscs")
+
+# Transport metadata and API navigation that change without the content
+# changing
+_VOLATILE_KEYS = {"etag", "links"}
+
+
+def _normalise(payload: Any) -> Any:
+    """
+    Drop volatile keys and turn objects into plain JSON values. A null
+    field hashes like a missing one, since the API omits empty fields that
+    CompanyProfile carries as None.
+    """
+    # Lists first: ItemList is a list carrying its ETag as an attribute
+    if isinstance(payload, (list, tuple)):
+        return [_normalise(v) for v in payload]
+    if hasattr(payload, "__dict__") and not isinstance(payload, dict):
+        payload = vars(payload)
+    if isinstance(payload, dict):
+        return {
+            k: _normalise(v) for k, v in payload.items()
+            if k not in _VOLATILE_KEYS and v is not None
+        }
+    return payload
+
+
+def content_hash(payload: Any) -> str:
+    """sha256 of the canonical JSON form (sorted keys, no whitespace)."""
+    canonical = json.dumps(_normalise(payload), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_unchanged(stored: Optional[Dict[str, str]], endpoint: str, digest: str) -> bool:
+    """
+    Compare a payload hash with the one stored for ``endpoint`` and count
+    the outcome.
+
+    Args:
+        stored: The row's content_hashes (None or {} if never hashed)
+        endpoint: One of ENDPOINTS
+        digest: content_hash() of the fetched payload
+    """
+    unchanged = (stored or {}).get(endpoint) == digest
+    metrics.incr(f"content_hash.{endpoint}.{'skipped' if unchanged else 'changed'}")
+    return unchanged
+
+
+def record_content_hash(session, company_id, endpoint: str, digest: str) -> None:
+    """Store the hash alongside the write it describes (the caller commits)."""
+    session.execute(text("""
+        UPDATE companies
+        SET content_hashes = COALESCE(content_hashes, '{}'::jsonb) || jsonb_build_object(CAST(:endpoint AS text), CAST(:digest AS text))
+        WHERE id = :company_id
+    """), {"endpoint": endpoint, "digest": digest, "company_id": company_id})
+
+
+def _skip_rate(endpoints=ENDPOINTS) -> Optional[float]:
+    counters = metrics.snapshot_counters()
+    skipped = sum(counters.get(f"content_hash.{e}.skipped", 0) for e in endpoints)
+    changed = sum(counters.get(f"content_hash.{e}.changed", 0) for e in endpoints)
+    total = skipped + changed
+    return round(skipped / total, 4) if total else None
+
+
+metrics.register_gauge("content_hash.skip_rate", _skip_rate)
+for _endpoint in ENDPOINTS:
+    metrics.register_gauge(f"content_hash.skip_rate.{_endpoint}", lambda e=_endpoint: _skip_rate((e,)))
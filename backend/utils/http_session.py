@@ -0,0 +1,114 @@
+# backend/utils/http_session.py
+"""
+Process-wide pooled HTTP session for outbound API calls.
+
+One requests.Session per process keeps TCP+TLS connections to Companies
+House alive between calls instead of handshaking on every request. Pool
+size, timeouts and retries are configured here, from Settings, so every
+caller behaves the same. Requests to rate-limited hosts are never retried
+behind the limiter's back.
+
+Like the Redis client, the session is created lazily and re-created after
+a fork (gunicorn/Celery prefork), so a worker never shares sockets with
+its parent.
+"""
+
+import os
+import logging
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "UK-Customer-Intelligence-Platform/1.0"
+
+# Hosts whose requests draw on the shared Companies House rate budget
+RATE_LIMITED_HOSTS = ("https://api.company-information.service.gov.uk",)
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies the configured timeout when a caller passes none."""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _adapter(retry: Retry) -> _TimeoutHTTPAdapter:
+    return _TimeoutHTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+        timeout=(settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT),
+    )
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=settings.HTTP_MAX_RETRIES,
+        connect=settings.HTTP_MAX_RETRIES,
+        read=settings.HTTP_MAX_RETRIES,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        backoff_factor=0.3,
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    # A retry inside urllib3 would skip the shared rate limiter, so hosts
+    # behind it only retry failed connections (nothing reached the API);
+    # 5xx responses and read errors go back to the caller, whose own
+    # retries take a token each time
+    limited_retry = Retry(
+        total=settings.HTTP_MAX_RETRIES,
+        connect=settings.HTTP_MAX_RETRIES,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=0.3,
+        raise_on_status=False,
+    )
+
+    session = requests.Session()
+    session.mount("https://", _adapter(retry))
+    session.mount("http://", _adapter(retry))
+    for host in RATE_LIMITED_HOSTS:
+        session.mount(host, _adapter(limited_retry))
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Return the pooled session for the current process.
+
+    Credentials are per caller, so pass auth headers on each request rather
+    than setting them on the shared session.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+
+    with _lock:
+        if _session is None or _session_pid != pid:
+            # Don't close an inherited session: its sockets belong to the parent
+            _session = _build_session()
+            _session_pid = pid
+            logger.debug(f"HTTP session created for pid {pid}")
+    return _session
@@ -0,0 +1,63 @@
+# backend/utils/metrics.py
+"""
+Lightweight shared metrics.
+
+Counters live in a single Redis hash so every gunicorn and Celery process
+contributes to the same totals. Gauges are registered as callables and
+evaluated when a snapshot is taken, so reading them costs nothing on the
+hot path. Metric writes never raise: losing a sample is preferable to
+failing the request that produced it.
+"""
+
+import logging
+from typing import Callable, Dict
+
+from backend.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_KEY = "metrics:counters"
+
+_gauges: Dict[str, Callable[[], float]] = {}
+
+
+def incr(name: str, amount: int = 1) -> None:
+    """Increment a shared counter."""
+    try:
+        get_redis().hincrby(COUNTERS_KEY, name, amount)
+    except Exception as e:
+        logger.debug(f"Metric {name} not recorded: {e}")
+
+
+def register_gauge(name: str, func: Callable[[], float]) -> None:
+    """Register a callable that is evaluated on every snapshot."""
+    _gauges[name] = func
+
+
+def snapshot_counters() -> Dict[str, int]:
+    """Current value of every shared counter ({} if Redis is unavailable)."""
+    try:
+        return {k: int(v) for k, v in get_redis().hgetall(COUNTERS_KEY).items()}
+    except Exception as e:
+        logger.warning(f"Could not read metric counters: {e}")
+        return {}
+
+
+def snapshot() -> Dict:
+    """
+    Collect all counters and gauges.
+
+    Returns:
+        Dict with "counters" and "gauges" sections
+    """
+    counters = snapshot_counters()
+
+    gauges = {}
+    for name, func in _gauges.items():
+        try:
+            gauges[name] = func()
+        except Exception as e:
+            logger.warning(f"Gauge {name} failed: {e}")
+            gauges[name] = None
+
+    return {"counters": counters, "gauges": gauges}
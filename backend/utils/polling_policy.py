@@ -0,0 +1,90 @@
+# backend/utils/polling_policy.py
+"""
+Deadline-aware polling intervals for monitored companies.
+
+Most changes on the register cluster around a company's statutory
+deadlines: accounts and confirmation statements are filed in the days
+before they fall due (and late filers just after), and strike-off
+activity follows missed ones. A company is therefore checked often
+around its next accounts and confirmation statement due dates and drops
+to a low baseline when nothing is coming up.
+
+Pure functions only, so the scheduler and the offline backtest
+(scripts/backtest_polling_policy.py) share exactly the same policy.
+"""
+
+from datetime import date, datetime
+from typing import Iterable, Optional, Union
+
+# Interval for companies with no deadline nearby
+BASELINE_HOURS = 168
+
+# (days before a deadline, days after it, interval hours); the tightest
+# band containing any deadline wins
+DEADLINE_BANDS = [
+    (3, 3, 2),
+    (14, 7, 6),
+    (30, 14, 24),
+]
+
+
+def _as_date(value: Union[date, datetime, str, None]) -> Optional[date]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def deadline_interval_hours(deadlines: Iterable[Union[date, str, None]],
+                            now: Union[date, datetime],
+                            baseline_hours: int = BASELINE_HOURS) -> int:
+    """
+    Check interval implied by a company's deadlines.
+
+    Args:
+        deadlines: Due dates (accounts, confirmation statement); None and
+            unparseable values are ignored
+        now: Point in time the interval starts from
+        baseline_hours: Interval when no deadline is within any band
+
+    Returns:
+        Interval in hours
+    """
+    today = _as_date(now)
+    hours = baseline_hours
+    for deadline in deadlines:
+        due = _as_date(deadline)
+        if due is None:
+            continue
+        days_after = (today - due).days
+        for before, after, band_hours in DEADLINE_BANDS:
+            if -before <= days_after <= after:
+                hours = min(hours, band_hours)
+                break
+    return hours
+
+
+def polling_interval_hours(config_hours: Optional[int], deadlines: Iterable[Union[date, str, None]],
+                           now: Union[date, datetime]) -> int:
+    """
+    Interval for one company.
+
+    An explicit monitoring config (check_frequency_hours, already capped
+    by priority) is an upper bound; the deadline policy can only shorten it.
+
+    Args:
+        config_hours: Interval from company_monitoring_config, None if the
+            company has no config
+        deadlines: Upcoming due dates
+        now: Point in time the interval starts from
+    """
+    hours = deadline_interval_hours(deadlines, now)
+    if config_hours:
+        hours = min(hours, int(config_hours))
+    return max(hours, 1)
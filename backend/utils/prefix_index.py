@@ -0,0 +1,174 @@
+# backend/utils/prefix_index.py
+"""
+Memory-mapped prefix index for company name / number autocomplete.
+
+An immutable sorted string table, built offline by
+scripts/build_prefix_index.py into data/processed. Layout:
+
+    header   "CHPFX001", record count, offset of the offsets table (uint64)
+    records  key \\x1f company_number \\x1f status \\x1f name \\n, sorted by key bytes
+    offsets  one native uint64 per record
+
+Keys are upper-cased names with whitespace collapsed (plus the name
+without a leading "THE ") and company numbers; ``name`` is empty when it
+equals the key. A lookup binary-searches the offsets for the first key
+>= the prefix and reads forward while keys still match, so it touches a
+few pages and no database. The file is opened with mmap, so every
+gunicorn worker on a host shares one copy in the page cache. A rebuilt
+file replaces the old one atomically and is picked up within
+RELOAD_CHECK_SECONDS.
+"""
+
+import os
+import mmap
+import time
+import struct
+import logging
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CHPFX001"
+_HEADER = struct.Struct("<8sQQ")
+SEP = b"\x1f"
+
+# Prefix matches read per lookup before ranking; bounds the cost of "A"
+SCAN_LIMIT = 256
+RELOAD_CHECK_SECONDS = 60
+
+
+def normalise(value: str) -> str:
+    """Key form of a name or query: upper case, single spaces."""
+    return " ".join(value.split()).upper()
+
+
+def write_prefix_index(path: str, records: Iterable[Tuple[str, str, str, str]]) -> int:
+    """
+    Write an index from records already sorted by key bytes.
+
+    Args:
+        path: Destination; written to a temporary file and moved into place
+        records: (key, company_number, status, name) tuples
+
+    Returns:
+        Number of records written
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    offsets = array("Q")
+    previous = b""
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, 0, 0))
+        for key, number, status, name in records:
+            fields = [v.encode("utf-8") for v in (key, number, status or "", "" if name == key else name or "")]
+            if any(SEP in v or b"\n" in v for v in fields) or not fields[0]:
+                continue
+            if fields[0] < previous:
+                raise ValueError(f"Records out of order at {key!r}")
+            previous = fields[0]
+            offsets.append(f.tell())
+            f.write(SEP.join(fields) + b"\n")
+        offsets_at = f.tell()
+        offsets.tofile(f)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, len(offsets), offsets_at))
+    os.replace(tmp, path)
+    return len(offsets)
+
+
+class PrefixIndex:
+    """Read-only view of an index file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, offsets_at = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a prefix index")
+        self._offsets = memoryview(self._mm)[offsets_at:offsets_at + 8 * self.count].cast("Q")
+
+    def _key(self, i: int) -> bytes:
+        start = self._offsets[i]
+        return self._mm[start:self._mm.find(SEP, start)]
+
+    def _fields(self, i: int) -> List[bytes]:
+        start = self._offsets[i]
+        return self._mm[start:self._mm.find(b"\n", start)].split(SEP)
+
+    def lookup(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """
+        Companies whose name (or number) starts with ``prefix``.
+
+        Of the first SCAN_LIMIT matches, active companies come first, then
+        shorter keys (the closest completions), then key order.
+        """
+        target = normalise(prefix).encode("utf-8")
+        if not target:
+            return []
+
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        matches = []
+        for i in range(lo, min(lo + SCAN_LIMIT, self.count)):
+            key, number, status, name = self._fields(i)
+            if not key.startswith(target):
+                break
+            matches.append((status != b"active", len(key), i, key, number, status, name))
+        matches.sort()
+
+        results, seen = [], set()
+        for _, _, _, key, number, status, name in matches:
+            if number in seen:
+                continue
+            seen.add(number)
+            results.append({
+                "companies_house_number": number.decode("utf-8"),
+                "name": (name or key).decode("utf-8"),
+                "status": status.decode("utf-8") or None,
+            })
+            if len(results) >= limit:
+                break
+        return results
+
+
+_index: Optional[PrefixIndex] = None
+_index_mtime: Optional[float] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_prefix_index() -> Optional[PrefixIndex]:
+    """The process's index, reopened when the file is rebuilt; None if not built."""
+    global _index, _index_mtime, _checked_at
+
+    now = time.monotonic()
+    if now - _checked_at < RELOAD_CHECK_SECONDS:
+        return _index
+
+    with _lock:
+        if now - _checked_at < RELOAD_CHECK_SECONDS:
+            return _index
+        _checked_at = now
+        path = settings.COMPANY_PREFIX_INDEX_PATH
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            _index, _index_mtime = None, None
+            return None
+        if mtime != _index_mtime:
+            try:
+                _index, _index_mtime = PrefixIndex(path), mtime
+                logger.info(f"Prefix index loaded from {path} ({_index.count:,} keys)")
+            except (OSError, ValueError) as e:
+                logger.error(f"Prefix index {path} could not be opened: {e}")
+    return _index
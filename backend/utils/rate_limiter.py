@@ -0,0 +1,299 @@
+# backend/utils/rate_limiter.py
+"""
+Distributed rate limiting for upstream APIs.
+
+Implements GCRA (the generic cell rate algorithm, an exact form of a token
+bucket) on top of a single Redis key, so every gunicorn worker, Celery
+process and node spending the same API key shares one budget. The state is
+a theoretical arrival time (TAT) updated atomically by a Lua script that
+uses the Redis server clock, so host clock skew does not matter.
+
+Priority lanes reserve part of the burst for latency-sensitive callers: a
+lane with ``reserve=N`` is refused whenever fewer than N tokens would be
+left afterwards. Background work therefore backs off before interactive
+requests ever have to wait.
+
+If Redis is unreachable the limiter degrades to an in-process bucket with
+the same semantics rather than failing every API call. After a failure it
+stays local for REDIS_RETRY_SECONDS, so an outage costs one connection
+timeout per interval instead of one per request.
+"""
+
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from backend.config import settings
+from backend.utils import metrics
+from backend.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# How long the local bucket is used after Redis fails before trying it again
+REDIS_RETRY_SECONDS = 5.0
+
+# KEYS[1] = TAT key
+# ARGV = interval, burst, reserve, cost
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+
+local remaining = math.floor((now - (tat - interval * burst)) / interval)
+local new_tat = tat + interval * cost
+local allow_at = new_tat - interval * (burst - reserve)
+
+if cost > 0 and allow_at > now then
+    return {0, tostring(allow_at - now), remaining}
+end
+
+if cost > 0 then
+    redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000) + 1000)
+    remaining = remaining - cost
+end
+return {1, '0', remaining}
+"""
+
+# KEYS[1] = TAT key
+# ARGV = interval, burst, penalty seconds
+_PENALIZE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local penalty = tonumber(ARGV[3])
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+local floor_tat = now + penalty + interval * (burst - 1)
+if floor_tat > tat then
+    redis.call('SET', KEYS[1], tostring(floor_tat), 'PX', math.ceil((floor_tat - now) * 1000) + 1000)
+end
+return 1
+"""
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a caller cannot get a token within its timeout."""
+
+    def __init__(self, name: str, lane: str, retry_after: float):
+        super().__init__(f"Rate limit '{name}' exhausted for lane '{lane}', retry in {retry_after:.1f}s")
+        self.name = name
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class _LocalGCRA:
+    """In-process GCRA used only while Redis is unavailable."""
+
+    def __init__(self):
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, interval: float, burst: int, reserve: int, cost: int) -> Tuple[bool, float, int]:
+        with self._lock:
+            now = time.time()
+            tat = max(self._tat, now)
+            remaining = int((now - (tat - interval * burst)) // interval)
+            new_tat = tat + interval * cost
+            allow_at = new_tat - interval * (burst - reserve)
+            if cost > 0 and allow_at > now:
+                return False, allow_at - now, remaining
+            if cost > 0:
+                self._tat = new_tat
+                remaining -= cost
+            return True, 0.0, remaining
+
+    def penalize(self, interval: float, burst: int, seconds: float) -> None:
+        with self._lock:
+            self._tat = max(self._tat, time.time() + seconds + interval * (burst - 1))
+
+
+class RateLimiter:
+    """
+    Shared GCRA rate limiter with priority lanes.
+
+    ``limit`` requests are allowed in any ``window_seconds`` window: up to
+    ``burst`` immediately, then one every ``window / (limit - burst)``
+    seconds.
+    """
+
+    def __init__(self, name: str, limit: int, window_seconds: int, burst: int,
+                 lanes: Optional[Dict[str, int]] = None):
+        if burst >= limit:
+            raise ValueError("burst must be smaller than limit")
+
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.burst = burst
+        self.interval = window_seconds / float(limit - burst)
+        self.lanes = lanes or {INTERACTIVE: 0, BACKGROUND: 0}
+        self.key = f"ratelimit:{name}"
+
+        self._local = _LocalGCRA()
+        self._redis_failed = False
+        self._fallback_until = 0.0
+        # EVALSHA wrappers, registered on first use
+        self._acquire_script = None
+        self._penalize_script = None
+
+    def _reserve(self, lane: str) -> int:
+        if lane not in self.lanes:
+            raise ValueError(f"Unknown rate limit lane: {lane}")
+        return self.lanes[lane]
+
+    def _redis(self):
+        """Redis client, or None while the local fallback is cooling down."""
+        if time.monotonic() < self._fallback_until:
+            return None
+        redis = get_redis()
+        if self._acquire_script is None:
+            self._acquire_script = redis.register_script(_ACQUIRE_SCRIPT)
+            self._penalize_script = redis.register_script(_PENALIZE_SCRIPT)
+        return redis
+
+    def _redis_down(self, error: Exception) -> None:
+        self._fallback_until = time.monotonic() + REDIS_RETRY_SECONDS
+        if not self._redis_failed:
+            logger.warning(f"Rate limiter '{self.name}' falling back to local bucket: {error}")
+            self._redis_failed = True
+
+    def _call(self, lane: str, cost: int) -> Tuple[bool, float, int]:
+        reserve = self._reserve(lane)
+        try:
+            redis = self._redis()
+            if redis is not None:
+                allowed, retry_after, remaining = self._acquire_script(
+                    keys=[self.key], args=[self.interval, self.burst, reserve, cost], client=redis
+                )
+                if self._redis_failed:
+                    logger.info(f"Rate limiter '{self.name}' is using Redis again")
+                    self._redis_failed = False
+                return bool(int(allowed)), float(retry_after), max(int(remaining), 0)
+        except Exception as e:
+            self._redis_down(e)
+        allowed, retry_after, remaining = self._local.acquire(self.interval, self.burst, reserve, cost)
+        return allowed, retry_after, max(remaining, 0)
+
+    def try_acquire(self, lane: str = BACKGROUND, cost: int = 1) -> Tuple[bool, float, int]:
+        """
+        Take ``cost`` tokens if available without waiting.
+
+        Returns:
+            Tuple of (allowed, seconds until retry, tokens remaining)
+        """
+        return self._call(lane, cost)
+
+    def acquire(self, lane: str = BACKGROUND, cost: int = 1, timeout: Optional[float] = None) -> int:
+        """
+        Block until ``cost`` tokens are granted.
+
+        Args:
+            lane: Priority lane to draw from
+            cost: Number of tokens to take
+            timeout: Give up after this many seconds (None waits forever)
+
+        Returns:
+            Tokens remaining in the shared budget
+
+        Raises:
+            RateLimitExceeded: if the timeout would be exceeded
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        throttled = False
+
+        while True:
+            allowed, retry_after, remaining = self._call(lane, cost)
+            if allowed:
+                return remaining
+
+            if not throttled:
+                throttled = True
+                metrics.incr(f"ratelimit.{self.name}.throttled.{lane}")
+
+            # Small jitter so processes released together don't stampede
+            wait = retry_after + random.uniform(0, self.interval)
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(self.name, lane, retry_after)
+            time.sleep(min(wait, 5.0))
+
+    async def acquire_async(self, lane: str = BACKGROUND, cost: int = 1, timeout: Optional[float] = None) -> int:
+        """
+        asyncio variant of acquire(): waits with asyncio.sleep so the event
+        loop keeps other requests moving. The Redis round-trip runs in a
+        thread to avoid blocking the loop.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        throttled = False
+
+        while True:
+            allowed, retry_after, remaining = await asyncio.to_thread(self._call, lane, cost)
+            if allowed:
+                return remaining
+
+            if not throttled:
+                throttled = True
+                metrics.incr(f"ratelimit.{self.name}.throttled.{lane}")
+
+            wait = retry_after + random.uniform(0, self.interval)
+            if deadline is not None and loop.time() + wait > deadline:
+                raise RateLimitExceeded(self.name, lane, retry_after)
+            await asyncio.sleep(min(wait, 5.0))
+
+    def penalize(self, seconds: float) -> None:
+        """Stop all lanes for ``seconds``, e.g. after the upstream returned 429."""
+        metrics.incr(f"ratelimit.{self.name}.penalized")
+        try:
+            redis = self._redis()
+            if redis is not None:
+                self._penalize_script(keys=[self.key], args=[self.interval, self.burst, seconds], client=redis)
+                return
+        except Exception as e:
+            self._redis_down(e)
+        logger.warning(f"Rate limiter '{self.name}' penalty kept local only")
+        self._local.penalize(self.interval, self.burst, seconds)
+
+    def remaining(self) -> int:
+        """Tokens currently available to the highest-priority lane."""
+        return self._call(INTERACTIVE if INTERACTIVE in self.lanes else next(iter(self.lanes)), 0)[2]
+
+
+_companies_house_limiter: Optional[RateLimiter] = None
+
+
+def get_companies_house_limiter() -> RateLimiter:
+    """Return the process-wide limiter for the Companies House API key."""
+    global _companies_house_limiter
+    if _companies_house_limiter is None:
+        _companies_house_limiter = RateLimiter(
+            name="companies_house",
+            limit=settings.COMPANIES_HOUSE_RATE_LIMIT,
+            window_seconds=settings.COMPANIES_HOUSE_RATE_WINDOW,
+            burst=settings.COMPANIES_HOUSE_RATE_BURST,
+            lanes={
+                INTERACTIVE: 0,
+                BACKGROUND: settings.COMPANIES_HOUSE_INTERACTIVE_RESERVE,
+            },
+        )
+    return _companies_house_limiter
+
+
+metrics.register_gauge(
+    "companies_house.budget_remaining",
+    lambda: get_companies_house_limiter().remaining(),
+)
@@ -0,0 +1,43 @@
+# backend/utils/redis_client.py
+"""
+Process-wide Redis connection shared by the rate limiter, caches and metrics.
+
+The client is created lazily and re-created after a fork (gunicorn/Celery
+prefork), so a worker never reuses sockets inherited from its parent.
+"""
+
+import os
+import logging
+import threading
+from typing import Optional
+
+from redis import Redis
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[Redis] = None
+_client_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def get_redis() -> Redis:
+    """Return the Redis client for the current process."""
+    global _client, _client_pid
+
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+
+    with _lock:
+        if _client is None or _client_pid != pid:
+            _client = Redis.from_url(
+                settings.REDIS_URL,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+            _client_pid = pid
+            logger.debug(f"Redis client created for pid {pid}")
+    return _client
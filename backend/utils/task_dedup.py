@@ -0,0 +1,106 @@
+# backend/utils/task_dedup.py
+"""
+Idempotent Celery enqueueing.
+
+The profile import, the change checks, the streaming consumer and the API
+can all ask for the same company at the same moment. enqueue_once() takes
+a Redis lock keyed by (task name, company number, ...) that holds the id
+of the queued task. While that task waits in the queue, further enqueues
+are dropped and the caller gets an AsyncResult for the queued task
+instead, so it receives the same result. The lock is released as soon as
+a worker starts the task: a change reported after that point may not be
+in the data the task fetches, so it must queue a fresh run. The lock
+expires after a TTL in case the message is lost.
+
+Counters: task_dedup.enqueued / task_dedup.merged.
+"""
+
+import uuid
+import logging
+from typing import Any, Dict, Optional, Sequence
+
+from celery.result import AsyncResult
+from celery.signals import task_prerun
+
+from backend.config import settings
+from backend.utils import metrics
+from backend.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "task_dedup"
+
+# Delete the lock only if it still belongs to this task, then the reverse index
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('del', KEYS[1])
+end
+redis.call('del', KEYS[2])
+"""
+
+
+def dedup_key(task_name: str, *parts: Any) -> str:
+    """Lock key for one unit of work, e.g. (fetch_company_filings, 00000006, 1)."""
+    return f"{KEY_PREFIX}:{task_name}:" + ":".join(str(p) for p in parts)
+
+
+def _owner_key(task_id: str) -> str:
+    return f"{KEY_PREFIX}:id:{task_id}"
+
+
+def enqueue_once(task, args: Sequence = (), kwargs: Optional[Dict] = None,
+                 key_parts: Optional[Sequence] = None, ttl: Optional[int] = None,
+                 **options) -> AsyncResult:
+    """
+    Enqueue ``task`` unless the same work is already queued.
+
+    Args:
+        task: Celery task
+        args: Positional task arguments
+        kwargs: Keyword task arguments
+        key_parts: What identifies the work (default: ``args``)
+        ttl: Lock lifetime in seconds (default TASK_DEDUP_TTL)
+        **options: Passed to apply_async (countdown, queue, ...)
+
+    Returns:
+        AsyncResult of the new task, or of the queued one it merged into;
+        its ``merged`` attribute tells which
+    """
+    key = dedup_key(task.name, *(key_parts if key_parts is not None else args))
+    ttl = ttl or settings.TASK_DEDUP_TTL
+    task_id = str(uuid.uuid4())
+
+    try:
+        redis = get_redis()
+        if redis.set(key, task_id, nx=True, ex=ttl):
+            redis.set(_owner_key(task_id), key, ex=ttl)
+        else:
+            in_flight = redis.get(key)
+            if in_flight:
+                metrics.incr("task_dedup.merged")
+                logger.debug(f"{key} already queued as {in_flight}")
+                result = AsyncResult(in_flight, app=task.app)
+                result.merged = True
+                return result
+    except Exception as e:
+        # Never lose work because Redis is unavailable
+        logger.warning(f"Task dedup unavailable, enqueueing {task.name} anyway: {e}")
+
+    metrics.incr("task_dedup.enqueued")
+    result = task.apply_async(args=args, kwargs=kwargs, task_id=task_id, **options)
+    result.merged = False
+    return result
+
+
+@task_prerun.connect
+def _release_dedup_lock(task_id: str = None, **_) -> None:
+    """Free the lock when the task starts, so later requests queue a new run."""
+    if not task_id:
+        return
+    try:
+        redis = get_redis()
+        key = redis.get(_owner_key(task_id))
+        if key:
+            redis.eval(_RELEASE_SCRIPT, 2, key, _owner_key(task_id), task_id)
+    except Exception as e:
+        logger.debug(f"Dedup lock for {task_id} not released, it will expire: {e}")
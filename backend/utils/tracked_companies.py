@@ -0,0 +1,79 @@
+# backend/utils/tracked_companies.py
+"""
+Per-tenant set of the company numbers a tenant already tracks.
+
+Search results are annotated with whether each company is on the tenant's
+list. Rather than a query per result, the tenant's company numbers live in
+a Redis set (loaded with one query, kept for TRACKED_SET_TTL seconds) and a
+page is checked with a single SMISMEMBER. Endpoints that add or remove
+companies call forget_tenant() so the next lookup reloads the set; rows
+created elsewhere (imports, tasks) show up when the TTL runs out.
+
+If Redis is unavailable the page is checked with one batched query.
+"""
+
+import logging
+from typing import Iterable, Set
+
+from sqlalchemy import text
+
+from backend.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "tracked_companies"
+TRACKED_SET_TTL = 300
+
+# Member that marks a loaded set, so a tenant with no companies is cached too
+_LOADED = ""
+
+
+def _key(tenant_id) -> str:
+    return f"{KEY_PREFIX}:{tenant_id}"
+
+
+def tracked_company_numbers(session, tenant_id, numbers: Iterable[str]) -> Set[str]:
+    """
+    Which of ``numbers`` the tenant already has a company row for.
+
+    Args:
+        session: SQLAlchemy session, used only to (re)load the set
+        tenant_id: Tenant
+        numbers: Company numbers on the page
+
+    Returns:
+        Subset of ``numbers`` that are tracked
+    """
+    numbers = [n for n in dict.fromkeys(numbers) if n]
+    if not numbers:
+        return set()
+
+    key = _key(tenant_id)
+    try:
+        redis = get_redis()
+        if not redis.exists(key):
+            rows = session.execute(text(
+                "SELECT company_number FROM companies WHERE tenant_id = :tenant_id AND company_number IS NOT NULL"
+            ), {"tenant_id": tenant_id})
+            pipe = redis.pipeline()
+            pipe.delete(key)
+            pipe.sadd(key, _LOADED, *[row.company_number for row in rows])
+            pipe.expire(key, TRACKED_SET_TTL)
+            pipe.execute()
+        flags = redis.smismember(key, numbers)
+        return {n for n, member in zip(numbers, flags) if member}
+    except Exception as e:
+        logger.warning(f"Tracked company set unavailable for tenant {tenant_id}, querying: {e}")
+
+    rows = session.execute(text(
+        "SELECT company_number FROM companies WHERE tenant_id = :tenant_id AND company_number = ANY(:numbers)"
+    ), {"tenant_id": tenant_id, "numbers": numbers})
+    return {row.company_number for row in rows}
+
+
+def forget_tenant(tenant_id) -> None:
+    """Drop the cached set after the tenant's companies change."""
+    try:
+        get_redis().delete(_key(tenant_id))
+    except Exception as e:
+        logger.debug(f"Tracked company set for tenant {tenant_id} not cleared, it will expire: {e}")
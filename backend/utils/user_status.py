@@ -0,0 +1,100 @@
+# backend/utils/user_status.py
+"""
+Per-process cache of authenticated users' status for require_tenant.
+
+Access tokens carry the user's tenant_id and token_version as claims, so
+an authenticated request only needs to know whether the user is still
+active and which token version is current. That pair is cached per
+process for USER_STATUS_TTL seconds. When a user is deactivated or
+changes password, publish_user_change() announces it on a Redis channel
+and every process drops its entry at once. The TTL bounds staleness if a
+message is missed.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from redis import Redis
+
+from backend.config import settings
+from backend.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "auth:user_changed"
+USER_STATUS_TTL = 30
+
+# user_id -> (is_active, token_version, tenant_id, expires_at)
+_cache: Dict[str, Tuple[bool, int, Optional[str], float]] = {}
+_listener_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _listen() -> None:
+    """Drop cache entries for users announced on CHANNEL; reconnects on errors."""
+    while True:
+        try:
+            # Own connection: the shared client's socket timeout would end listen()
+            client = Redis.from_url(settings.REDIS_URL, decode_responses=True,
+                                    socket_connect_timeout=2, health_check_interval=30)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANNEL)
+            # A message may have been missed while disconnected
+            _cache.clear()
+            for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _cache.pop(message["data"], None)
+        except Exception as e:
+            logger.warning(f"User change listener disconnected, retrying: {e}")
+            time.sleep(5)
+
+
+def _ensure_listener() -> None:
+    """Start the invalidation listener once per process (again after a fork)."""
+    global _listener_pid
+
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+    with _lock:
+        if _listener_pid != pid:
+            _cache.clear()
+            threading.Thread(target=_listen, name="user-status-listener", daemon=True).start()
+            _listener_pid = pid
+
+
+def user_status(user_id: str, load: Callable[[str], Optional[Tuple[bool, int, Optional[str]]]]
+                ) -> Optional[Tuple[bool, int, Optional[str]]]:
+    """
+    (is_active, token_version, tenant_id) for a user, from the cache or ``load``.
+
+    Args:
+        user_id: JWT identity
+        load: Reads the user from the database; returns None if missing
+
+    Returns:
+        The status, or None for an unknown user (not cached)
+    """
+    _ensure_listener()
+    user_id = str(user_id)
+    entry = _cache.get(user_id)
+    if entry and entry[3] > time.monotonic():
+        return entry[:3]
+
+    status = load(user_id)
+    if status is not None:
+        _cache[user_id] = (*status, time.monotonic() + USER_STATUS_TTL)
+    return status
+
+
+def publish_user_change(user_id) -> None:
+    """Tell every process to forget a user's cached status (call after commit)."""
+    user_id = str(user_id)
+    _cache.pop(user_id, None)
+    try:
+        get_redis().publish(CHANNEL, user_id)
+    except Exception as e:
+        logger.error(f"Could not publish change for user {user_id}; other processes see it within {USER_STATUS_TTL}s: {e}")
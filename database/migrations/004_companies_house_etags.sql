@@ -0,0 +1,9 @@
+-- database/migrations/004_companies_house_etags.sql
+-- Conditional (If-None-Match) refreshes of Companies House resources
+
+-- companies_house_etag (002) holds the profile ETag; officers and filing
+-- history each get their own, written by the task that persists them
+ALTER TABLE companies
+ADD COLUMN IF NOT EXISTS companies_house_officers_etag VARCHAR(255),
+ADD COLUMN IF NOT EXISTS companies_house_filings_etag VARCHAR(255),
+ADD COLUMN IF NOT EXISTS accounts_next_due DATE;
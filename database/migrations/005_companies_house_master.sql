@@ -0,0 +1,36 @@
+-- database/migrations/005_companies_house_master.sql
+-- Register-wide company master data, bulk-loaded from the monthly
+-- "Basic Company Data" snapshot (scripts/initial_data_load.py)
+
+CREATE TABLE IF NOT EXISTS companies_house_companies (
+    company_number VARCHAR(10) PRIMARY KEY,
+    company_name VARCHAR(500) NOT NULL,
+    company_status VARCHAR(50),
+    company_status_detail VARCHAR(100),
+    company_type VARCHAR(100),
+    country_of_origin VARCHAR(100),
+    date_of_creation DATE,
+    date_of_cessation DATE,
+    address_line_1 VARCHAR(255),
+    address_line_2 VARCHAR(255),
+    locality VARCHAR(100),
+    region VARCHAR(100),
+    country VARCHAR(100),
+    postal_code VARCHAR(20),
+    sic_codes TEXT[],
+    accounts_next_due DATE,
+    accounts_last_made_up_to DATE,
+    accounts_category VARCHAR(100),
+    confirmation_statement_next_due DATE,
+    confirmation_statement_last_made_up_to DATE,
+    mortgage_charges INTEGER,
+    mortgages_outstanding INTEGER,
+    snapshot_date DATE,
+    -- md5 of the loaded fields; unchanged rows are skipped on reload
+    row_hash CHAR(32),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ch_companies_status ON companies_house_companies(company_status);
+CREATE INDEX IF NOT EXISTS idx_ch_companies_postcode ON companies_house_companies(postal_code);
+CREATE INDEX IF NOT EXISTS idx_ch_companies_accounts_due ON companies_house_companies(accounts_next_due);
@@ -0,0 +1,12 @@
+-- database/migrations/006_company_pscs_unique.sql
+-- Key PSCs by their Companies House identifier so fetch_company_pscs can
+-- upsert a whole company in one INSERT ... ON CONFLICT statement
+
+DELETE FROM company_pscs a
+USING company_pscs b
+WHERE a.company_id = b.company_id
+  AND a.psc_id = b.psc_id
+  AND a.created_at < b.created_at;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_company_pscs_company_psc
+ON company_pscs(company_id, psc_id);
@@ -0,0 +1,18 @@
+-- database/migrations/007_company_officers_unique.sql
+-- Key officers by appointment so fetch_company_officers can diff and
+-- upsert a company's officers in one statement
+
+-- Earlier syncs stored the last segment of links.officer.appointments,
+-- which is always "appointments"; recover the appointment id from links.self
+UPDATE company_officers
+SET officer_id = split_part(raw_data->'links'->>'self', '/', 5)
+WHERE raw_data->'links'->>'self' LIKE '/company/%/appointments/%';
+
+DELETE FROM company_officers a
+USING company_officers b
+WHERE a.company_id = b.company_id
+  AND a.officer_id = b.officer_id
+  AND (a.last_updated, a.id::text) < (b.last_updated, b.id::text);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_company_officers_company_officer
+ON company_officers(company_id, officer_id);
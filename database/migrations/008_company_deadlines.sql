@@ -0,0 +1,12 @@
+-- database/migrations/008_company_deadlines.sql
+-- Statutory deadlines used by the deadline-aware monitoring schedule
+
+-- accounts_next_due was added in 004; the confirmation statement due date
+-- is written alongside it from the company profile
+ALTER TABLE companies
+ADD COLUMN IF NOT EXISTS confirmation_statement_next_due DATE;
+
+UPDATE companies
+SET confirmation_statement_next_due = (raw_data->'confirmation_statement'->>'next_due')::date
+WHERE confirmation_statement_next_due IS NULL
+  AND raw_data->'confirmation_statement'->>'next_due' ~ '^\d{4}-\d{2}-\d{2}$';
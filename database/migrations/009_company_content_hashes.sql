@@ -0,0 +1,7 @@
+-- database/migrations/009_company_content_hashes.sql
+-- Per-endpoint sha256 of the last stored Companies House payload
+-- ({"profile": ..., "filings": ..., "officers": ..., "charges": ..., "pscs": ...}),
+-- so refreshes that carry the same data skip the write entirely
+
+ALTER TABLE companies
+ADD COLUMN IF NOT EXISTS content_hashes JSONB NOT NULL DEFAULT '{}'::jsonb;
@@ -0,0 +1,20 @@
+-- database/migrations/010_company_name_search.sql
+-- Local company name search over the bulk snapshot (see
+-- backend/services/company_service.py), so typeahead searches do not spend
+-- Companies House API calls
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Former names from the snapshot's PreviousName_N.CompanyName columns,
+-- most recent first, separated by "; "; filled on the next snapshot load
+ALTER TABLE companies_house_companies
+ADD COLUMN IF NOT EXISTS previous_names TEXT;
+
+-- GiST rather than GIN: ordering by word distance (<<->) can walk the index
+-- and stop after the first page of results
+CREATE INDEX IF NOT EXISTS idx_ch_companies_name_trgm
+ON companies_house_companies USING gist (company_name gist_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_ch_companies_previous_names_trgm
+ON companies_house_companies USING gist (previous_names gist_trgm_ops)
+WHERE previous_names IS NOT NULL;
@@ -0,0 +1,6 @@
+-- database/migrations/011_user_token_version.sql
+-- Access tokens carry the user's token_version; changing the password bumps
+-- it, which revokes every token issued before the change
+
+ALTER TABLE users
+ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
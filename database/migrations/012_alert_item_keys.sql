@@ -0,0 +1,7 @@
+-- database/migrations/012_alert_item_keys.sql
+-- Fingerprints of the items (filings, officers, ...) each pipeline alert
+-- reported, so the alert pipeline only suppresses items it has already
+-- alerted on within ALERT_DEDUP_WINDOW_SECONDS and still reports new ones
+
+ALTER TABLE alerts
+ADD COLUMN IF NOT EXISTS item_keys TEXT[];
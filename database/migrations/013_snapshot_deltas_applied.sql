@@ -0,0 +1,13 @@
+-- database/migrations/013_snapshot_deltas_applied.sql
+-- Snapshot change sets applied by process_snapshot_delta. The row is
+-- inserted in the same transaction as the change logs, so a change set
+-- is logged exactly once; alerts_published_at is set once every alert
+-- has been published, and a run that crashed before that only republishes
+
+CREATE TABLE IF NOT EXISTS snapshot_deltas_applied (
+    change_set VARCHAR(255) PRIMARY KEY,
+    old_snapshot DATE NOT NULL,
+    new_snapshot DATE NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    alerts_published_at TIMESTAMP
+);
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Offline backtest of monitoring polling policies against stored changes.
+
+Replays the changes recorded in company_change_logs over a period and
+simulates when each policy would have polled every monitored company.
+For every change, detection latency is the time from the change to the
+first poll at or after it; cost is the number of polls times the API
+requests one poll spends. Nothing calls Companies House.
+
+Compared policies:
+    fixed-<N>h   poll every N hours (fixed-24h is the old daily sweep)
+    deadline     backend.utils.polling_policy with each company's monitoring
+                 config interval, as used by the scheduler
+
+Change logs record when a change was *detected*, so latencies are
+relative to the polling that produced the log, not to the filing itself.
+Only current deadlines are stored; earlier ones are taken as the yearly
+anniversaries of those dates, which holds for accounts and confirmation
+statements filed on time.
+
+    python scripts/backtest_polling_policy.py                    # last 180 days
+    python scripts/backtest_polling_policy.py --days 365 --fixed-hours 6,24,168
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import bisect
+import logging
+import random
+import statistics
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+
+from backend.utils.polling_policy import polling_interval_hours
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+# Profile, filings and officers per poll (charges and PSCs are opt-in)
+DEFAULT_REQUESTS_PER_POLL = 3
+
+# Change logs closer together than this are one change seen by several tenants
+EVENT_MERGE_WINDOW = timedelta(hours=1)
+
+
+def load_companies(engine, start: datetime, end: datetime) -> Dict[str, Dict]:
+    """
+    Monitored companies (one entry per company number, as the shared sweep
+    fetches them) with their config interval, deadlines and the changes
+    logged in the period. Companies are read with the scheduler's own
+    MONITORED_TARGETS_SQL, so both see the same configs and deadlines.
+    """
+    # Imported here: the tasks module builds its engine from DATABASE_URL
+    from backend.tasks.companies_house_ingestion import MONITORED_TARGETS_SQL
+
+    companies: Dict[str, Dict] = {}
+    with engine.connect() as conn:
+        rows = conn.execute(text(MONITORED_TARGETS_SQL.format(filter="")))
+        for row in rows:
+            companies[row.company_number] = {
+                "config_hours": row.config_interval_hours,
+                "deadlines": [d for d in (row.accounts_next_due, row.confirmation_next_due) if d],
+                "events": [],
+            }
+
+        rows = conn.execute(text("""
+            SELECT c.company_number, l.detected_at
+            FROM company_change_logs l
+            JOIN companies c ON c.id = l.company_id
+            WHERE l.detected_at >= :start AND l.detected_at < :end
+            ORDER BY c.company_number, l.detected_at
+        """), {"start": start, "end": end})
+        for row in rows:
+            company = companies.get(row.company_number)
+            if company is None:
+                continue
+            detected_at = row.detected_at.replace(tzinfo=None)
+            events = company["events"]
+            if not events or detected_at - events[-1] > EVENT_MERGE_WINDOW:
+                events.append(detected_at)
+    return companies
+
+
+def anniversaries(due: date, start: datetime, end: datetime) -> List[date]:
+    """Yearly repeats of a due date that fall within (or near) the period."""
+    dates = []
+    for year in range(start.year - 1, end.year + 2):
+        try:
+            dates.append(due.replace(year=year))
+        except ValueError:
+            # 29 February
+            dates.append(due.replace(year=year, day=28))
+    return dates
+
+
+def simulate_polls(interval_hours: Callable[[datetime], int], start: datetime, end: datetime,
+                   rng: random.Random) -> List[datetime]:
+    """Poll times from a random phase within the first interval until ``end``."""
+    polls = []
+    t = start + timedelta(hours=rng.uniform(0, interval_hours(start)))
+    while t < end:
+        polls.append(t)
+        t += timedelta(hours=interval_hours(t))
+    return polls
+
+
+def evaluate(name: str, companies: Dict[str, Dict], policy: Callable[[Dict, datetime], int],
+             start: datetime, end: datetime, requests_per_poll: int, seed: int) -> Dict:
+    """Simulate one policy over every company and summarise cost and latency."""
+    rng = random.Random(seed)
+    polls_total = 0
+    latencies: List[float] = []
+    missed = 0
+
+    for number in sorted(companies):
+        company = companies[number]
+        polls = simulate_polls(lambda t: policy(company, t), start, end, rng)
+        polls_total += len(polls)
+        for event in company["events"]:
+            i = bisect.bisect_left(polls, event)
+            if i == len(polls):
+                missed += 1
+            else:
+                latencies.append((polls[i] - event).total_seconds() / 3600)
+
+    latencies.sort()
+    return {
+        "policy": name,
+        "polls": polls_total,
+        "api_calls": polls_total * requests_per_poll,
+        "detected": len(latencies),
+        "missed": missed,
+        "mean_h": statistics.fmean(latencies) if latencies else None,
+        "median_h": statistics.median(latencies) if latencies else None,
+        "p90_h": latencies[int(0.9 * (len(latencies) - 1))] if latencies else None,
+    }
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backtest monitoring polling policies on company_change_logs")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="Postgres URL (default: $DATABASE_URL)")
+    parser.add_argument("--days", type=int, default=180, help="Length of the replayed period")
+    parser.add_argument("--end", default=None, help="End of the period, YYYY-MM-DD (default: today)")
+    parser.add_argument("--fixed-hours", default="24,168",
+                        help="Comma-separated fixed intervals to compare against")
+    parser.add_argument("--requests-per-poll", type=int, default=DEFAULT_REQUESTS_PER_POLL,
+                        help="API requests one poll of a company costs")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random poll phases")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        logger.error("DATABASE_URL is not set")
+        return 1
+    os.environ.setdefault("DATABASE_URL", args.database_url)
+
+    end = datetime.fromisoformat(args.end) if args.end else datetime.combine(date.today(), datetime.min.time())
+    start = end - timedelta(days=args.days)
+
+    companies = load_companies(create_engine(args.database_url), start, end)
+    events = sum(len(c["events"]) for c in companies.values())
+    logger.info(f"Replaying {events:,} changes for {len(companies):,} companies, {start:%Y-%m-%d} to {end:%Y-%m-%d}")
+    for company in companies.values():
+        company["deadlines"] = [d for due in company["deadlines"] for d in anniversaries(due, start, end)]
+
+    policies = {
+        f"fixed-{hours}h": (lambda hours: lambda company, t: hours)(int(hours))
+        for hours in args.fixed_hours.split(",") if hours.strip()
+    }
+    policies["deadline"] = lambda company, t: polling_interval_hours(company["config_hours"], company["deadlines"], t)
+
+    results = [
+        evaluate(name, companies, policy, start, end, args.requests_per_poll, args.seed)
+        for name, policy in policies.items()
+    ]
+
+    print(f"{'policy':<12} {'api calls':>12} {'detected':>9} {'missed':>7} "
+          f"{'mean h':>8} {'median h':>9} {'p90 h':>8}")
+    for r in results:
+        print(f"{r['policy']:<12} {r['api_calls']:>12,} {r['detected']:>9,} {r['missed']:>7,} "
+              f"{_fmt(r['mean_h']):>8} {_fmt(r['median_h']):>9} {_fmt(r['p90_h']):>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Build the company autocomplete prefix index (backend/utils/prefix_index.py)
+from companies_house_companies.
+
+Postgres does the sorting (bytewise, COLLATE "C") and rows are streamed
+through a server-side cursor, so memory stays flat however large the
+register is. Run after each snapshot load; web workers pick up the new
+file within a minute.
+
+    python scripts/build_prefix_index.py
+    python scripts/build_prefix_index.py --output /tmp/company_prefix_index.bin
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+import time
+
+import psycopg
+
+from backend.config import settings
+from backend.data_sources.companies_house_bulk import psycopg_dsn
+from backend.utils.prefix_index import write_prefix_index
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+# One key per name, per name without a leading "THE ", and per number
+ENTRIES_SQL = r"""
+WITH names AS (
+    SELECT upper(regexp_replace(btrim(company_name), '\s+', ' ', 'g')) AS name,
+           company_number, company_status
+    FROM companies_house_companies
+    WHERE btrim(company_name) <> ''
+)
+SELECT key, company_number, company_status, name FROM (
+    SELECT name AS key, company_number, company_status, name FROM names
+    UNION ALL
+    SELECT substr(name, 5), company_number, company_status, name FROM names WHERE name LIKE 'THE %'
+    UNION ALL
+    SELECT company_number, company_number, company_status, name FROM names
+) entries
+ORDER BY key COLLATE "C"
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the company autocomplete prefix index")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="Postgres URL (default: $DATABASE_URL)")
+    parser.add_argument("--output", default=settings.COMPANY_PREFIX_INDEX_PATH,
+                        help="Index file (default: COMPANY_PREFIX_INDEX_PATH)")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        logger.error("DATABASE_URL is not set")
+        return 1
+
+    started = time.monotonic()
+    with psycopg.connect(psycopg_dsn(args.database_url)) as conn:
+        with conn.cursor(name="prefix_index") as cur:
+            cur.itersize = 50000
+            cur.execute(ENTRIES_SQL)
+            count = write_prefix_index(args.output, cur)
+
+    size = os.path.getsize(args.output)
+    logger.info(f"Wrote {count:,} keys to {args.output} ({size / 1e6:,.0f} MB) "
+                f"in {time.monotonic() - started:.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Bulk-load the Companies House "Basic Company Data" snapshot into Postgres.
+
+Streams the BasicCompanyData CSV/ZIP parts of the newest snapshot found
+in data/raw (without unpacking or reading them into memory), normalises rows in batches and loads
+each batch with COPY into an unlogged staging table followed by a single
+merge into companies_house_companies.
+
+Progress is checkpointed after every committed batch, so an interrupted
+run resumes where it stopped:
+
+    python scripts/initial_data_load.py                    # newest snapshot in data/raw
+    python scripts/initial_data_load.py --source /path/BasicCompanyData-2024-03-01-part1_7.zip
+    python scripts/initial_data_load.py --restart          # ignore the checkpoint
+
+Keep the previous month's parts in data/raw: the daily
+process_snapshot_delta beat task diffs the two newest snapshots there and
+alerts on changes to monitored companies.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import logging
+import time
+from itertools import islice
+
+import psycopg
+
+from backend.data_sources.companies_house_bulk import (
+    SnapshotFile, ensure_staging_table, find_snapshot_files, iter_snapshot_rows,
+    load_batch, normalize_batch, psycopg_dsn
+)
+from backend.data_sources.companies_house_delta import group_snapshots
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCE = os.path.join(PROJECT_ROOT, "data", "raw")
+DEFAULT_CHECKPOINT = os.path.join(PROJECT_ROOT, "data", "processed", "initial_data_load.checkpoint.json")
+DEFAULT_BATCH_SIZE = 50000
+
+
+def load_checkpoint(path: str) -> dict:
+    """Return the saved progress ({"files": {name: {"rows", "done"}}})."""
+    if not os.path.exists(path):
+        return {"files": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    """Write the checkpoint atomically so a crash never leaves it half-written."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_file(conn, snapshot: SnapshotFile, checkpoint: dict, checkpoint_path: str, batch_size: int) -> int:
+    """
+    Stream one snapshot part into the master table.
+
+    Returns:
+        Number of rows read from the file in this run
+    """
+    state = checkpoint["files"].setdefault(snapshot.name, {"rows": 0, "done": False})
+    if state["done"]:
+        logger.info(f"{snapshot.name}: already loaded, skipping")
+        return 0
+
+    snapshot_date = snapshot.snapshot_date.isoformat() if snapshot.snapshot_date else None
+    text, raw, size = snapshot.open()
+    started = time.monotonic()
+    read = 0
+
+    try:
+        rows = iter_snapshot_rows(text)
+        if state["rows"]:
+            logger.info(f"{snapshot.name}: resuming after row {state['rows']:,}")
+            for _ in islice(rows, state["rows"]):
+                pass
+
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+
+            merged = load_batch(conn, normalize_batch(batch, snapshot_date))
+            read += len(batch)
+            state["rows"] += len(batch)
+            save_checkpoint(checkpoint_path, checkpoint)
+
+            elapsed = max(time.monotonic() - started, 1e-6)
+            pct = 100.0 * raw.tell() / size if size else 0.0
+            logger.info(
+                f"{snapshot.name}: {state['rows']:,} rows ({pct:.0f}%), "
+                f"{merged:,} new/changed in last batch, {read / elapsed:,.0f} rows/s"
+            )
+    finally:
+        text.close()
+
+    state["done"] = True
+    save_checkpoint(checkpoint_path, checkpoint)
+    logger.info(f"{snapshot.name}: finished, {state['rows']:,} rows")
+    return read
+
+
+def newest_snapshot_files(source: str) -> list:
+    """
+    Parts to load from ``source``.
+
+    A directory also holds the previous month's parts for the snapshot
+    delta, so only its newest snapshot is loaded; a file or glob loads
+    exactly what it matches.
+    """
+    if not os.path.isdir(source):
+        return find_snapshot_files(source)
+    snapshots = group_snapshots(source)
+    if not snapshots:
+        # No dated parts: load whatever is there
+        return find_snapshot_files(source)
+    newest = max(snapshots)
+    if len(snapshots) > 1:
+        logger.info(f"Loading the {newest} snapshot; older snapshots in {source} are left for the delta")
+    return snapshots[newest]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load the Companies House Basic Company Data snapshot")
+    parser.add_argument("--source", default=DEFAULT_SOURCE,
+                        help="Snapshot file or glob, or a directory to load its newest snapshot from "
+                             "(default: data/raw)")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="Postgres URL (default: $DATABASE_URL)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Rows per COPY + merge transaction")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT,
+                        help="Checkpoint file used to resume interrupted runs")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore any existing checkpoint and load everything")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        logger.error("DATABASE_URL is not set")
+        return 1
+
+    files = newest_snapshot_files(args.source)
+    if not files:
+        logger.error(f"No BasicCompanyData files found in {args.source}")
+        return 1
+
+    checkpoint = {"files": {}} if args.restart else load_checkpoint(args.checkpoint)
+    started = time.monotonic()
+    total = 0
+
+    with psycopg.connect(psycopg_dsn(args.database_url)) as conn:
+        ensure_staging_table(conn)
+        for snapshot in files:
+            total += load_file(conn, snapshot, checkpoint, args.checkpoint, args.batch_size)
+
+    elapsed = time.monotonic() - started
+    logger.info(f"Loaded {total:,} rows from {len(files)} file(s) in {elapsed / 60:.1f} min")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
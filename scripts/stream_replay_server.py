@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Local replay server for the Companies House Streaming API.
+
+Serves recorded events (one JSON-lines file per stream, e.g.
+recordings/filings.jsonl) with the same wire format as
+stream.companieshouse.gov.uk: newline-delimited JSON, blank heartbeat
+lines, ``?timepoint=`` resume and 416 for an unknown timepoint. Use it to
+exercise the consumer without a streaming key or network access:
+
+    python scripts/stream_replay_server.py --recordings data/raw/stream --port 8765
+    COMPANIES_HOUSE_STREAM_URL=http://localhost:8765 COMPANIES_HOUSE_STREAM_API_KEY=test \\
+        python scripts/run_stream_consumer.py
+
+Recordings can be captured from the live service with
+    curl -u KEY: https://stream.companieshouse.gov.uk/filings > filings.jsonl
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def load_recording(path: str) -> list:
+    """Load recorded events, ordered by timepoint."""
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                event = json.loads(line)
+                events.append(((event.get("event") or {}).get("timepoint", 0), line))
+    return sorted(events, key=lambda e: e[0])
+
+
+def make_handler(recordings: dict, interval: float, heartbeat_every: int, loop: bool):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            stream = url.path.strip("/")
+            if not self.headers.get("Authorization"):
+                self.send_error(401)
+                return
+            events = recordings.get(stream)
+            if events is None:
+                self.send_error(404)
+                return
+
+            timepoint = parse_qs(url.query).get("timepoint", [None])[0]
+            start = 0
+            if timepoint is not None:
+                timepoint = int(timepoint)
+                if events and not events[0][0] <= timepoint <= events[-1][0] + 1:
+                    self.send_error(416)
+                    return
+                start = next((i for i, (tp, _) in enumerate(events) if tp >= timepoint), len(events))
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            logger.info(f"{stream}: replaying from index {start} of {len(events)}")
+
+            try:
+                sent = 0
+                while True:
+                    for _, line in events[start:]:
+                        self._chunk(line + "\n")
+                        sent += 1
+                        if heartbeat_every and sent % heartbeat_every == 0:
+                            self._chunk("\n")
+                        time.sleep(interval)
+                    if not loop:
+                        break
+                    start = 0
+                # Keep the connection open with heartbeats, like the real service
+                while True:
+                    self._chunk("\n")
+                    time.sleep(max(interval, 1.0) * 10)
+            except (BrokenPipeError, ConnectionResetError):
+                logger.info(f"{stream}: client disconnected")
+
+        def _chunk(self, data: str):
+            payload = data.encode("utf-8")
+            self.wfile.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, fmt, *args):
+            logger.debug(fmt % args)
+
+    return ReplayHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Companies House stream events")
+    parser.add_argument("--recordings", required=True,
+                        help="Directory of <stream path>.jsonl files (companies, filings, officers, ...)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between events")
+    parser.add_argument("--heartbeat-every", type=int, default=20, help="Blank line after every N events")
+    parser.add_argument("--loop", action="store_true", help="Replay the recordings forever")
+    args = parser.parse_args()
+
+    recordings = {}
+    for name in os.listdir(args.recordings):
+        if name.endswith(".jsonl"):
+            recordings[name[:-len(".jsonl")]] = load_recording(os.path.join(args.recordings, name))
+    logger.info(f"Loaded streams: {', '.join(f'{k} ({len(v)})' for k, v in recordings.items())}")
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(
+        recordings, args.interval, args.heartbeat_every, args.loop
+    ))
+    logger.info(f"Replay server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# tests/unit/test_bulk_import.py
+"""
+Bulk import input normalisation and chunk release.
+
+Redis is fakeredis; task enqueueing and the Celery result backend are
+replaced by recorders.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+import fakeredis
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# The ingestion tasks create their engine at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from backend.tasks import companies_house_ingestion as ingestion
+from backend.tasks.companies_house_ingestion import normalize_company_number, release_bulk_import_chunk
+from backend.utils import metrics
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("00000006", "00000006"),
+    ("6", "00000006"),
+    (445790, "00445790"),
+    ("SC123456", "SC123456"),
+    ("SC1234", "SC001234"),
+    ("NI5", "NI000005"),
+    ("OC301540", "OC301540"),
+    ("oc301540", "OC301540"),
+    ("  sc 12 34 56\t", "SC123456"),
+    (" 0044 5790 ", "00445790"),
+])
+def test_normalize_company_number(value, expected):
+    assert normalize_company_number(value) == expected
+
+
+@pytest.mark.parametrize("value", [
+    None, "", "   ", "123456789", "SC1234567", "S12345", "AB-12345", "00000006;",
+])
+def test_normalize_company_number_rejects_invalid(value):
+    assert normalize_company_number(value) is None
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(ingestion, "get_redis", lambda: fake)
+    monkeypatch.setattr(metrics, "get_redis", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def tasks(monkeypatch):
+    """Records enqueue_once calls, the next-chunk schedule and stored states."""
+    recorded = SimpleNamespace(queued=[], scheduled=[], states=[], in_flight=set())
+
+    def enqueue_once(task, args, kwargs=None):
+        recorded.queued.append((task.name.rsplit(".", 1)[-1], args, kwargs))
+        return SimpleNamespace(merged=args[0] in recorded.in_flight)
+
+    monkeypatch.setattr(ingestion, "enqueue_once", enqueue_once)
+    monkeypatch.setattr(release_bulk_import_chunk, "apply_async",
+                        lambda args, countdown: recorded.scheduled.append((args, countdown)))
+    monkeypatch.setattr(ingestion, "_store_bulk_import_state",
+                        lambda import_id, state, meta: recorded.states.append((state, meta)))
+    return recorded
+
+
+def start_import(redis, numbers, import_id="imp"):
+    redis.hset(f"bulk_import:{import_id}", mapping={"total": len(numbers)})
+    redis.rpush(f"bulk_import:{import_id}:queue", *numbers)
+
+
+def test_release_routes_chunk_through_enqueue_once(redis, tasks, monkeypatch):
+    monkeypatch.setattr(ingestion, "BULK_IMPORT_CHUNK_SIZE", 2)
+    start_import(redis, ["00000001", "00000002", "00000003"])
+
+    release_bulk_import_chunk("imp", 7, 0)
+
+    assert tasks.queued == [
+        ("fetch_company_profile", ("00000001", 7), {"import_id": "imp"}),
+        ("fetch_company_profile", ("00000002", 7), {"import_id": "imp"}),
+    ]
+    # The rest waits for the next release
+    assert [args for args, _ in tasks.scheduled] == [("imp", 7, 1)]
+    assert redis.lrange("bulk_import:imp:queue", 0, -1) == ["00000003"]
+
+
+def test_release_is_claimed_once_per_sequence(redis, tasks):
+    start_import(redis, ["00000001"])
+
+    release_bulk_import_chunk("imp", 7, 0)
+    release_bulk_import_chunk("imp", 7, 0)
+
+    assert len(tasks.queued) == 1
+    # Last chunk: nothing left to schedule
+    assert tasks.scheduled == []
+
+
+def test_merged_fetch_counts_towards_progress(redis, tasks):
+    start_import(redis, ["00000001", "00000002"])
+    tasks.in_flight.add("00000002")
+
+    release_bulk_import_chunk("imp", 7, 0)
+
+    # Queued elsewhere without this import's id, so it is counted now
+    assert redis.smembers("bulk_import:imp:done") == {"00000002"}
+    assert redis.hget("bulk_import:imp", "merged") == "1"
+    assert tasks.states[-1] == ("PROGRESS", {"current": 1, "total": 2})
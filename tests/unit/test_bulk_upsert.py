@@ -0,0 +1,217 @@
+# tests/unit/test_bulk_upsert.py
+"""
+Generated statements and parameters of the set-based child-row writes:
+upsert_rows (filings, charges, PSCs) and the officer-diff statement.
+
+The session is a recorder, so these tests pin the SQL shape and the JSON
+batch sent to Postgres rather than executing it.
+"""
+
+import os
+import sys
+import json
+import re
+from datetime import date
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# The ingestion tasks create their engine at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from backend.tasks import companies_house_ingestion as ingestion
+from backend.utils import bulk_upsert
+from backend.utils.bulk_upsert import upsert_rows
+
+COMPANY_ID = "7d6f0b1e-0000-4000-8000-000000000001"
+FIXED = {"company_id": COMPANY_ID, "tenant_id": 1}
+
+
+class RecordingSession:
+    """Records (sql, params) per execute and answers with canned rows."""
+
+    def __init__(self, results=()):
+        self.calls = []
+        self.results = list(results)
+
+    def execute(self, statement, params=None):
+        self.calls.append((" ".join(str(statement).split()), dict(params or {})))
+        return self.results.pop(0) if self.results else []
+
+
+def row(**mapping):
+    return SimpleNamespace(_mapping=mapping, **mapping)
+
+
+def sent_rows(call):
+    return json.loads(call[1]["rows"])
+
+
+def filing(transaction_id, **extra):
+    return dict({"transaction_id": transaction_id, "type": "AA", "date": "2026-01-31"}, **extra)
+
+
+COLUMNS = [("transaction_id", "varchar"), ("type", "varchar"), ("date", "date"), ("raw_data", "jsonb")]
+
+
+def test_empty_batch_sends_nothing():
+    session = RecordingSession()
+
+    assert upsert_rows(session, "company_filings", COLUMNS, [], conflict=("company_id", "transaction_id"),
+                       fixed=FIXED) == []
+    # Rows without a key value count as empty too
+    assert upsert_rows(session, "company_filings", COLUMNS, [{"type": "AA"}],
+                       conflict=("company_id", "transaction_id"), fixed=FIXED) == []
+    assert session.calls == []
+
+
+def test_single_row_statement_and_params():
+    session = RecordingSession([[row(transaction_id="t1", type="AA", inserted=True)]])
+
+    result = upsert_rows(session, "company_filings", COLUMNS,
+                         [filing("t1", raw_data={"links": {"self": "/x"}})],
+                         conflict=("company_id", "transaction_id"), fixed=FIXED,
+                         returning=("transaction_id", "type"))
+
+    assert result == [{"transaction_id": "t1", "type": "AA", "inserted": True}]
+    (sql, params), = session.calls
+    assert "INSERT INTO company_filings (company_id, tenant_id, transaction_id, type, date, raw_data)" in sql
+    assert ("SELECT CAST(:fixed_company_id AS uuid), CAST(:fixed_tenant_id AS integer), "
+            "r.transaction_id, r.type, r.date, r.raw_data") in sql
+    assert ("FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS "
+            "r(transaction_id varchar, type varchar, date date, raw_data jsonb)") in sql
+    assert "ON CONFLICT (company_id, transaction_id) DO NOTHING" in sql
+    assert sql.endswith("RETURNING transaction_id, type, (xmax = 0) AS inserted")
+    assert params["fixed_company_id"] == COMPANY_ID and params["fixed_tenant_id"] == 1
+    # Only the declared columns are sent, nested values stay JSON
+    assert sent_rows(session.calls[0]) == [
+        {"transaction_id": "t1", "type": "AA", "date": "2026-01-31", "raw_data": {"links": {"self": "/x"}}}
+    ]
+
+
+def test_duplicate_keys_keep_the_last_row():
+    session = RecordingSession()
+
+    upsert_rows(session, "company_filings", COLUMNS,
+                [filing("t1", type="AA"), filing("t2"), filing("t1", type="CS01")],
+                conflict=("company_id", "transaction_id"), fixed=FIXED)
+
+    # One row per key: Postgres rejects a batch that hits the same row twice
+    assert [(r["transaction_id"], r["type"]) for r in sent_rows(session.calls[0])] == [("t1", "CS01"), ("t2", "AA")]
+
+
+def test_update_only_rewrites_changed_rows():
+    session = RecordingSession()
+
+    upsert_rows(session, "company_charges", [("charge_number", "varchar"), ("status", "varchar")],
+                [{"charge_number": "1", "status": "satisfied"}],
+                conflict=("company_id", "charge_number"), fixed=FIXED, update=("status",))
+
+    sql = session.calls[0][0]
+    assert ("ON CONFLICT (company_id, charge_number) DO UPDATE SET status = EXCLUDED.status "
+            "WHERE company_charges.status IS DISTINCT FROM EXCLUDED.status") in sql
+    assert "RETURNING charge_number, status, (xmax = 0) AS inserted" in sql
+
+
+def test_large_batches_are_split(monkeypatch):
+    monkeypatch.setattr(bulk_upsert, "BATCH_SIZE", 2)
+    session = RecordingSession()
+
+    upsert_rows(session, "company_filings", COLUMNS, [filing(f"t{i}", date=date(2026, 1, i)) for i in range(1, 6)],
+                conflict=("company_id", "transaction_id"), fixed=FIXED)
+
+    assert [len(sent_rows(call)) for call in session.calls] == [2, 2, 1]
+    # The statement is the same for every chunk
+    assert len({call[0] for call in session.calls}) == 1
+    assert sent_rows(session.calls[2])[0]["date"] == "2026-01-05"
+
+
+def test_store_charges_keys_on_charge_number():
+    session = RecordingSession()
+
+    ingestion._store_charges(session, COMPANY_ID, 1, [
+        {"charge_number": 3, "status": "outstanding", "particulars": {"description": "Fixed charge"}},
+        {"charge_code": "no-number"},
+    ])
+
+    sql, params = session.calls[0]
+    assert "ON CONFLICT (company_id, charge_number) DO UPDATE SET status = EXCLUDED.status" in sql
+    sent, = json.loads(params["rows"])
+    assert sent["charge_number"] == "3" and sent["particulars"] == "Fixed charge"
+
+
+def officer(appointment_id, **extra):
+    return dict({
+        "name": "SMITH, Jane",
+        "officer_role": "director",
+        "appointed_on": "2020-01-01",
+        "links": {"self": f"/company/00000001/appointments/{appointment_id}"},
+    }, **extra)
+
+
+def officer_result(officer_id, change, **extra):
+    values = dict(officer_id=officer_id, name="SMITH, Jane", role="director",
+                  appointed_on=date(2020, 1, 1), resigned_on=None, change=change)
+    values.update(extra)
+    return SimpleNamespace(**values)
+
+
+def test_officer_sync_params():
+    session = RecordingSession()
+
+    ingestion._store_officers(session, COMPANY_ID, 1, [
+        officer("a1", date_of_birth={"year": 1970, "month": 3}),
+        officer("a1", name="SMITH, Jane Mary"),
+        {"name": "No link"},
+    ])
+
+    sql, params = session.calls[0]
+    assert "jsonb_to_recordset(CAST(:officers AS jsonb))" in sql
+    # Duplicates within the batch collapse server-side, one row per appointment
+    assert "SELECT DISTINCT ON (i.officer_id)" in sql
+    assert params["company_id"] == COMPANY_ID and params["tenant_id"] == 1
+    sent = json.loads(params["officers"])
+    # Items without an appointment id are dropped
+    assert [o["officer_id"] for o in sent] == ["a1", "a1"]
+    assert sent[0]["date_of_birth"] == "1970-03"
+    assert sent[0]["role"] == "director" and sent[0]["address"] == {}
+    # The ETag write follows the diff
+    assert session.calls[1][0].startswith("UPDATE companies SET companies_house_officers_etag")
+
+
+def test_officer_sync_empty_batch_still_records_etag():
+    session = RecordingSession()
+
+    changes = ingestion._store_officers(session, COMPANY_ID, 1, [])
+
+    assert json.loads(session.calls[0][1]["officers"]) == []
+    assert changes == {"new_appointments": [], "resignations": [], "details_changed": []}
+    assert len(session.calls) == 2
+
+
+def test_officer_sync_classifies_removals_and_updates(monkeypatch):
+    monkeypatch.setattr(ingestion, "_is_recent_date", lambda value, days=30: value == "2026-10-01")
+    session = RecordingSession([[
+        officer_result("new", "appointed", appointed_on=date(2026, 10, 1)),
+        officer_result("old", "appointed"),
+        officer_result("gone", "resigned", resigned_on=date(2026, 10, 2)),
+        officer_result("moved", "updated"),
+    ]])
+
+    changes = ingestion._store_officers(session, COMPANY_ID, 1, [officer("new")])
+
+    assert [o["officer_id"] for o in changes["new_appointments"]] == ["new"]
+    assert changes["resignations"] == [{
+        "officer_id": "gone", "name": "SMITH, Jane", "officer_role": "director",
+        "appointed_on": "2020-01-01", "resigned_on": "2026-10-02",
+    }]
+    assert [o["officer_id"] for o in changes["details_changed"]] == ["moved"]
+
+
+def test_officer_sync_classification_sql():
+    sql = " ".join(str(ingestion.OFFICER_SYNC_SQL).split())
+
+    # An active officer who now carries resigned_on is a removal
+    assert "WHEN p.resigned_on IS NULL AND u.resigned_on IS NOT NULL THEN 'resigned'" in sql
+    assert "WHEN p.officer_id IS NULL THEN 'appointed'" in sql
+    # Unchanged officers are not rewritten, so they are not reported
+    assert re.search(r"WHERE \(company_officers\.name, .*\) IS DISTINCT FROM \(EXCLUDED\.name, ", sql)
@@ -0,0 +1,220 @@
+# tests/unit/test_cache.py
+"""
+TwoTierCache: TTL, stale-while-revalidate, negative caching and single-flight.
+
+Redis is replaced by an in-memory double and the module clock by a manual
+one, so entry ages are exact; background refreshes still run on the real
+refresh pool.
+"""
+
+import os
+import sys
+import time
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.utils import cache as cache_module
+from backend.utils import metrics
+from backend.utils.cache import TwoTierCache
+
+
+class FakeRedis:
+    """The subset of redis-py used by the cache and metrics."""
+
+    def __init__(self):
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx and key in self.values:
+                return None
+            self.values[key] = value
+            return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def hincrby(self, *args):
+        return 0
+
+
+class Clock:
+    """Wall clock under test control; monotonic time and sleep stay real."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class Source:
+    """Counts calls; ``gate`` (when set) blocks each fetch until released."""
+
+    def __init__(self, value="v1"):
+        self.value = value
+        self.calls = 0
+        self.gate = None
+        self.started = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        return self.value
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(cache_module, "get_redis", lambda: fake)
+    monkeypatch.setattr(metrics, "get_redis", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def make_cache():
+    return TwoTierCache("test", ttls={"profile": 60}, default_ttl=30, stale_ttl=300, negative_ttl=10)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_fresh_entry_is_served_until_ttl(redis, clock):
+    cache, source = make_cache(), Source()
+
+    assert cache.get_or_fetch("k", "profile", source) == "v1"
+    clock.now += 59
+    assert cache.get_or_fetch("k", "profile", source) == "v1"
+    assert source.calls == 1
+
+    # Unknown kinds use the default TTL
+    cache.get_or_fetch("other", "search", source)
+    clock.now += 31
+    cache.get_or_fetch("other", "search", source)
+    assert source.calls == 3
+
+
+def test_redis_tier_is_shared_between_processes(redis, clock):
+    source = Source()
+    make_cache().get_or_fetch("k", "profile", source)
+
+    # A second cache (another process) has an empty LRU but reads Redis
+    assert make_cache().get_or_fetch("k", "profile", source) == "v1"
+    assert source.calls == 1
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(redis, clock):
+    cache, source = make_cache(), Source()
+    cache.get_or_fetch("k", "profile", source)
+
+    clock.now += 120
+    source.value, source.gate, source.started = "v2", threading.Event(), threading.Event()
+
+    assert cache.get_or_fetch("k", "profile", source) == "v1"
+    assert source.started.wait(5)
+    # Still refreshing: further reads get the stale value without a second fetch
+    assert cache.get_or_fetch("k", "profile", source) == "v1"
+    assert source.calls == 2
+
+    source.gate.set()
+    wait_for(lambda: "k" not in cache._refreshing)
+    assert cache.get_or_fetch("k", "profile", source) == "v2"
+    assert source.calls == 2
+
+
+def test_entry_past_stale_window_is_fetched_inline(redis, clock):
+    cache, source = make_cache(), Source()
+    cache.get_or_fetch("k", "profile", source)
+
+    clock.now += 60 + 300
+    source.value = "v2"
+
+    assert cache.get_or_fetch("k", "profile", source) == "v2"
+    assert source.calls == 2
+
+
+def test_not_found_is_cached_for_negative_ttl_only(redis, clock):
+    cache, source = make_cache(), Source(value=None)
+
+    assert cache.get_or_fetch("k", "profile", source) is None
+    clock.now += 9
+    assert cache.get_or_fetch("k", "profile", source) is None
+    assert source.calls == 1
+
+    # No stale window for negatives: once expired the next read refetches
+    clock.now += 2
+    source.value = "found"
+    assert cache.get_or_fetch("k", "profile", source) == "found"
+    assert source.calls == 2
+
+
+def test_exceptions_are_not_cached(redis, clock):
+    cache = make_cache()
+
+    def broken():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("k", "profile", broken)
+    assert cache.get_or_fetch("k", "profile", Source()) == "v1"
+
+
+def test_concurrent_misses_fetch_once(redis, clock):
+    cache, source = make_cache(), Source()
+    source.gate = threading.Event()
+    results = []
+
+    def read():
+        results.append(cache.get_or_fetch("k", "profile", source))
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    assert source.started.wait(5)
+    source.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["v1"] * 8
+    assert source.calls == 1
+    assert "cache:test:lock:k" not in redis.values
+
+
+def test_miss_waits_for_another_process_holding_the_lock(redis, clock):
+    cache, source = make_cache(), Source()
+    redis.set("cache:test:lock:k", 1, nx=True)
+
+    def other_process_fills():
+        time.sleep(0.2)
+        make_cache().set("k", "profile", "from-other")
+
+    threading.Thread(target=other_process_fills).start()
+
+    assert cache.get_or_fetch("k", "profile", source) == "from-other"
+    assert source.calls == 0
@@ -0,0 +1,190 @@
+# tests/unit/test_companies_house_async.py
+"""
+AsyncCompaniesHouseClient against a local aiohttp server.
+
+The server runs on its own event loop in a thread and answers from a
+per-path script of responses; the shared rate limiter is replaced by a
+recorder so token use and 429 penalties can be asserted.
+"""
+
+import os
+import sys
+import json
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.data_sources import companies_house_async
+from backend.data_sources.companies_house import NOT_MODIFIED, CompaniesHouseNormalizer
+from backend.data_sources.companies_house_async import AsyncCompaniesHouseClient, bulk_fetch_company_profiles
+from backend.utils import metrics
+
+
+class RecordingLimiter:
+    name = "test"
+
+    def __init__(self):
+        self.acquired = 0
+        self.penalties = []
+
+    async def acquire_async(self, lane=None, cost=1, timeout=None):
+        self.acquired += cost
+        return 100
+
+    def penalize(self, seconds):
+        self.penalties.append(seconds)
+
+
+class ScriptedServer:
+    """Answers each path from a list of (status, body, headers); the last entry repeats."""
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+        self.loop = asyncio.new_event_loop()
+        self.url = None
+
+    async def handle(self, request):
+        self.requests.append((request.path, request.headers.get("If-None-Match")))
+        script = self.responses.get(request.path) or [(404, None, {})]
+        status, body, headers = script.pop(0) if len(script) > 1 else script[0]
+        text = json.dumps(body) if body is not None else None
+        return web.Response(status=status, text=text, headers=headers, content_type="application/json")
+
+    def start(self):
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self.handle)
+        runner = web.AppRunner(app)
+        self.loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        self.loop.run_until_complete(site.start())
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        self.runner = runner
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+@pytest.fixture(autouse=True)
+def no_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, "get_redis", lambda: SimpleNamespace(hincrby=lambda *args: 0))
+
+
+@pytest.fixture
+def server():
+    server = ScriptedServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def limiter():
+    return RecordingLimiter()
+
+
+def run(server, limiter, call):
+    async def main():
+        async with AsyncCompaniesHouseClient("key", rate_limiter=limiter, base_url=server.url) as client:
+            return await call(client)
+    return asyncio.run(main())
+
+
+def profile(number, **extra):
+    return dict({"company_number": number, "company_name": f"Company {number}", "company_status": "active"}, **extra)
+
+
+def test_profile_carries_etag_and_conditional_request_returns_not_modified(server, limiter):
+    server.responses["/company/00000001"] = [(200, profile("00000001"), {"ETag": "v1"})]
+    server.responses["/company/00000002"] = [(304, None, {})]
+
+    first = run(server, limiter, lambda c: c.get_company_profile("00000001"))
+    second = run(server, limiter, lambda c: c.get_company_profile("00000002", etag="v1"))
+
+    assert first["etag"] == "v1"
+    assert second is NOT_MODIFIED
+    assert server.requests == [("/company/00000001", None), ("/company/00000002", "v1")]
+    assert limiter.acquired == 2
+
+
+def test_not_found_returns_none(server, limiter):
+    assert run(server, limiter, lambda c: c.get_company_profile("00000404")) is None
+
+
+def test_429_penalizes_shared_limiter_and_retries(server, limiter):
+    server.responses["/company/00000001"] = [
+        (429, {"error": "rate"}, {"Retry-After": "7"}),
+        (200, profile("00000001"), {}),
+    ]
+
+    result = run(server, limiter, lambda c: c.get_company_profile("00000001"))
+
+    assert result["company_number"] == "00000001"
+    assert limiter.penalties == [7.0]
+    # Every attempt takes its own token
+    assert limiter.acquired == 2
+
+
+def test_gateway_errors_are_retried_through_the_limiter(server, limiter):
+    server.responses["/company/00000001"] = [
+        (503, {"error": "busy"}, {}),
+        (200, profile("00000001"), {}),
+    ]
+
+    result = run(server, limiter, lambda c: c.get_company_profile("00000001"))
+
+    assert result["company_number"] == "00000001"
+    assert limiter.acquired == 2
+
+
+def test_many_profiles_isolates_failures(server, limiter):
+    server.responses["/company/00000001"] = [(200, profile("00000001"), {"ETag": "new"})]
+    server.responses["/company/00000002"] = [(304, None, {})]
+    server.responses["/company/00000003"] = [(500, {"error": "boom"}, {})]
+
+    results = run(server, limiter, lambda c: c.get_many_company_profiles({
+        "00000001": None, "00000002": "v2", "00000003": None, "00000004": None,
+    }))
+
+    assert results["00000001"]["etag"] == "new"
+    assert results["00000002"] is NOT_MODIFIED
+    assert results["00000003"] is None
+    assert results["00000004"] is None
+
+
+def test_full_company_data_matches_shared_normalisation(server, limiter):
+    server.responses["/company/00000001"] = [(200, profile("00000001"), {})]
+    server.responses["/company/00000001/officers"] = [(200, {"items": [], "total_count": 4}, {})]
+    server.responses["/company/00000001/filing-history"] = [(500, {"error": "boom"}, {})]
+    server.responses["/company/00000001/charges"] = [(200, {"items": [], "total_count": 1}, {})]
+    server.responses["/company/00000002"] = [(500, {"error": "boom"}, {})]
+
+    results = run(server, limiter, lambda c: c.get_many_full_company_data(["00000001", "00000002", "00000001"]))
+
+    assert list(results) == ["00000001", "00000002"]
+    normalized = results["00000001"]
+    assert normalized == CompaniesHouseNormalizer().normalize_company_data(normalized["raw_data"])
+    assert normalized["officer_count"] == 4
+    assert normalized["has_charges"] is True
+    # The failed filings fetch is left out instead of failing the company
+    assert normalized["recent_filing_count"] == 0
+    assert results["00000002"] is None
+
+
+def test_bulk_fetch_company_profiles_blocking_entry_point(server, limiter, monkeypatch):
+    monkeypatch.setattr(companies_house_async, "BASE_URL", server.url)
+    monkeypatch.setattr(companies_house_async, "get_companies_house_limiter", lambda: limiter)
+    server.responses["/company/00000001"] = [(200, profile("00000001"), {"ETag": "v1"})]
+
+    results = bulk_fetch_company_profiles({"00000001": None, "00000002": "v2"}, api_key="key", concurrency=2)
+
+    assert results["00000001"]["etag"] == "v1"
+    assert results["00000002"] is None
+    assert limiter.acquired == 2
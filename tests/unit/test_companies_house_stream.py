@@ -0,0 +1,281 @@
+# tests/unit/test_companies_house_stream.py
+"""
+StreamConsumer against the local replay server (scripts/stream_replay_server.py).
+
+The server runs in-process on an ephemeral port; Redis is replaced by a
+small in-memory double so timepoints and heartbeats can be inspected.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+import importlib.util
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+# The ingestion tasks create their engine at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from backend.data_sources import companies_house_stream as stream_module
+from backend.data_sources.companies_house_stream import (
+    STREAMS, StreamConsumer, route_to_ingestion, stream_is_healthy
+)
+from backend.utils import metrics
+
+_spec = importlib.util.spec_from_file_location(
+    "stream_replay_server", os.path.join(ROOT, "scripts", "stream_replay_server.py")
+)
+replay = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(replay)
+
+MONITORED = "00000001"
+
+
+class FakeRedis:
+    """The subset of redis-py used by the consumer and metrics."""
+
+    def __init__(self):
+        self.values = {}
+        self.expires = {}
+
+    def _live(self, key):
+        if key in self.expires and self.expires[key] <= time.monotonic():
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.values
+
+    def get(self, key):
+        return self.values.get(key) if self._live(key) else None
+
+    def set(self, key, value, ex=None):
+        self.values[key] = str(value)
+        if ex:
+            self.expires[key] = time.monotonic() + ex
+        else:
+            self.expires.pop(key, None)
+        return True
+
+    def exists(self, key):
+        return int(self._live(key))
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.expires.pop(key, None)
+
+    def hincrby(self, key, field, amount=1):
+        counters = self.values.setdefault(key, {})
+        counters[field] = counters.get(field, 0) + amount
+        return counters[field]
+
+
+class Monitored:
+    """Stand-in for MonitoredCompanies with a fixed index."""
+
+    def __init__(self, index):
+        self.index = index
+
+    def lookup(self, company_number):
+        return self.index.get(company_number, [])
+
+
+def event(timepoint, company_number=MONITORED, kind="filing-history"):
+    return {
+        "resource_kind": kind,
+        "resource_uri": f"/company/{company_number}/filing-history/tx{timepoint}",
+        "resource_id": f"tx{timepoint}",
+        "data": {"type": "AA"},
+        "event": {"timepoint": timepoint, "type": "changed", "published_at": "2026-01-01T00:00:00"},
+    }
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(stream_module, "get_redis", lambda: fake)
+    monkeypatch.setattr(metrics, "get_redis", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def replay_server(tmp_path):
+    """Start a replay server; returns start(events_by_stream, handler_wrapper=None) -> (url, requests)."""
+    servers = []
+
+    def start(recorded, wrap=None):
+        for stream, events in recorded.items():
+            with open(tmp_path / f"{STREAMS[stream]}.jsonl", "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(e) + "\n" for e in events)
+        recordings = {
+            STREAMS[stream]: replay.load_recording(str(tmp_path / f"{STREAMS[stream]}.jsonl"))
+            for stream in recorded
+        }
+        handler = replay.make_handler(recordings, interval=0.01, heartbeat_every=2, loop=False)
+        seen = []
+
+        class RecordingHandler(wrap(handler) if wrap else handler):
+            def do_GET(self):
+                seen.append(self.path)
+                super().do_GET()
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}", seen
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def consume(stream, url, monitored, expected, timeout=10):
+    """Run a consumer until ``expected`` events were matched; returns them."""
+    matched = []
+    stop = threading.Event()
+
+    def on_match(stream_name, company_number, targets, event):
+        matched.append((stream_name, company_number, targets, event))
+        if len(matched) >= expected:
+            stop.set()
+
+    consumer = StreamConsumer(stream, monitored, api_key="test", base_url=url, on_match=on_match)
+    thread = threading.Thread(target=consumer.run, args=(stop,), daemon=True)
+    thread.start()
+    stop.wait(timeout)
+    stop.set()
+    thread.join(timeout)
+    assert not thread.is_alive()
+    return consumer, matched
+
+
+def test_resumes_from_saved_timepoint(redis, replay_server):
+    url, requests_seen = replay_server({"filings": [event(tp) for tp in range(1, 7)]})
+    redis.set("ch_stream:filings:timepoint", 3)
+
+    consumer, matched = consume("filings", url, Monitored({MONITORED: [("c1", 1)]}), expected=3)
+
+    assert requests_seen == ["/filings?timepoint=4"]
+    assert [m[3]["event"]["timepoint"] for m in matched] == [4, 5, 6]
+    # Saved on disconnect, so the next run resumes after the last event
+    assert redis.get("ch_stream:filings:timepoint") == "6"
+    assert consumer.timepoint == 6
+
+
+def test_starts_from_now_without_saved_timepoint(redis, replay_server):
+    url, requests_seen = replay_server({"filings": [event(tp) for tp in range(1, 3)]})
+
+    consume("filings", url, Monitored({MONITORED: [("c1", 1)]}), expected=2)
+
+    assert requests_seen == ["/filings"]
+    assert redis.get("ch_stream:filings:timepoint") == "2"
+
+
+def test_heartbeat_marks_stream_healthy(redis, replay_server):
+    url, _ = replay_server({"filings": [event(1)]})
+    assert not stream_is_healthy(["filings"])
+
+    consume("filings", url, Monitored({MONITORED: [("c1", 1)]}), expected=1)
+
+    assert stream_is_healthy(["filings"])
+    # Every core stream must be heartbeating for polling to stand down
+    assert not stream_is_healthy()
+    redis.delete("ch_stream:filings:heartbeat")
+    assert not stream_is_healthy(["filings"])
+
+
+def test_stream_unhealthy_when_redis_is_down(monkeypatch):
+    def unavailable():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(stream_module, "get_redis", unavailable)
+    assert not stream_is_healthy(["filings"])
+
+
+def test_reconnects_after_dropped_connection(redis, replay_server, monkeypatch):
+    monkeypatch.setattr(stream_module.random, "uniform", lambda a, b: 0)
+    connections = []
+
+    def drop_first_connection_after_two_events(handler):
+        class DroppingHandler(handler):
+            def do_GET(self):
+                connections.append(0)
+                self.connection_index = len(connections) - 1
+                super().do_GET()
+
+            def _chunk(self, data):
+                if self.connection_index == 0 and data.strip():
+                    if connections[0] == 2:
+                        self.connection.shutdown(socket.SHUT_RDWR)
+                        raise ConnectionResetError()
+                    connections[0] += 1
+                super()._chunk(data)
+
+        return DroppingHandler
+
+    url, requests_seen = replay_server({"filings": [event(tp) for tp in range(1, 6)]},
+                                       wrap=drop_first_connection_after_two_events)
+
+    _, matched = consume("filings", url, Monitored({MONITORED: [("c1", 1)]}), expected=5)
+
+    # Resumed right after the last event seen, without gaps or repeats
+    assert requests_seen == ["/filings", "/filings?timepoint=3"]
+    assert [m[3]["event"]["timepoint"] for m in matched] == [1, 2, 3, 4, 5]
+    assert redis.values["metrics:counters"]["companies_house.stream.filings.reconnects"] == 1
+
+
+def test_routes_only_monitored_companies(redis, replay_server):
+    targets = [("c1", 1), ("c2", 2)]
+    url, _ = replay_server({"officers": [
+        event(1, "99999999", kind="company-officers"),
+        event(2, MONITORED, kind="company-officers"),
+        event(3, "88888888", kind="company-officers"),
+        event(4, "00000002", kind="company-officers"),
+    ]})
+
+    _, matched = consume("officers", url, Monitored({MONITORED: targets, "00000002": [("c3", 1)]}), expected=2)
+
+    assert [(m[0], m[1], m[2]) for m in matched] == [
+        ("officers", MONITORED, targets),
+        ("officers", "00000002", [("c3", 1)]),
+    ]
+
+
+def test_every_event_is_routed(redis, replay_server):
+    # Repeats are merged by enqueue_once while queued, not dropped here
+    url, _ = replay_server({"filings": [event(1), event(2), event(3, "00000002")]})
+
+    _, matched = consume("filings", url, Monitored({MONITORED: [("c1", 1)], "00000002": [("c2", 1)]}),
+                         expected=3)
+
+    assert [(m[1], m[3]["event"]["timepoint"]) for m in matched] == [
+        (MONITORED, 1), (MONITORED, 2), ("00000002", 3),
+    ]
+
+
+@pytest.mark.parametrize("stream, endpoints", [
+    ("filings", ["filings"]),
+    ("officers", ["officers"]),
+    ("charges", ["charges"]),
+    ("pscs", ["pscs"]),
+    ("companies", []),
+    ("insolvency", []),
+])
+def test_route_to_ingestion(monkeypatch, stream, endpoints):
+    queued = []
+    monkeypatch.setattr(stream_module, "enqueue_once",
+                        lambda t, a, **kw: queued.append((t.name.rsplit(".", 1)[-1], a, kw)))
+
+    route_to_ingestion(stream, MONITORED, [("c1", 1), ("c2", 2)], event(1))
+
+    # One sync per event, fanned out to every monitoring row
+    assert queued == [("sync_company_for_tenants", (MONITORED, [
+        {"company_id": "c1", "tenant_id": 1, "endpoints": endpoints},
+        {"company_id": "c2", "tenant_id": 2, "endpoints": endpoints},
+    ]), {"key_parts": (MONITORED, stream)})]
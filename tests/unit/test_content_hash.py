@@ -0,0 +1,138 @@
+# tests/unit/test_content_hash.py
+"""
+content_hash normalisation, and the profile refresh it short-circuits.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# The ingestion tasks create their engine at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from backend.data_sources.companies_house import NOT_MODIFIED, CompanyProfile, ItemList
+from backend.tasks import companies_house_ingestion as ingestion
+from backend.utils import metrics
+from backend.utils.content_hash import content_hash, is_unchanged
+
+PROFILE = {
+    "company_number": "00000001",
+    "company_name": "Example Ltd",
+    "registered_office_address": {"locality": "London", "postal_code": "EC1A 1BB"},
+    "sic_codes": ["62020"],
+}
+
+
+@pytest.fixture(autouse=True)
+def no_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, "get_redis", lambda: SimpleNamespace(hincrby=lambda *args: 0))
+
+
+def test_key_order_does_not_matter():
+    reordered = {
+        "sic_codes": ["62020"],
+        "registered_office_address": {"postal_code": "EC1A 1BB", "locality": "London"},
+        "company_name": "Example Ltd",
+        "company_number": "00000001",
+    }
+    assert content_hash(reordered) == content_hash(PROFILE)
+
+
+def test_list_order_does_matter():
+    assert content_hash(dict(PROFILE, sic_codes=["62020", "70100"])) != \
+        content_hash(dict(PROFILE, sic_codes=["70100", "62020"]))
+
+
+@pytest.mark.parametrize("volatile", [
+    {"etag": "W/\"abc\""},
+    {"links": {"self": "/company/00000001", "filing_history": "/company/00000001/filing-history"}},
+])
+def test_volatile_fields_are_ignored(volatile):
+    assert content_hash(dict(PROFILE, **volatile)) == content_hash(PROFILE)
+    # At any depth, e.g. the links on each filing
+    assert content_hash([dict(PROFILE, **volatile)]) == content_hash([PROFILE])
+
+
+def test_null_hashes_like_missing():
+    assert content_hash(dict(PROFILE, company_status=None)) == content_hash(PROFILE)
+    assert content_hash(dict(PROFILE, company_status="active")) != content_hash(PROFILE)
+    # Falsy values are content, not absence
+    assert content_hash(dict(PROFILE, sic_codes=[])) != content_hash(dict(PROFILE, sic_codes=None))
+
+
+def test_typed_profile_matches_its_raw_form():
+    raw = dict(PROFILE, company_status="active", etag="v1", links={"self": "/company/00000001"})
+    profile = CompanyProfile.from_api(raw)
+
+    assert content_hash(profile) == content_hash(CompanyProfile.from_api(dict(raw, etag="v2")))
+    assert content_hash(profile) != content_hash(CompanyProfile.from_api(dict(raw, company_name="Renamed")))
+
+
+def test_item_list_etag_is_ignored():
+    items = [{"transaction_id": "t1", "type": "AA"}]
+    assert content_hash(ItemList(items, etag="v1")) == content_hash(ItemList(items, etag="v2")) == content_hash(items)
+
+
+def test_is_unchanged_compares_with_stored_digest():
+    digest = content_hash(PROFILE)
+
+    assert is_unchanged({"profile": digest}, "profile", digest)
+    assert not is_unchanged({"filings": digest}, "profile", digest)
+    assert not is_unchanged(None, "profile", digest)
+
+
+class FakeSession:
+    """Answers the existing-row lookup and records every statement."""
+
+    def __init__(self, existing):
+        self.existing = existing
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return SimpleNamespace(fetchone=lambda: self.existing)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("fetched", ["not_modified", "same_content"])
+def test_unchanged_profile_skips_filings_and_officers(monkeypatch, fetched):
+    profile = CompanyProfile.from_api(dict(PROFILE, etag="v2"))
+    existing = SimpleNamespace(id="c1", companies_house_etag="v1",
+                               content_hashes={"profile": content_hash(profile)})
+    session = FakeSession(existing)
+    queued = []
+    monkeypatch.setattr(ingestion, "Session", lambda: session)
+    monkeypatch.setattr(ingestion, "CompaniesHouseAPI", lambda: SimpleNamespace(
+        get_company_profile=lambda number, etag=None: NOT_MODIFIED if fetched == "not_modified" else profile
+    ))
+    monkeypatch.setattr(ingestion, "enqueue_once", lambda task, args: queued.append(task.name))
+
+    result = ingestion.fetch_company_profile("00000001", 1)
+
+    assert result["action"] == "not_modified"
+    assert queued == []
+    assert not any("company_name" in s for s in session.statements)
+
+
+def test_changed_profile_refreshes_filings_and_officers(monkeypatch):
+    profile = CompanyProfile.from_api(dict(PROFILE, etag="v2"))
+    existing = SimpleNamespace(id="c1", companies_house_etag="v1", content_hashes={"profile": "old"})
+    queued = []
+    monkeypatch.setattr(ingestion, "Session", lambda: FakeSession(existing))
+    monkeypatch.setattr(ingestion, "CompaniesHouseAPI", lambda: SimpleNamespace(
+        get_company_profile=lambda number, etag=None: profile
+    ))
+    monkeypatch.setattr(ingestion, "enqueue_once", lambda task, args: queued.append(task.name.rsplit(".", 1)[-1]))
+
+    result = ingestion.fetch_company_profile("00000001", 1)
+
+    assert result["action"] == "updated"
+    assert queued == ["fetch_company_filings", "fetch_company_officers"]
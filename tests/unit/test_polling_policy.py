@@ -0,0 +1,76 @@
+# tests/unit/test_polling_policy.py
+"""
+Deadline bands of the monitoring polling policy.
+"""
+
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.utils.polling_policy import BASELINE_HOURS, deadline_interval_hours, polling_interval_hours
+
+TODAY = date(2026, 6, 15)
+
+
+def due_in(days):
+    return (TODAY + timedelta(days=days)).isoformat()
+
+
+@pytest.mark.parametrize("days, hours", [
+    # Due soon
+    (0, 2),
+    (3, 2),
+    (4, 6),
+    (7, 6),
+    (14, 6),
+    (15, 24),
+    (30, 24),
+    (31, BASELINE_HOURS),
+    # Overdue: late filings arrive in the days after
+    (-1, 2),
+    (-3, 2),
+    (-4, 6),
+    (-7, 6),
+    (-8, 24),
+    (-14, 24),
+    (-15, BASELINE_HOURS),
+])
+def test_deadline_bands(days, hours):
+    assert deadline_interval_hours([due_in(days)], TODAY) == hours
+
+
+@pytest.mark.parametrize("deadlines", [[], [None], [None, ""], ["not-a-date"]])
+def test_no_deadline_uses_baseline(deadlines):
+    assert deadline_interval_hours(deadlines, TODAY) == BASELINE_HOURS
+
+
+def test_tightest_deadline_wins():
+    # Accounts due in 30 days, confirmation statement overdue by 2
+    assert deadline_interval_hours([due_in(30), due_in(-2)], TODAY) == 2
+    assert deadline_interval_hours([due_in(90), due_in(10)], TODAY) == 6
+
+
+def test_accepts_dates_datetimes_and_timestamps():
+    due = TODAY + timedelta(days=5)
+    now = datetime(2026, 6, 15, 23, 59)
+
+    assert deadline_interval_hours([due], now) == 6
+    assert deadline_interval_hours([datetime.combine(due, datetime.min.time())], now) == 6
+    assert deadline_interval_hours([f"{due.isoformat()}T00:00:00Z"], now) == 6
+
+
+@pytest.mark.parametrize("config_hours, deadline_days, hours", [
+    (None, None, BASELINE_HOURS),
+    (24, None, 24),
+    (24, 2, 2),
+    (1, 20, 1),
+    (500, None, BASELINE_HOURS),
+    (0, None, BASELINE_HOURS),
+])
+def test_config_is_an_upper_bound(config_hours, deadline_days, hours):
+    deadlines = [due_in(deadline_days)] if deadline_days is not None else []
+    assert polling_interval_hours(config_hours, deadlines, TODAY) == hours
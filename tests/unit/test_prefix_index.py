@@ -0,0 +1,135 @@
+# tests/unit/test_prefix_index.py
+"""
+Autocomplete prefix index: a small index is built in tmp_path with the
+same keys scripts/build_prefix_index.py emits (name, name without a
+leading "THE ", company number), then queried.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.config import settings
+from backend.utils import prefix_index
+from backend.utils.prefix_index import PrefixIndex, get_prefix_index, normalise, write_prefix_index
+
+COMPANIES = [
+    ("00445790", "active", "Tesco PLC"),
+    ("00519500", "active", "Tesco  Stores   Limited"),
+    ("01234567", "dissolved", "Tesco"),
+    ("SC123456", "active", "The Body Shop"),
+    ("OC301540", "active", "The Theatre Co"),
+    ("00000001", "active", "Aardvark Ltd"),
+    ("NI000005", "liquidation", "Zyzzyva Ltd"),
+]
+
+
+def entries(companies):
+    """Records as the build script selects them, sorted by key bytes."""
+    records = []
+    for number, status, name in companies:
+        name = normalise(name)
+        records.append((name, number, status, name))
+        if name.startswith("THE "):
+            records.append((name[4:], number, status, name))
+        records.append((number, number, status, name))
+    return sorted(records, key=lambda r: r[0].encode("utf-8"))
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "processed" / "index.bin")
+    assert write_prefix_index(path, entries(COMPANIES)) == 2 * len(COMPANIES) + 2
+    return PrefixIndex(path)
+
+
+def numbers(results):
+    return [r["companies_house_number"] for r in results]
+
+
+def test_hit_ranks_active_then_shortest(index):
+    results = index.lookup("tes")
+
+    # The dissolved exact "TESCO" sorts after the active, longer names
+    assert numbers(results) == ["00445790", "00519500", "01234567"]
+    assert results[0] == {"companies_house_number": "00445790", "name": "TESCO PLC", "status": "active"}
+    assert results[2]["status"] == "dissolved"
+
+
+@pytest.mark.parametrize("query", ["tesco x", "zz", "!", "99999999", "BODY SHOPS"])
+def test_miss(index, query):
+    assert index.lookup(query) == []
+
+
+@pytest.mark.parametrize("query", ["", "   "])
+def test_blank_query(index, query):
+    assert index.lookup(query) == []
+
+
+def test_first_and_last_keys(index):
+    # "00000001" is the first key in byte order, "ZYZZYVA LTD" the last
+    assert numbers(index.lookup("00000001")) == ["00000001"]
+    assert numbers(index.lookup("ZYZZYVA LTD")) == ["NI000005"]
+    assert numbers(index.lookup("zyzzyva ltd and more")) == []
+
+
+def test_limit(index):
+    assert numbers(index.lookup("tesco", limit=2)) == ["00445790", "00519500"]
+    assert len(index.lookup("t", limit=1)) == 1
+
+
+def test_case_and_whitespace_are_normalised(index):
+    assert numbers(index.lookup("  tesco   STORES ")) == ["00519500"]
+    # Stored keys are collapsed too, and the display name is the key
+    assert index.lookup("tesco stores")[0]["name"] == "TESCO STORES LIMITED"
+    assert numbers(index.lookup("sc12")) == ["SC123456"]
+
+
+def test_leading_the_is_optional(index):
+    assert index.lookup("body")[0] == {
+        "companies_house_number": "SC123456", "name": "THE BODY SHOP", "status": "active",
+    }
+    # THE THEATRE CO matches through both keys and is listed once, ranked
+    # by its shorter "THEATRE CO" key
+    assert numbers(index.lookup("THE")) == ["OC301540", "SC123456"]
+
+
+def test_unsorted_records_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_prefix_index(str(tmp_path / "index.bin"), [("B", "1", "", "B"), ("A", "2", "", "A")])
+
+
+def test_records_with_separators_are_skipped(tmp_path):
+    path = str(tmp_path / "index.bin")
+    count = write_prefix_index(path, [("A\x1fB", "1", "", ""), ("AB", "2", "", ""), ("AC\nD", "3", "", "")])
+
+    assert count == 1
+    assert numbers(PrefixIndex(path).lookup("A")) == ["2"]
+
+
+def test_not_an_index(tmp_path):
+    path = tmp_path / "index.bin"
+    path.write_bytes(b"x" * 64)
+
+    with pytest.raises(ValueError):
+        PrefixIndex(str(path))
+
+
+def test_rebuilt_index_is_reloaded(tmp_path, monkeypatch):
+    path = str(tmp_path / "index.bin")
+    monkeypatch.setattr(settings, "COMPANY_PREFIX_INDEX_PATH", path)
+    monkeypatch.setattr(prefix_index, "RELOAD_CHECK_SECONDS", 0)
+    monkeypatch.setattr(prefix_index, "_index", None)
+    monkeypatch.setattr(prefix_index, "_index_mtime", None)
+
+    assert get_prefix_index() is None
+
+    write_prefix_index(path, entries(COMPANIES[:1]))
+    assert numbers(get_prefix_index().lookup("tesco")) == ["00445790"]
+
+    write_prefix_index(path, entries(COMPANIES))
+    os.utime(path, (1, 1))
+    assert numbers(get_prefix_index().lookup("tesco")) == ["00445790", "00519500", "01234567"]
@@ -0,0 +1,115 @@
+# tests/unit/test_rate_limiter.py
+"""
+RateLimiter priority lanes and the local fallback.
+
+Lane tests run twice: against fakeredis, which executes the Lua scripts,
+and against the in-process bucket used while Redis is down.
+"""
+
+import os
+import sys
+
+import pytest
+import fakeredis
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.utils import metrics
+from backend.utils import rate_limiter as limiter_module
+from backend.utils.rate_limiter import BACKGROUND, INTERACTIVE, RateLimiter
+
+
+def unavailable():
+    raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(limiter_module, "get_redis", lambda: fake)
+    monkeypatch.setattr(metrics, "get_redis", lambda: fake)
+    return fake
+
+
+@pytest.fixture(params=["redis", "local"])
+def limiter(request, redis, monkeypatch):
+    if request.param == "local":
+        monkeypatch.setattr(limiter_module, "get_redis", unavailable)
+    # Burst of 5 with 2 held back for interactive callers; refills every 2s
+    return RateLimiter("test", limit=10, window_seconds=10, burst=5, lanes={INTERACTIVE: 0, BACKGROUND: 2})
+
+
+def take(limiter, lane, times):
+    return [limiter.try_acquire(lane)[0] for _ in range(times)]
+
+
+def test_background_is_refused_at_the_reserve(limiter):
+    assert take(limiter, BACKGROUND, 3) == [True, True, True]
+
+    allowed, retry_after, remaining = limiter.try_acquire(BACKGROUND)
+
+    assert not allowed
+    assert 0 < retry_after <= limiter.interval
+    assert remaining == 2
+
+
+def test_interactive_borrows_the_background_reserve(limiter):
+    take(limiter, BACKGROUND, 3)
+
+    assert take(limiter, INTERACTIVE, 2) == [True, True]
+    assert limiter.remaining() == 0
+    assert not limiter.try_acquire(INTERACTIVE)[0]
+    assert not limiter.try_acquire(BACKGROUND)[0]
+
+
+def test_penalty_stops_every_lane(limiter):
+    limiter.penalize(30)
+
+    allowed, retry_after, _ = limiter.try_acquire(INTERACTIVE)
+
+    assert not allowed
+    assert retry_after > 29
+
+
+def test_unknown_lane_is_rejected(limiter):
+    with pytest.raises(ValueError):
+        limiter.try_acquire("batch")
+
+
+def test_scripts_run_by_sha(redis):
+    limiter = RateLimiter("test", limit=10, window_seconds=10, burst=5)
+
+    limiter.try_acquire(BACKGROUND)
+    limiter.penalize(1)
+
+    assert redis.script_exists(limiter._acquire_script.sha, limiter._penalize_script.sha) == [True, True]
+
+
+def test_redis_failure_trips_local_fallback_for_a_cooldown(redis, monkeypatch):
+    limiter = RateLimiter("test", limit=10, window_seconds=10, burst=5)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(limiter_module, "get_redis", failing)
+
+    # Served locally, and Redis is not retried within the cooldown
+    assert take(limiter, BACKGROUND, 3) == [True, True, True]
+    assert len(calls) == 1
+    assert limiter._redis_failed
+
+    # Once the cooldown is over Redis is used again
+    monkeypatch.setattr(limiter_module, "get_redis", lambda: redis)
+    limiter._fallback_until = 0.0
+    assert limiter.try_acquire(BACKGROUND) == (True, 0.0, 4)
+    assert not limiter._redis_failed
+    assert redis.get(limiter.key) is not None
+
+
+def test_local_fallback_keeps_budget_across_calls(monkeypatch, redis):
+    monkeypatch.setattr(limiter_module, "get_redis", unavailable)
+    limiter = RateLimiter("test", limit=10, window_seconds=10, burst=5)
+
+    assert take(limiter, BACKGROUND, 6) == [True] * 5 + [False]